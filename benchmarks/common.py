@@ -0,0 +1,139 @@
+"""Registry and timing routine which are shared by all benchmarks."""
+
+import dataclasses
+import gc
+import random
+import statistics
+import time
+import typing
+
+import numpy as np
+
+# every benchmark gets the same seed before each repetition, so that the
+# stochastic parts of the converters always do the same work
+SEED = 100
+
+BENCHMARKS: typing.Dict[str, "Benchmark"] = {}
+
+
+@dataclasses.dataclass(frozen=True)
+class Benchmark:
+    name: str
+    group: str
+    function: typing.Callable[[typing.Any], typing.Any]
+    # returns the argument for 'function', its duration isn't measured
+    setup: typing.Callable[[], typing.Any]
+    n_repetitions: int
+
+    def run(
+        self, n_repetitions: typing.Optional[int] = None
+    ) -> typing.Dict[str, typing.Any]:
+        if n_repetitions is None:
+            n_repetitions = self.n_repetitions
+
+        durations = []
+        for _ in range(n_repetitions):
+            seed()
+            argument = self.setup()
+            gc.collect()
+            gc.disable()
+            try:
+                start_time = time.perf_counter()
+                self.function(argument)
+                durations.append(time.perf_counter() - start_time)
+            finally:
+                gc.enable()
+
+        return {
+            "name": self.name,
+            "group": self.group,
+            "n_repetitions": n_repetitions,
+            "durations": durations,
+            "minimum": min(durations),
+            "median": statistics.median(durations),
+            "mean": statistics.mean(durations),
+        }
+
+
+def seed():
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+
+def _no_setup() -> None:
+    return None
+
+
+def benchmark(
+    group: str,
+    setup: typing.Callable[[], typing.Any] = _no_setup,
+    n_repetitions: int = 5,
+):
+    """Register the decorated function (with one argument) as a benchmark.
+
+    :param group: Name of the group (e.g. 'stages' or 'converters').
+    :param setup: Function without arguments which prepares the input for
+        the benchmark. It gets called before each repetition.
+    :param n_repetitions: How often the benchmark runs by default.
+    """
+
+    def decorator(function: typing.Callable[[typing.Any], typing.Any]):
+        name = f"{group}.{function.__name__}"
+        BENCHMARKS.update(
+            {name: Benchmark(name, group, function, setup, n_repetitions)}
+        )
+        return function
+
+    return decorator
+
+
+def prepare_build():
+    """Set the same global mutwo constants as 'main.py' does."""
+
+    from mutwo import converters
+    from ot2 import constants as ot2_constants
+
+    converters.symmetrical.time_brackets_constants.DEFAULT_TIME_GRID = (
+        ot2_constants.stochastic_calculation.TIME_GRID
+    )
+    converters.symmetrical.time_brackets_constants.DEFAULT_PRECISION = (
+        ot2_constants.stochastic_calculation.PRECISION
+    )
+
+
+_IS_REGISTERED = False
+
+
+def reset_time_brackets_container():
+    """Replace the global time bracket container by an empty container."""
+
+    global _IS_REGISTERED
+
+    from ot2.constants import time_brackets_container
+    from ot2.events import time_brackets
+
+    prepare_build()
+    time_brackets_container.TIME_BRACKETS = (
+        time_brackets.IndexedTimeBracketContainer([])
+    )
+    _IS_REGISTERED = False
+
+
+def register_time_brackets():
+    """Register all time brackets at the (empty) global container."""
+
+    global _IS_REGISTERED
+
+    from ot2 import register
+
+    register.main()
+    _IS_REGISTERED = True
+
+
+def ensure_registered():
+    """Register all time brackets once (for benchmarks which need them)."""
+
+    if not _IS_REGISTERED:
+        reset_time_brackets_container()
+        seed()
+        register_time_brackets()
@@ -0,0 +1,181 @@
+"""Benchmarks for the converters which dominate the build time."""
+
+import copy
+import functools
+
+from common import benchmark
+from common import ensure_registered
+from common import prepare_build
+
+# how many mocking time brackets the chord picker has to convert
+N_CHORD_TIME_BRACKETS = 10
+N_EVENTS_PER_CHORD_TIME_BRACKET = 8
+CHORD_TIME_BRACKET_DURATION = 20
+
+# the river cengkok of part 8 (as in 'register._calculate_cengkok_brackets')
+NTH_RIVER_PART = 8
+
+
+@functools.lru_cache()
+def _make_mock_time_brackets():
+    from mutwo import events
+
+    from ot2 import constants as ot2_constants
+
+    prepare_build()
+    distance = ot2_constants.duration.DURATION_IN_SECONDS / (
+        N_CHORD_TIME_BRACKETS + 1
+    )
+    time_brackets = []
+    for nth_time_bracket in range(N_CHORD_TIME_BRACKETS):
+        start_time = distance * (nth_time_bracket + 1)
+        end_time = start_time + CHORD_TIME_BRACKET_DURATION
+        mock_time_bracket = events.time_brackets.TimeBracket(
+            [
+                events.basic.TaggedSimultaneousEvent(
+                    [
+                        events.basic.SequentialEvent(
+                            [
+                                events.music.NoteLike([], 1)
+                                for _ in range(N_EVENTS_PER_CHORD_TIME_BRACKET)
+                            ]
+                        )
+                    ],
+                    tag="mocking",
+                )
+            ],
+            start_time,
+            end_time,
+        )
+        time_brackets.append(mock_time_bracket)
+    return tuple(time_brackets)
+
+
+def _make_assign_curve_and_weight_pairs_on_events():
+    from ot2 import constants as ot2_constants
+    from ot2.converters.symmetrical import time_brackets
+
+    return time_brackets._make_assign_curve_and_weight_pairs_on_events_converter(
+        ot2_constants.families_pitch.FAMILY_PITCH
+    )
+
+
+@functools.lru_cache()
+def _make_time_brackets_with_assigned_curves():
+    assign_curve_and_weight_pairs_on_events = (
+        _make_assign_curve_and_weight_pairs_on_events()
+    )
+    return tuple(
+        assign_curve_and_weight_pairs_on_events.convert(mock_time_bracket)
+        for mock_time_bracket in _make_mock_time_brackets()
+    )
+
+
+def _setup_assign_curves():
+    return _make_assign_curve_and_weight_pairs_on_events(), _make_mock_time_brackets()
+
+
+@benchmark("converters", setup=_setup_assign_curves)
+def assign_curve_and_weight_pairs_on_events(converter_and_time_brackets):
+    assign_curve_and_weight_pairs_on_events, time_brackets = converter_and_time_brackets
+    for time_bracket in time_brackets:
+        assign_curve_and_weight_pairs_on_events.convert(time_bracket)
+
+
+def _setup_pick_chord():
+    return copy.deepcopy(_make_time_brackets_with_assigned_curves())
+
+
+@benchmark("converters", setup=_setup_pick_chord)
+def pick_chord_from_curve_and_weight_pairs(time_brackets):
+    from ot2 import constants as ot2_constants
+    from ot2 import converters as ot2_converters
+
+    picker = ot2_converters.symmetrical.families.PickChordFromCurveAndWeightPairsConverter(
+        ot2_constants.instruments.AMBITUS_SUSTAINING_INSTRUMENTS_JUST_INTONATION_PITCHES,
+        (1, 2, 3),
+    )
+    for time_bracket in time_brackets:
+        picker.convert(time_bracket)
+
+
+def _setup_keyboard():
+    from ot2 import constants as ot2_constants
+
+    ensure_registered()
+    return copy.deepcopy(
+        ot2_constants.time_brackets_container.TIME_BRACKETS.filter(
+            ot2_constants.instruments.ID_KEYBOARD
+        )
+    )
+
+
+@benchmark("converters", setup=_setup_keyboard)
+def keyboard_time_brackets_to_adapted_keyboard_time_brackets(time_brackets):
+    from ot2 import converters as ot2_converters
+
+    ot2_converters.symmetrical.keyboard.KeyboardTimeBracketsToAdaptedKeyboardTimeBracketsConverter().convert(
+        time_brackets
+    )
+
+
+@functools.lru_cache()
+def _get_river_phrase_and_time_range():
+    from ot2 import constants as ot2_constants
+
+    prepare_build()
+    absolute_time = 0
+    for nth_part, part in enumerate(ot2_constants.structure.STRUCTURE):
+        absolute_time += part[0].duration
+        cengkok_phrase = part[1]
+        if nth_part == NTH_RIVER_PART:
+            start_time = float(absolute_time)
+            return (
+                cengkok_phrase,
+                start_time,
+                start_time + cengkok_phrase.duration_in_seconds,
+            )
+        absolute_time += cengkok_phrase.duration_in_seconds
+    raise IndexError(f"Structure doesn't have a part {NTH_RIVER_PART}")
+
+
+def _setup_river():
+    return copy.deepcopy(_get_river_phrase_and_time_range())
+
+
+@benchmark("converters", setup=_setup_river)
+def river_phrase_to_time_brackets(phrase_and_time_range):
+    from ot2 import converters as ot2_converters
+
+    cengkok_phrase, start_time, end_time = phrase_and_time_range
+    ot2_converters.symmetrical.cengkoks.RiverPhraseToTimeBracketsConverter(
+        start_time, end_time
+    ).convert(cengkok_phrase)
+
+
+def _setup_common_harmonics():
+    from ot2 import constants as ot2_constants
+    from ot2 import converters as ot2_converters
+
+    ensure_registered()
+    sequential_event_pair = []
+    for instrument_id in (
+        ot2_constants.instruments.ID_SUS0,
+        ot2_constants.instruments.ID_SUS1,
+    ):
+        sequential_events = ot2_converters.symmetrical.spectrals.TimeBracketContainerToSequentialEventsConverter(
+            instrument_id
+        ).convert(
+            ot2_constants.time_brackets_container.TIME_BRACKETS
+        )
+        sequential_event_pair.append(sequential_events[0])
+    return tuple(sequential_event_pair)
+
+
+@benchmark("converters", setup=_setup_common_harmonics, n_repetitions=3)
+def sequential_event_pair_to_common_harmonics(sequential_event_pair):
+    from ot2 import converters as ot2_converters
+
+    ot2_converters.symmetrical.spectrals.SequentialEventPairToCommonHarmonicsSequentialEvent().convert(
+        sequential_event_pair
+    )
@@ -0,0 +1,165 @@
+"""Run the benchmarks of the ot2 build pipeline and report them as JSON.
+
+Call from the root of the repository (the build uses relative paths):
+
+    python benchmarks/run.py --output benchmarks/results/$(git rev-parse --short HEAD).json
+
+Compare with the results of a previous commit:
+
+    python benchmarks/run.py --group converters --compare benchmarks/results/abc123.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import typing
+
+import common
+
+# import the benchmark modules to fill the registry
+import converter_benchmarks  # noqa: F401
+import stage_benchmarks  # noqa: F401
+
+# a benchmark counts as regression if its median is X times slower
+DEFAULT_REGRESSION_THRESHOLD = 1.1
+
+
+def _get_commit() -> typing.Optional[str]:
+    try:
+        return (
+            subprocess.check_output(
+                ("git", "rev-parse", "HEAD"), stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _select_benchmarks(
+    groups: typing.Sequence[str], names: typing.Sequence[str]
+) -> typing.Tuple[common.Benchmark, ...]:
+    selected_benchmarks = []
+    for name, benchmark in common.BENCHMARKS.items():
+        if groups and benchmark.group not in groups:
+            continue
+        if names and not any(part in name for part in names):
+            continue
+        selected_benchmarks.append(benchmark)
+    return tuple(selected_benchmarks)
+
+
+def run(
+    benchmarks: typing.Sequence[common.Benchmark],
+    n_repetitions: typing.Optional[int] = None,
+) -> typing.Dict[str, typing.Any]:
+    results = []
+    for benchmark in benchmarks:
+        print(f"RUN {benchmark.name}...", file=sys.stderr)
+        result = benchmark.run(n_repetitions)
+        print(
+            f"{benchmark.name}: MEDIAN {result['median']:.3f} SECONDS",
+            file=sys.stderr,
+        )
+        results.append(result)
+
+    return {
+        "commit": _get_commit(),
+        "date": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": common.SEED,
+        "results": results,
+    }
+
+
+def compare(
+    report: typing.Dict[str, typing.Any],
+    previous_report: typing.Dict[str, typing.Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> typing.Tuple[str, ...]:
+    """Print speed ratio to previous report and return names of regressions."""
+
+    name_to_previous_result = {
+        result["name"]: result for result in previous_report["results"]
+    }
+    regressions = []
+    for result in report["results"]:
+        try:
+            previous_result = name_to_previous_result[result["name"]]
+        except KeyError:
+            continue
+        ratio = result["median"] / previous_result["median"]
+        is_regression = ratio > threshold
+        if is_regression:
+            regressions.append(result["name"])
+        print(
+            f"{result['name']}: {ratio:.2f}x"
+            + (" (REGRESSION)" if is_regression else ""),
+            file=sys.stderr,
+        )
+    return tuple(regressions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--group",
+        action="append",
+        default=[],
+        help="only run benchmarks of this group ('stages' or 'converters')",
+    )
+    parser.add_argument(
+        "--name",
+        action="append",
+        default=[],
+        help="only run benchmarks whose name contains this string",
+    )
+    parser.add_argument(
+        "--repetitions", type=int, default=None, help="overwrite repetitions"
+    )
+    parser.add_argument("--output", default=None, help="path of the JSON report")
+    parser.add_argument(
+        "--compare", default=None, help="path of a previous JSON report"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="only print names of benchmarks"
+    )
+    arguments = parser.parse_args()
+
+    benchmarks = _select_benchmarks(arguments.group, arguments.name)
+
+    if arguments.list:
+        for benchmark in benchmarks:
+            print(benchmark.name)
+        return
+
+    report = run(benchmarks, arguments.repetitions)
+
+    if arguments.output:
+        output_directory = os.path.dirname(arguments.output)
+        if output_directory:
+            os.makedirs(output_directory, exist_ok=True)
+        with open(arguments.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if arguments.compare:
+        with open(arguments.compare, "r") as f:
+            previous_report = json.load(f)
+        if compare(report, previous_report, arguments.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Benchmarks for the stages of the build pipeline (see 'main.py').
+
+The stages use the lazy caches in 'ot2/constants' in the same way as a
+normal build does: if the pickle files exist and their hashes are still
+valid, the stages measure the time of a warm build. Delete the pickle files
+(or set the COMPUTE_* flags in 'ot2/constants/compute.py') to measure a cold
+build.
+"""
+
+from common import benchmark
+from common import ensure_registered
+from common import register_time_brackets
+from common import reset_time_brackets_container
+
+MAKE_CLARINET_VERSION = False
+
+
+@benchmark("stages", setup=reset_time_brackets_container, n_repetitions=1)
+def register(_):
+    register_time_brackets()
+
+
+@benchmark("stages", setup=ensure_registered, n_repetitions=1)
+def illustrate(_):
+    from ot2 import illustrate
+
+    illustrate.main(MAKE_CLARINET_VERSION)
+
+
+@benchmark("stages", setup=ensure_registered, n_repetitions=1)
+def render(_):
+    from ot2 import render
+
+    render.main(MAKE_CLARINET_VERSION)
+
+
+@benchmark("stages", n_repetitions=1)
+def concatenate_score_parts(_):
+    from ot2 import concatenate_score_parts
+
+    concatenate_score_parts.main()
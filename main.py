@@ -1,7 +1,74 @@
 """Main file for rendering relevant data"""
 
+import argparse
+
+
+def _parse_time(time: str) -> float:
+    # accepts seconds ('1230.5') or minutes and seconds ('20:30.5')
+    try:
+        minutes, seconds = time.split(":") if ":" in time else ("0", time)
+        return (float(minutes) * 60) + float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time '{time}'") from None
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="record wall time, cpu time and maximum memory of each (sub) stage"
+        " and write them to this path",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=("chrome", "speedscope"),
+        default="chrome",
+        help="format of the trace file",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=("cprofile", "pyinstrument"),
+        default=None,
+        help="also profile each stage (implies recording spans)",
+    )
+    parser.add_argument(
+        "--profile-directory",
+        default="builds/profiles",
+        help="where the profiles of the stages get saved",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rerun all build tasks, even if they are up to date",
+    )
+    parser.add_argument(
+        "--from",
+        dest="start",
+        type=_parse_time,
+        default=None,
+        help="only build the piece from this time on (seconds or MM:SS)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="end",
+        type=_parse_time,
+        default=None,
+        help="only build the piece until this time (seconds or MM:SS)",
+    )
+    arguments = parser.parse_args()
+    if (
+        arguments.start is not None
+        and arguments.end is not None
+        and arguments.start >= arguments.end
+    ):
+        parser.error("'--from' has to be before '--to'")
+    return arguments
+
 
 if __name__ == "__main__":
+    arguments = _parse_arguments()
+
     from mutwo import converters
     from ot2 import constants as ot2_constants
 
@@ -11,18 +78,31 @@ if __name__ == "__main__":
     converters.symmetrical.time_brackets_constants.DEFAULT_PRECISION = (
         ot2_constants.stochastic_calculation.PRECISION
     )
+    if arguments.start is not None or arguments.end is not None:
+        ot2_constants.compute.TIME_WINDOW = (
+            0 if arguments.start is None else arguments.start,
+            float("inf") if arguments.end is None else arguments.end,
+        )
+        ot2_constants.paths.set_time_window_build_path(
+            *ot2_constants.compute.TIME_WINDOW
+        )
 
-    from ot2 import concatenate_score_parts
-    from ot2 import illustrate
-    from ot2 import register
-    from ot2 import render
+    from ot2 import build
     from ot2 import tape
+    from ot2.utilities import profiling
 
     MAKE_CLARINET_VERSION = False
 
-    register.main()
-    illustrate.main(MAKE_CLARINET_VERSION)
-    render.main(MAKE_CLARINET_VERSION)
-    concatenate_score_parts.main()
+    if arguments.trace or arguments.profile:
+        profiling.enable(arguments.profile, arguments.profile_directory)
+
+    # only reruns the tasks (register, illustrate, render jobs, concatenate
+    # score parts) whose dependencies changed since the last build
+    build.main(MAKE_CLARINET_VERSION, force=arguments.force)
 
     # tape.add_resonators()
+
+    if profiling.is_enabled():
+        profiling.print_summary()
+        if arguments.trace:
+            profiling.write_trace(arguments.trace, arguments.trace_format)
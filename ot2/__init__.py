@@ -18,5 +18,6 @@ from . import postprocess
 from . import register
 from . import illustrate
 from . import concatenate_score_parts
+from . import build
 from . import synthesis
 from . import tape
@@ -8,6 +8,7 @@ from mutwo.events import basic
 
 from ot2.analysis import distributed_phrases_constants
 from ot2.analysis import phrases
+from ot2.utilities import lazy
 
 
 def distribute_phrases(splitted_parts: typing.Tuple[phrases.Phrases, ...]):
@@ -48,4 +49,10 @@ def distribute_phrases(splitted_parts: typing.Tuple[phrases.Phrases, ...]):
     return distribute_phrases
 
 
-DISTRIBUTED_PHRASES = distribute_phrases(phrases.SPLITTED_PARTS)
+def _make_distributed_phrases():
+    return distribute_phrases(phrases.SPLITTED_PARTS)
+
+
+__getattr__ = lazy.make_module_getattr(
+    __name__, {"DISTRIBUTED_PHRASES": _make_distributed_phrases}
+)
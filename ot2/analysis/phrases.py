@@ -19,6 +19,7 @@ from mutwo.parameters import volumes
 
 from ot2.analysis import phrases_constants
 from ot2.generators.zimmermann import pulse_transitions
+from ot2.utilities import lazy
 
 
 class PhraseEvent(basic.SimpleEvent):
@@ -244,6 +245,9 @@ def synthesize_splitted_parts(splitted_parts: typing.Tuple[Phrases, ...]):
 
 
 # _make_splitted_parts()
-SPLITTED_PARTS = _import_splitted_parts()
 
-synthesize_splitted_parts(SPLITTED_PARTS)
+# the splitted parts are only unpickled when they are accessed for the first
+# time (the midi file of the splitted parts gets written by 'illustrate.main')
+__getattr__ = lazy.make_module_getattr(
+    __name__, {"SPLITTED_PARTS": _import_splitted_parts}
+)
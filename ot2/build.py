@@ -0,0 +1,268 @@
+"""Build the piece via a task graph which only reruns outdated tasks.
+
+The tasks are: registering all time brackets, illustrating, one render
+job per instrument (see 'render._make_render_jobs') and concatenating
+the score parts. Each task only reruns if its dependencies (source code,
+the time brackets it reads, input files) changed or if its outputs are
+missing (see :mod:`ot2.utilities.tasks`).
+
+Public interaction via "main" method.
+"""
+
+import glob
+import pathlib
+import typing
+
+from ot2 import analysis
+from ot2 import concatenate_score_parts
+from ot2 import constants
+from ot2 import converters
+from ot2 import events
+from ot2 import illustrate
+from ot2 import manual
+from ot2 import noise_constants
+from ot2 import parameters
+from ot2 import postprocess
+from ot2 import register
+from ot2 import render
+from ot2 import stochastic
+from ot2 import stochastic_constants
+from ot2 import third_way
+from ot2 import third_way_constants
+from ot2 import tweaks
+from ot2 import utilities as ot2_utilities
+
+NOTATED_INSTRUMENT_IDS = (
+    constants.instruments.ID_SUS0,
+    constants.instruments.ID_SUS1,
+    constants.instruments.ID_SUS2,
+    constants.instruments.ID_KEYBOARD,
+)
+
+
+def _register():
+    register.main()
+    constants.time_brackets_container.TIME_BRACKETS.save(
+        constants.paths.REGISTERED_TIME_BRACKETS_PATH
+    )
+    # the render jobs only load the time brackets which they need
+    _load_registered_time_brackets()
+
+
+def _load_registered_time_brackets():
+    constants.time_brackets_container.TIME_BRACKETS = (
+        events.time_brackets.IndexedTimeBracketContainer.load(
+            constants.paths.REGISTERED_TIME_BRACKETS_PATH
+        )
+    )
+
+
+def _get_register_dependencies() -> tuple:
+    return (
+        register,
+        postprocess,
+        tweaks,
+        manual,
+        third_way,
+        third_way_constants,
+        stochastic,
+        stochastic_constants,
+        noise_constants,
+        converters.symmetrical,
+        events,
+        parameters,
+        constants,
+        constants.compute.TIME_WINDOW,
+        pathlib.Path(constants.families_pitch.FAMILIES_PITCH_PATH),
+    )
+
+
+def _get_render_flags() -> tuple:
+    return (
+        constants.compute.RENDER_SOUNDFILES,
+        constants.compute.RENDER_MIDIFILES,
+        constants.compute.RENDER_NOTATION,
+        constants.compute.RENDER_VIDEOS,
+        constants.compute.RENDER_PILLOW,
+        constants.compute.RENDER_SINES,
+        constants.compute.RENDER_DRONE,
+        constants.compute.TIME_WINDOW,
+        constants.compute.STREAM_MIDI_FILES,
+        constants.compute.SYNTHESIZE_WITH_CSOUND,
+        constants.compute.RENDER_PILLOWS_TO_ONE_MULTICHANNEL_FILE,
+        constants.compute.COMPILE_NOTATION_IN_BLOCKS,
+    )
+
+
+def _get_read_time_brackets(
+    instrument_ids: typing.Optional[typing.Tuple[str, ...]]
+) -> tuple:
+    # the hashes of the time brackets can be read without loading them
+    if instrument_ids is None:
+        return constants.time_brackets_container.TIME_BRACKETS.get_digests()
+    return tuple(
+        constants.time_brackets_container.TIME_BRACKETS.get_digests(instrument_id)
+        for instrument_id in instrument_ids
+    )
+
+
+def _get_notation_path(instrument_id: str) -> str:
+    return f"{constants.paths.NOTATION_PATH}/oT2_{instrument_id}.pdf"
+
+
+def _get_render_outputs(
+    instrument_ids: typing.Optional[typing.Tuple[str, ...]]
+) -> typing.Tuple[str, ...]:
+    outputs = []
+    if constants.compute.RENDER_NOTATION and instrument_ids:
+        outputs.extend(
+            _get_notation_path(instrument_id)
+            for instrument_id in instrument_ids
+            if instrument_id in NOTATED_INSTRUMENT_IDS
+        )
+    # the midi files and sound files are found after the job ran
+    for pattern in render._get_midi_and_sound_file_patterns(instrument_ids):
+        outputs.extend(sorted(glob.glob(pattern)))
+    return tuple(outputs)
+
+
+def _get_csound_orchestras() -> typing.Tuple[pathlib.Path, ...]:
+    return tuple(
+        map(
+            pathlib.Path,
+            sorted(
+                glob.glob(
+                    f"{converters.frontends.csound_constants.FILES_PATH}/*.orc"
+                )
+            ),
+        )
+    )
+
+
+def _make_render_task(
+    name: str,
+    instrument_ids: typing.Optional[typing.Tuple[str, ...]],
+    render_job: typing.Callable[[], None],
+    make_clarinet_version: bool,
+) -> ot2_utilities.tasks.Task:
+    return ot2_utilities.tasks.Task(
+        f"render {name}",
+        render_job,
+        dependencies=lambda: (
+            render,
+            converters.frontends,
+            converters.symmetrical,
+            *_get_csound_orchestras(),
+            # the notation is compiled and the time brackets are loaded with
+            # the utilities
+            ot2_utilities.lilypond,
+            ot2_utilities.serialization,
+            constants.instruments,
+            constants.paths,
+            make_clarinet_version,
+            _get_render_flags(),
+            _get_read_time_brackets(instrument_ids),
+        ),
+        upstream=("register",),
+        outputs=lambda: _get_render_outputs(instrument_ids),
+        parallel=True,
+    )
+
+
+def _get_microtonal_pitches_list_path(
+    instrument_id: str, with_ratios: bool = False
+) -> str:
+    return (
+        f"{constants.paths.ILLUSTRATIONS_PATH}/{instrument_id}_microtonal_pitches"
+        + ("_with_ratios" if with_ratios else "")
+        + ".pdf"
+    )
+
+
+def _make_tasks(
+    make_clarinet_version: bool,
+) -> typing.Tuple[ot2_utilities.tasks.Task, ...]:
+    render_tasks = tuple(
+        _make_render_task(name, instrument_ids, render_job, make_clarinet_version)
+        for name, instrument_ids, render_job in render._make_render_jobs(
+            make_clarinet_version
+        )
+    )
+    score_part_paths = tuple(
+        _get_microtonal_pitches_list_path(instrument_id)
+        for instrument_id in NOTATED_INSTRUMENT_IDS[:3]
+    ) + tuple(
+        _get_notation_path(instrument_id)
+        for instrument_id in NOTATED_INSTRUMENT_IDS
+        + (constants.instruments.ID_NOISE,)
+    )
+    illustration_paths = tuple(
+        _get_microtonal_pitches_list_path(instrument_id, with_ratios)
+        for instrument_id in NOTATED_INSTRUMENT_IDS[:3]
+        for with_ratios in (False, True)
+    ) + (f"{constants.paths.ILLUSTRATIONS_PATH}/noise_0.pdf",)
+    return (
+        ot2_utilities.tasks.Task(
+            "register",
+            _register,
+            dependencies=_get_register_dependencies,
+            outputs=(constants.paths.REGISTERED_TIME_BRACKETS_PATH,),
+            load=_load_registered_time_brackets,
+        ),
+        ot2_utilities.tasks.Task(
+            "illustrate",
+            lambda: illustrate.main(make_clarinet_version),
+            dependencies=lambda: (
+                illustrate,
+                analysis,
+                noise_constants,
+                converters.frontends,
+                make_clarinet_version,
+                constants.compute.TIME_WINDOW,
+                _get_read_time_brackets(NOTATED_INSTRUMENT_IDS[:3]),
+            ),
+            upstream=("register",),
+            outputs=illustration_paths,
+        ),
+    ) + render_tasks + (
+        ot2_utilities.tasks.Task(
+            "concatenate score parts",
+            concatenate_score_parts.main,
+            dependencies=lambda: (
+                concatenate_score_parts,
+                *map(pathlib.Path, score_part_paths),
+            ),
+            upstream=("illustrate",) + tuple(task.name for task in render_tasks),
+            outputs=(
+                f"{constants.paths.SCORES_PATH}/ohneTitel2.pdf",
+                *(
+                    f"{constants.paths.SCORES_PATH}/oT2_{instrument_id}.pdf"
+                    for instrument_id in NOTATED_INSTRUMENT_IDS
+                    + (constants.instruments.ID_NOISE,)
+                ),
+            ),
+        ),
+    )
+
+
+def main(
+    make_clarinet_version: bool = True,
+    force: bool = False,
+    n_processes: typing.Optional[int] = None,
+) -> typing.Tuple[str, ...]:
+    """Run all outdated tasks of the build.
+
+    :param make_clarinet_version: Render sustaining instrument 1 for clarinet.
+    :param force: Rerun all tasks, even if they are up to date.
+    :param n_processes: How many render jobs can run at the same time.
+        Defaults to :const:`ot2.constants.compute.N_PROCESSES_FOR_RENDERING`.
+    :return: The names of the tasks which ran.
+    """
+
+    if n_processes is None:
+        n_processes = constants.compute.N_PROCESSES_FOR_RENDERING
+
+    task_graph = ot2_utilities.tasks.TaskGraph(
+        _make_tasks(make_clarinet_version), constants.paths.BUILD_MANIFEST_PATH
+    )
+    return task_graph.run(force=force, n_processes=n_processes)
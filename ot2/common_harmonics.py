@@ -2,25 +2,42 @@ import itertools
 import typing
 
 from mutwo import events
-from mutwo import utilities
 
 from ot2 import constants
 from ot2 import converters
+from ot2 import utilities as ot2_utilities
 
 
-@utilities.decorators.compute_lazy(
+INSTRUMENT_IDS = (
+    constants.instruments.ID_SUS0,
+    constants.instruments.ID_SUS1,
+    constants.instruments.ID_SUS2,
+    constants.instruments.ID_KEYBOARD,
+    constants.instruments.ID_DRONE,
+)
+
+
+@ot2_utilities.decorators.compute_lazy(
     "ot2/constants/.commonHarmonics.pickle",
+    # the common harmonics are calculated from the already registered
+    # time brackets of the instruments; the hashes of those time brackets
+    # can be read without loading the time brackets (and without hashing
+    # the complete container)
+    dependencies=lambda: (
+        converters.symmetrical.spectrals,
+        tuple(
+            constants.time_brackets_container.TIME_BRACKETS.get_digests(
+                instrument_id
+            )
+            for instrument_id in INSTRUMENT_IDS
+        ),
+    ),
     force_to_compute=constants.compute.COMPUTE_COMMON_HARMONICS,
+    pickle_module=ot2_utilities.serialization,
 )
 def main() -> typing.Tuple[typing.Tuple[str, events.basic.SequentialEvent], ...]:
     instrument_id_and_sequential_events = {}
-    for instrument_id in (
-        constants.instruments.ID_SUS0,
-        constants.instruments.ID_SUS1,
-        constants.instruments.ID_SUS2,
-        constants.instruments.ID_KEYBOARD,
-        constants.instruments.ID_DRONE,
-    ):
+    for instrument_id in INSTRUMENT_IDS:
         converter = converters.symmetrical.spectrals.TimeBracketContainerToSequentialEventsConverter(
             instrument_id
         )
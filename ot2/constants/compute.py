@@ -1,3 +1,7 @@
+# Cached stages get recomputed automatically if their inputs change (see
+# 'ot2.utilities.decorators.compute_lazy'). The COMPUTE_* flags only force
+# a recomputation even if the inputs didn't change.
+
 # """
 COMPUTE_FAMILIES_PITCH = False
 COMPUTE_STOCHASTIC_PARTS = False
@@ -48,3 +52,57 @@ RENDER_MIDIFILES = True
 RENDER_NOTATION = True
 RENDER_VIDEOS = False
 """
+
+# only the time brackets which overlap with this time window (start and
+# end in seconds) get rendered and illustrated (None means the complete
+# piece); set by the '--from' and '--to' arguments of 'main.py'
+TIME_WINDOW = None
+
+# how many processes are used for generating the stochastic parts
+# (1 means everything runs in the main process)
+N_PROCESSES_FOR_STOCHASTIC_PARTS = 1
+
+# every X seconds (of the piece) the state of the generators of the
+# stochastic parts is saved, so that single time windows can be
+# regenerated without calculating everything before them
+STOCHASTIC_CHECKPOINT_INTERVAL = 60
+
+# how many render jobs (one per instrument) can run at the same time
+N_PROCESSES_FOR_RENDERING = 1
+
+# how many processes are used for evolving the pitch families if
+# COMPUTE_FAMILIES_PITCH is True (None means one process per CPU; the
+# result is the same for any number of processes)
+N_PROCESSES_FOR_FAMILIES_PITCH = None
+
+# evaluate the weight curves of all events of a time bracket in one
+# vectorized pass when assigning curves on events (False uses mutwos
+# AssignCurveAndWeightPairsOnEventsConverter which evaluates one envelope
+# at a time)
+BATCH_CURVE_AND_WEIGHT_ASSIGNMENT = True
+
+# write midi files time bracket by time bracket instead of converting the
+# complete (rest padded) event of an instrument at once (False uses
+# mutwos MidiFileConverter on the complete event)
+STREAM_MIDI_FILES = True
+
+# render the sine tones and the pillow events with Csound ('sine.orc' and
+# 'pillow.orc') instead of the numpy based synthesis of
+# 'ot2.converters.frontends.synthesis'
+SYNTHESIZE_WITH_CSOUND = False
+
+# write the synthesized pillow events to one four channel file
+# ('pillows.wav') instead of one mono file per pillow (all pillows are
+# rendered in one pass in both cases, unless SYNTHESIZE_WITH_CSOUND is True)
+RENDER_PILLOWS_TO_ONE_MULTICHANNEL_FILE = False
+
+# compile the notation of each instrument score block by score block (one
+# LilyPond file per time bracket): only blocks whose LilyPond source
+# changed get compiled again and the pdfs of all blocks are merged. Each
+# block starts on a new page and the pages aren't numbered (False compiles
+# the complete part as one LilyPond file)
+COMPILE_NOTATION_IN_BLOCKS = False
+
+# how many LilyPond processes can run at the same time if
+# COMPILE_NOTATION_IN_BLOCKS is True (None means one process per CPU)
+N_PROCESSES_FOR_LILYPOND = None
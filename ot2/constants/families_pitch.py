@@ -1,12 +1,17 @@
 """Definition of global 'FamilyOfPitchCurves'.
 """
 
+import collections
 import copy
 import itertools
 import operator
+import os
 import pickle
+import sys
 import typing
 
+import numpy as np
+
 from mutwo.converters.frontends import ekmelily_constants
 from mutwo.events import basic
 from mutwo.events import families
@@ -16,6 +21,10 @@ from mutwo.utilities import tools
 from ot2.constants import compute
 from ot2.constants import common_product_set_scales
 from ot2.constants import structure
+from ot2.events import families as ot2_families
+from ot2.utilities import decorators
+from ot2.utilities import lazy
+from ot2.utilities import processes
 
 
 def _find_closest_approximation_of_interval_in_cps_scale_candidates(
@@ -146,7 +155,17 @@ def _extend_cps_scale_melody(
     return tuple(resulting_melody)
 
 
-def _family_data_to_families(
+# duration, root pitches and connection pitches of a family which still has
+# to be evolved
+FamilyBlueprint = typing.Tuple[
+    float,
+    typing.Tuple[pitches.JustIntonationPitch, ...],
+    typing.Tuple[pitches.JustIntonationPitch, ...],
+]
+FamilyBlueprintAndSeed = typing.Tuple[FamilyBlueprint, int]
+
+
+def _family_data_to_family_blueprints(
     last_pitch_of_last_melodic_phrase: pitches.JustIntonationPitch,
     first_pitch_of_next_melodic_phrase: pitches.JustIntonationPitch,
     duration_in_seconds: float,
@@ -154,9 +173,7 @@ def _family_data_to_families(
     n_root_notes_per_family: typing.Tuple[int, ...],
     density: float,
     rest_distribution: typing.Tuple[float, ...],
-) -> basic.SequentialEvent[
-    typing.Union[families.FamilyOfPitchCurves, basic.SimpleEvent]
-]:
+) -> typing.Tuple[typing.Union[FamilyBlueprint, basic.SimpleEvent], ...]:
     # (1) get root notes
     n_root_notes_summed = sum(n_root_notes_per_family)
     (
@@ -202,8 +219,8 @@ def _family_data_to_families(
             concatenated_duration_for_all_rests / n_rests for _ in range(n_rests)
         ]
 
-    # (3) build families / rests
-    family_structure = basic.SequentialEvent([])
+    # (3) plan families / rests
+    family_structure = []
     root_note_indices = tuple(tools.accumulate_from_zero(n_root_notes_per_family))
     for (
         root_notes_index_start,
@@ -224,7 +241,7 @@ def _family_data_to_families(
         connection_notes_for_current_family = _get_connection_pitches_for_root_pitches(
             root_notes_for_current_family, pitch_pair_to_connection_pitch
         )
-        new_family = families.RootAndConnectionBasedFamilyOfPitchCurves(
+        family_blueprint = (
             duration_for_current_family_in_seconds,
             tuple(
                 (
@@ -238,10 +255,8 @@ def _family_data_to_families(
                 ).normalize(mutate=False)
                 for pitch in connection_notes_for_current_family
             ),
-            generations=GENERATIONS,
-            population_size=POPULATION_SIZE,
         )
-        family_structure.append(new_family)
+        family_structure.append(family_blueprint)
 
     family_structure.append(
         basic.SimpleEvent(
@@ -250,11 +265,113 @@ def _family_data_to_families(
         )
     )
 
-    assert round(family_structure.duration, 3) == (
+    planned_duration = sum(
+        event.duration if isinstance(event, basic.SimpleEvent) else event[0]
+        for event in family_structure
+    )
+    assert round(planned_duration, 3) == (
         round(duration_in_seconds + duration_of_following_cengkok_part_in_seconds, 3)
     )
 
-    return family_structure
+    return tuple(family_structure)
+
+
+def _evolve_family(
+    family_blueprint_and_seed: FamilyBlueprintAndSeed,
+) -> families.RootAndConnectionBasedFamilyOfPitchCurves:
+    import random
+
+    import pygmo as pg
+
+    family_blueprint, seed = family_blueprint_and_seed
+    duration_in_seconds, root_pitches, connection_pitches = family_blueprint
+
+    # each family gets its own seed, so that the result neither depends on
+    # the order in which the families are evolved nor on the process
+    random.seed(seed)
+    np.random.seed(seed)
+    pg.set_global_rng_seed(seed)
+
+    return families.RootAndConnectionBasedFamilyOfPitchCurves(
+        duration_in_seconds,
+        root_pitches,
+        connection_pitches,
+        generations=GENERATIONS,
+        population_size=POPULATION_SIZE,
+    )
+
+
+def _get_family_blueprint_and_seed_pairs(
+    nth_part: int,
+    family_structure: typing.Tuple[
+        typing.Union[FamilyBlueprint, basic.SimpleEvent], ...
+    ],
+) -> typing.Tuple[FamilyBlueprintAndSeed, ...]:
+    # the seeds only depend on the part, so that changing the number of
+    # families of one part doesn't change the families of the other parts
+    family_blueprints = tuple(
+        event for event in family_structure if not isinstance(event, basic.SimpleEvent)
+    )
+    # otherwise the seeds of two parts would overlap
+    assert len(family_blueprints) <= N_SEEDS_PER_PART, (
+        f"Part {nth_part} has {len(family_blueprints)} families, but only"
+        f" {N_SEEDS_PER_PART} seeds per part (see 'N_SEEDS_PER_PART')."
+    )
+    return tuple(
+        (family_blueprint, FAMILY_SEED + (nth_part * N_SEEDS_PER_PART) + nth_family)
+        for nth_family, family_blueprint in enumerate(family_blueprints)
+    )
+
+
+def _get_part_path(
+    family_blueprint_and_seed_pairs: typing.Tuple[FamilyBlueprintAndSeed, ...]
+) -> str:
+    # a part only has to be evolved again if its families are evolved from
+    # different pitches, durations, seeds or evolution parameters or if the
+    # code of the evolution (e.g. the fitness function) changed
+    part_hash = decorators.hash_dependencies(
+        _evolve_family,
+        families.RootAndConnectionBasedFamilyOfPitchCurves,
+        # the module also contains the fitness function of the evolution
+        sys.modules[families.RootAndConnectionBasedFamilyOfPitchCurves.__module__],
+        tuple(
+            (
+                float(duration),
+                tuple(pitch.exponents for pitch in root_pitches),
+                tuple(pitch.exponents for pitch in connection_pitches),
+                seed,
+            )
+            for (
+                duration,
+                root_pitches,
+                connection_pitches,
+            ), seed in family_blueprint_and_seed_pairs
+        ),
+        GENERATIONS,
+        POPULATION_SIZE,
+    )
+    return f"{FAMILIES_PITCH_PER_PART_PATH}/{part_hash}.pickle"
+
+
+def _load_part(
+    family_blueprint_and_seed_pairs: typing.Tuple[FamilyBlueprintAndSeed, ...]
+) -> typing.Optional[
+    typing.List[families.RootAndConnectionBasedFamilyOfPitchCurves]
+]:
+    path = _get_part_path(family_blueprint_and_seed_pairs)
+    if os.path.exists(path):
+        return list(_import(path))
+    return None
+
+
+def _save_part(
+    family_blueprint_and_seed_pairs: typing.Tuple[FamilyBlueprintAndSeed, ...],
+    evolved_families: typing.Sequence[
+        families.RootAndConnectionBasedFamilyOfPitchCurves
+    ],
+):
+    os.makedirs(FAMILIES_PITCH_PER_PART_PATH, exist_ok=True)
+    _export(tuple(evolved_families), _get_part_path(family_blueprint_and_seed_pairs))
 
 
 def _make_families(
@@ -262,34 +379,38 @@ def _make_families(
         typing.Tuple[typing.Tuple[int, ...], float], ...
     ],
     composition_structure: structure.StructureType,
+    n_processes: typing.Optional[int] = None,
 ) -> basic.SequentialEvent[
     typing.Union[basic.SimpleEvent, families.FamilyOfPitchCurves]
 ]:
     import progressbar
 
-    families_for_all_parts = basic.SequentialEvent([])
-    with progressbar.ProgressBar(max_value=len(family_data_per_part)) as bar:
-        nth_part = 0
-        for part0, part1, family_data in zip(
-            basic.SequentialEvent([None]) + composition_structure,
-            composition_structure,
-            family_data_per_part,
-        ):
-            duration_in_seconds = part1[0].duration
-            duration_of_following_cengkok_part_in_seconds = part1[1].duration_in_seconds
-            if part0:
-                last_pitch_of_last_melodic_phrase = part0[1][-1].root
-            else:
-                last_pitch_of_last_melodic_phrase = pitches.JustIntonationPitch("1/1")
+    if n_processes is None:
+        n_processes = compute.N_PROCESSES_FOR_FAMILIES_PITCH
 
-            first_pitch_of_next_melodic_phrase = part1[1][0].root
+    # (1) plan root and connection pitches of all families (this is fast)
+    family_structure_per_part = []
+    for part0, part1, family_data in zip(
+        basic.SequentialEvent([None]) + composition_structure,
+        composition_structure,
+        family_data_per_part,
+    ):
+        duration_in_seconds = part1[0].duration
+        duration_of_following_cengkok_part_in_seconds = part1[1].duration_in_seconds
+        if part0:
+            last_pitch_of_last_melodic_phrase = part0[1][-1].root
+        else:
+            last_pitch_of_last_melodic_phrase = pitches.JustIntonationPitch("1/1")
+
+        first_pitch_of_next_melodic_phrase = part1[1][0].root
 
-            n_root_notes_per_family, density, *rest_distribution = family_data
+        n_root_notes_per_family, density, *rest_distribution = family_data
 
-            if rest_distribution:
-                rest_distribution = rest_distribution[0]
+        if rest_distribution:
+            rest_distribution = rest_distribution[0]
 
-            family_structure_for_current_part = _family_data_to_families(
+        family_structure_per_part.append(
+            _family_data_to_family_blueprints(
                 last_pitch_of_last_melodic_phrase,
                 first_pitch_of_next_melodic_phrase,
                 duration_in_seconds,
@@ -298,14 +419,75 @@ def _make_families(
                 density,
                 rest_distribution,
             )
+        )
 
-            assert round(family_structure_for_current_part.duration, 5) == round(
-                duration_in_seconds + duration_of_following_cengkok_part_in_seconds, 5
+    # (2) reuse the evolved families of all parts which didn't change
+    evolved_families_per_part = []
+    family_blueprint_and_seed_pairs = []
+    # (nth_part, nth_family_in_part) of each family which has to be evolved
+    nth_family_to_position = []
+    for nth_part, family_structure in enumerate(family_structure_per_part):
+        blueprint_and_seed_pairs = _get_family_blueprint_and_seed_pairs(
+            nth_part, family_structure
+        )
+        evolved_families = _load_part(blueprint_and_seed_pairs)
+        if evolved_families is None:
+            evolved_families = [None for _ in blueprint_and_seed_pairs]
+            family_blueprint_and_seed_pairs.extend(blueprint_and_seed_pairs)
+            nth_family_to_position.extend(
+                (nth_part, nth_family)
+                for nth_family in range(len(evolved_families))
             )
+        evolved_families_per_part.append(evolved_families)
 
-            families_for_all_parts.extend(family_structure_for_current_part)
-            bar.update(nth_part)
-            nth_part += 1
+    # (3) evolve the families of all changed parts (this is slow, therefore it
+    # happens in parallel)
+    n_missing_families_per_part = collections.Counter(
+        nth_part for nth_part, _ in nth_family_to_position
+    )
+    if family_blueprint_and_seed_pairs:
+        print(
+            f"EVOLVE {len(family_blueprint_and_seed_pairs)} FAMILIES OF"
+            f" {len(n_missing_families_per_part)} PARTS..."
+        )
+        with progressbar.ProgressBar(
+            max_value=len(family_blueprint_and_seed_pairs)
+        ) as bar:
+            for n_evolved_families, (nth_family, evolved_family) in enumerate(
+                processes.iterate_in_processes(
+                    _evolve_family, family_blueprint_and_seed_pairs, n_processes
+                )
+            ):
+                nth_part, nth_family_in_part = nth_family_to_position[nth_family]
+                evolved_families_per_part[nth_part][nth_family_in_part] = evolved_family
+                n_missing_families_per_part[nth_part] -= 1
+                # save each part as soon as it is complete, so that an interrupted
+                # computation doesn't have to start again from the beginning
+                if n_missing_families_per_part[nth_part] == 0:
+                    _save_part(
+                        _get_family_blueprint_and_seed_pairs(
+                            nth_part, family_structure_per_part[nth_part]
+                        ),
+                        evolved_families_per_part[nth_part],
+                    )
+                bar.update(n_evolved_families + 1)
+
+    # (4) put rests and evolved families together
+    families_for_all_parts = basic.SequentialEvent([])
+    for part, family_structure, evolved_families in zip(
+        composition_structure, family_structure_per_part, evolved_families_per_part
+    ):
+        evolved_families_iterator = iter(evolved_families)
+        family_structure_for_current_part = basic.SequentialEvent(
+            event
+            if isinstance(event, basic.SimpleEvent)
+            else next(evolved_families_iterator)
+            for event in family_structure
+        )
+        assert round(family_structure_for_current_part.duration, 5) == round(
+            part[0].duration + part[1].duration_in_seconds, 5
+        )
+        families_for_all_parts.extend(family_structure_for_current_part)
 
     return families_for_all_parts
 
@@ -330,25 +512,39 @@ def _concatenate_families(
 def _filter_curves_with_unnotateable_pitches(
     family_of_pitch_curves: families.FamilyOfPitchCurves,
 ) -> families.FamilyOfPitchCurves:
-    def condition(pitch_curve: families.PitchCurve) -> bool:
-        pitch = pitch_curve.pitch
-        is_notateable = True
-        for exponent, prime in zip(pitch.exponents, pitch.primes):
-            if prime > 3:
-                try:
-                    max_exponent = (
-                        ekmelily_constants.DEFAULT_PRIME_TO_HIGHEST_ALLOWED_EXPONENT[
-                            prime
-                        ]
+    filtered_family_of_pitch_curves = copy.deepcopy(family_of_pitch_curves)
+    compiled_family = ot2_families.get_compiled_family(
+        filtered_family_of_pitch_curves
+    )
+    exponents, n_exponents = compiled_family.exponents, compiled_family.n_exponents
+    is_notateable_per_curve = np.ones(len(compiled_family), dtype=bool)
+    for nth_prime, prime in enumerate(compiled_family.primes):
+        if prime > 3:
+            try:
+                max_exponent = ekmelily_constants.DEFAULT_PRIME_TO_HIGHEST_ALLOWED_EXPONENT[
+                    prime
+                ]
+            except KeyError:
+                # curves which have an exponent for this prime (even if it
+                # is 0) can't be notated
+                is_notateable_per_curve &= n_exponents <= nth_prime
+            else:
+                if max_exponent:
+                    is_notateable_per_curve &= (
+                        np.abs(exponents[:, nth_prime]) <= max_exponent
                     )
-                except KeyError:
-                    max_exponent = None
-                    is_notateable = False
-                if max_exponent and abs(exponent) > max_exponent:
-                    is_notateable = False
-        return is_notateable
 
-    return family_of_pitch_curves.filter(condition, mutate=False)
+    notateable_curve_ids = set(
+        id(pitch_curve)
+        for pitch_curve, is_notateable in zip(
+            compiled_family.pitch_curves, is_notateable_per_curve
+        )
+        if is_notateable
+    )
+    filtered_family_of_pitch_curves.filter(
+        lambda pitch_curve: id(pitch_curve) in notateable_curve_ids
+    )
+    return filtered_family_of_pitch_curves
 
 
 def _export(object_: families.FamilyOfPitchCurves, path: str):
@@ -366,8 +562,15 @@ def _import(path: str):
 # GENERATIONS = 2
 GENERATIONS = 200
 POPULATION_SIZE = 80
+# the nth family of the mth part is evolved with the seed
+# FAMILY_SEED + (m * N_SEEDS_PER_PART) + n
+FAMILY_SEED = 100
+N_SEEDS_PER_PART = 100
 
 FAMILIES_PITCH_PATH = "ot2/constants/FAMILIES_PITCH.pickle"
+# the evolved families of each part are saved separately, so that only the
+# parts which changed have to be evolved again
+FAMILIES_PITCH_PER_PART_PATH = "ot2/constants/.families_pitch_per_part"
 
 FAMILY_DATA_PER_PART = (
     # PART(N_ROOT_NOTES_PER_FAMILY, DENSITY, REST_DURATION_PERCENTAGE)
@@ -386,14 +589,36 @@ FAMILY_DATA_PER_PART = (
     ((4,), 0.8),
 )
 
-if compute.COMPUTE_FAMILIES_PITCH:
-    FAMILIES_PITCH = _make_families(FAMILY_DATA_PER_PART, structure.STRUCTURE)
-    _export(FAMILIES_PITCH, FAMILIES_PITCH_PATH)
-else:
-    FAMILIES_PITCH = _import(FAMILIES_PITCH_PATH)
 
-FAMILY_PITCH = _concatenate_families(FAMILIES_PITCH)
-FAMILY_PITCH_ONLY_WITH_NOTATEABLE_PITCHES = _filter_curves_with_unnotateable_pitches(
-    FAMILY_PITCH
+def _make_or_import_families_pitch() -> basic.SequentialEvent:
+    if compute.COMPUTE_FAMILIES_PITCH:
+        families_pitch = _make_families(FAMILY_DATA_PER_PART, structure.STRUCTURE)
+        _export(families_pitch, FAMILIES_PITCH_PATH)
+    else:
+        families_pitch = _import(FAMILIES_PITCH_PATH)
+    return families_pitch
+
+
+# global names of the module don't pass the modules '__getattr__', therefore
+# the other lazy constants are accessed via the module object
+def _make_family_pitch() -> families.FamilyOfPitchCurves:
+    return _concatenate_families(sys.modules[__name__].FAMILIES_PITCH)
+
+
+def _make_family_pitch_only_with_notateable_pitches() -> families.FamilyOfPitchCurves:
+    return _filter_curves_with_unnotateable_pitches(
+        sys.modules[__name__].FAMILY_PITCH
+    )
+
+
+# the families are only loaded (or calculated) when they are accessed for
+# the first time
+__getattr__ = lazy.make_module_getattr(
+    __name__,
+    {
+        "FAMILIES_PITCH": _make_or_import_families_pitch,
+        "FAMILY_PITCH": _make_family_pitch,
+        "FAMILY_PITCH_ONLY_WITH_NOTATEABLE_PITCHES": _make_family_pitch_only_with_notateable_pitches,
+    },
 )
 # FAMILY_PITCH.show_plot()  # insane plot showing function
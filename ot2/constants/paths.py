@@ -1,3 +1,5 @@
+import os
+
 BUILD_PATH = "builds"
 NOTATION_PATH = f"{BUILD_PATH}/notations"
 ILLUSTRATIONS_PATH = f"{BUILD_PATH}/illustrations"
@@ -6,7 +8,51 @@ SOUND_FILES_PATH = f"{BUILD_PATH}/soundfiles"
 SCORES_PATH = f"{BUILD_PATH}/scores"
 KEYBOARD_CUES_PATH = f"{BUILD_PATH}/keyboard_cues"
 
+# builds of a time window are saved in their own directories, so that they
+# don't overwrite the outputs of the complete piece
+TIME_WINDOWS_PATH = f"{BUILD_PATH}/time_windows"
+# the compiled score blocks are shared by the builds of the complete piece
+# and of all time windows (see 'COMPILE_NOTATION_IN_BLOCKS')
+NOTATION_BLOCKS_PATH = f"{BUILD_PATH}/.notation_blocks"
+
 CONSTANTS_PATH = "ot2/constants"
 SCORE_CONSTANTS_PATH = f"{CONSTANTS_PATH}/score"
 COVER_PATH = f"{SCORE_CONSTANTS_PATH}/covers"
 INTRODUCTIONS_PATH = f"{SCORE_CONSTANTS_PATH}/introductions"
+
+# state of the build (see 'ot2.build'): which tasks are up to date and the
+# time brackets which are read by the tasks after the registration
+BUILD_MANIFEST_PATH = f"{BUILD_PATH}/.manifest.json"
+REGISTERED_TIME_BRACKETS_PATH = f"{CONSTANTS_PATH}/.registeredTimeBrackets.ot2"
+
+
+def set_time_window_build_path(start: float, end: float):
+    """Save notations, illustrations, midi files, sound files, scores and
+    the state of the build in the directory of the time window.
+
+    :param start: Start of the time window in seconds.
+    :param end: End of the time window in seconds.
+    """
+
+    global NOTATION_PATH, ILLUSTRATIONS_PATH, MIDI_FILES_PATH
+    global SOUND_FILES_PATH, SCORES_PATH, KEYBOARD_CUES_PATH
+    global BUILD_MANIFEST_PATH, REGISTERED_TIME_BRACKETS_PATH
+
+    time_window_path = f"{TIME_WINDOWS_PATH}/{start:g}-{end:g}"
+    NOTATION_PATH = f"{time_window_path}/notations"
+    ILLUSTRATIONS_PATH = f"{time_window_path}/illustrations"
+    MIDI_FILES_PATH = f"{time_window_path}/midi"
+    SOUND_FILES_PATH = f"{time_window_path}/soundfiles"
+    SCORES_PATH = f"{time_window_path}/scores"
+    KEYBOARD_CUES_PATH = f"{time_window_path}/keyboard_cues"
+    BUILD_MANIFEST_PATH = f"{time_window_path}/.manifest.json"
+    REGISTERED_TIME_BRACKETS_PATH = f"{time_window_path}/.registeredTimeBrackets.ot2"
+    for path in (
+        NOTATION_PATH,
+        ILLUSTRATIONS_PATH,
+        MIDI_FILES_PATH,
+        SOUND_FILES_PATH,
+        SCORES_PATH,
+        KEYBOARD_CUES_PATH,
+    ):
+        os.makedirs(path, exist_ok=True)
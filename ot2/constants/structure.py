@@ -20,6 +20,7 @@ from ot2.analysis import phrases
 from ot2.constants import duration as ot2_duration
 from ot2.constants import phrase_parts
 from ot2.events import basic as ot2_basic
+from ot2.utilities import lazy
 
 
 StructureType = basic.SequentialEvent[
@@ -112,6 +113,14 @@ def _structure_time(
 
 ADDED_DURATION_FOR_STOCHASTIC_PART_IF_CENGKOK_PART_IS_TOO_LONG = 10
 
-STRUCTURE: StructureType = _structure_time(
-    phrases.SPLITTED_PARTS, phrase_parts.PHRASE_PARTS, ot2_duration.DURATION_IN_SECONDS
-)
+
+def _make_structure() -> StructureType:
+    return _structure_time(
+        phrases.SPLITTED_PARTS,
+        phrase_parts.PHRASE_PARTS,
+        ot2_duration.DURATION_IN_SECONDS,
+    )
+
+
+# STRUCTURE: StructureType is only built when it's accessed for the first time
+__getattr__ = lazy.make_module_getattr(__name__, {"STRUCTURE": _make_structure})
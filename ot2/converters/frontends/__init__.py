@@ -6,3 +6,4 @@ from . import abjad_process_container_routines
 from . import abjad
 from . import csound
 from . import midi
+from . import synthesis
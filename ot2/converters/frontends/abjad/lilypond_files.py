@@ -21,22 +21,36 @@ class AbjadScoresToLilypondFileConverter(converters_abc.Converter):
         instrument_tag: typing.Optional[str] = None,
         paper_format: abjad_constants.PaperFormat = abjad_constants.A4,
         render_video: bool = False,
+        print_title: bool = True,
+        print_tagline: bool = True,
+        print_page_numbers: bool = True,
     ):
         self._instrument_tag = instrument_tag
         self._paper_format = paper_format
         self._render_video = render_video
+        # if the score blocks of a part get compiled separately only the
+        # first block gets the title and only the last block gets the
+        # tagline (page numbers would restart in each block)
+        self._print_title = print_title
+        self._print_tagline = print_tagline
+        self._print_page_numbers = print_page_numbers
 
     def _stress_instrument(self, abjad_score: abjad.Score):
         pass
 
     @staticmethod
-    def _make_header_block(instrument_tag: typing.Optional[str]) -> abjad.Block:
+    def _make_header_block(
+        instrument_tag: typing.Optional[str],
+        print_title: bool = True,
+        print_tagline: bool = True,
+    ) -> abjad.Block:
         header_block = abjad.Block("header")
-        header_block.title = '"ohne Titel (2)"'
-        header_block.year = '"2021"'
-        header_block.composer = '"Levin Eric Zimmermann"'
-        header_block.tagline = '"oT(2) // 2021"'
-        if instrument_tag:
+        if print_title:
+            header_block.title = '"ohne Titel (2)"'
+            header_block.year = '"2021"'
+            header_block.composer = '"Levin Eric Zimmermann"'
+        header_block.tagline = '"oT(2) // 2021"' if print_tagline else '""'
+        if print_title and instrument_tag:
             header_block.instrument = '"{} part book"'.format(
                 ot2_constants.instruments.INSTRUMENT_ID_TO_LONG_INSTRUMENT_NAME[
                     instrument_tag
@@ -61,6 +75,8 @@ class AbjadScoresToLilypondFileConverter(converters_abc.Converter):
             (padding . 1)
             (stretchability . 12))"""
                 )
+        if not self._print_page_numbers:
+            paper_block.items.append("print-page-number = ##f")
         return paper_block
 
     def convert(self, abjad_scores: typing.Sequence[abjad.Block]) -> abjad.LilyPondFile:
@@ -75,7 +91,7 @@ class AbjadScoresToLilypondFileConverter(converters_abc.Converter):
         if not self._render_video:
             lilypond_file.items.append(
                 AbjadScoresToLilypondFileConverter._make_header_block(
-                    self._instrument_tag
+                    self._instrument_tag, self._print_title, self._print_tagline
                 )
             )
         lilypond_file.items.append(self._make_paper_block())
@@ -71,7 +71,10 @@ class SineTonesToSoundFileConverter(csound.CsoundConverter):
             else 0.15,
         )
         super().__init__(
-            f"{ot2_constants.paths.SOUND_FILES_PATH}/{instrument_id}.wav",
+            # same path as the converter which doesn't need csound
+            ot2_converters.frontends.synthesis.SineTonesToSoundFileConverter.get_path(
+                instrument_id
+            ),
             "{}/sine.orc".format(ot2_converters.frontends.csound_constants.FILES_PATH),
             csound_score_converter,
             remove_score_file=True,
@@ -97,7 +100,10 @@ class PillowEventsToSoundFileConverter(csound.CsoundConverter):
             else 0.2,
         )
         super().__init__(
-            f"{ot2_constants.paths.SOUND_FILES_PATH}/{instrument_id}.wav",
+            # same path as the converter which doesn't need csound
+            ot2_converters.frontends.synthesis.PillowEventsToSoundFileConverter.get_path(
+                instrument_id
+            ),
             "{}/pillow.orc".format(
                 ot2_converters.frontends.csound_constants.FILES_PATH
             ),
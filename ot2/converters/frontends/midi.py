@@ -1,4 +1,6 @@
 import functools
+import itertools
+import numbers
 import operator
 import typing
 
@@ -8,6 +10,7 @@ import mido
 from mutwo.converters.frontends import midi
 from mutwo.converters import symmetrical
 from mutwo import events
+from mutwo.events import basic
 from mutwo import parameters
 from mutwo import utilities
 
@@ -16,6 +19,9 @@ from ot2 import constants as ot2_constants
 
 class OT2InstrumentEventToMidiFileConverter(midi.MidiFileConverter):
     _shall_apply_tempo_coverter = True
+    # while converting chunks the velocities are only scaled after all
+    # chunks have been converted (see 'convert_chunks')
+    _is_converting_chunks = False
     _tempo_converter = symmetrical.tempos.TempoConverter(
         expenvelope.Envelope.from_levels_and_durations(levels=[30, 30], durations=[1])
     )
@@ -41,26 +47,14 @@ class OT2InstrumentEventToMidiFileConverter(midi.MidiFileConverter):
         else:
             return event_to_convert
 
-    def convert(self, event_to_convert: events.abc.Event) -> events.abc.Event:
-        volumes = event_to_convert.get_parameter("volume")
-        while hasattr(volumes[0], "__iter__"):
-            volumes = functools.reduce(operator.add, volumes)
-        velocities = tuple(volume.midi_velocity for volume in volumes if volume)
+    def _set_velocity_extrema(self, velocities: typing.Sequence[int]):
         self._min_velocity_of_event = min(velocities)
         self._max_velocity_of_event = max(velocities)
 
         if self._min_velocity_of_event == self._max_velocity_of_event:
             self._max_velocity_of_event += 1
-        return super().convert(self._apply_tempo_coverter(event_to_convert))
 
-    def _note_information_to_midi_messages(
-        self,
-        absolute_tick_start: int,
-        absolute_tick_end: int,
-        velocity: int,
-        pitch: parameters.abc.Pitch,
-        available_midi_channels_cycle: typing.Iterator,
-    ) -> typing.Tuple[mido.Message, ...]:
+    def _scale_velocity(self, velocity: int) -> int:
         if self._apply_extrema:
             min_vel_ev, max_vel_ev = (
                 self._min_velocity_of_event,
@@ -68,28 +62,178 @@ class OT2InstrumentEventToMidiFileConverter(midi.MidiFileConverter):
             )
         else:
             min_vel_ev, max_vel_ev = (0, 127)
-        velocity = int(
+        return int(
             utilities.tools.scale(
                 velocity, min_vel_ev, max_vel_ev, self._min_velocity, self._max_velocity
             )
         )
-        return super()._note_information_to_midi_messages(
+
+    def _get_available_midi_channels(self, nth_voice: int) -> typing.Tuple[int, ...]:
+        if self._midi_file_type == 0 or not self._distribute_midi_channels:
+            return tuple(self._available_midi_channels)
+        n_available_midi_channels = len(self._available_midi_channels)
+        return tuple(
+            self._available_midi_channels[
+                ((nth_voice * self._n_midi_channels_per_track) + nth_channel)
+                % n_available_midi_channels
+            ]
+            for nth_channel in range(self._n_midi_channels_per_track)
+        )
+
+    def convert(self, event_to_convert: events.abc.Event) -> events.abc.Event:
+        volumes = event_to_convert.get_parameter("volume")
+        while hasattr(volumes[0], "__iter__"):
+            volumes = functools.reduce(operator.add, volumes)
+        self._set_velocity_extrema(
+            tuple(volume.midi_velocity for volume in volumes if volume)
+        )
+        return super().convert(self._apply_tempo_coverter(event_to_convert))
+
+    def convert_chunks(
+        self,
+        chunks: typing.Iterable[typing.Tuple[numbers.Real, basic.SimultaneousEvent]],
+    ):
+        """Write midi file chunk by chunk (e.g. one chunk per time bracket).
+
+        :param chunks: Pairs of absolute start time and a
+            :class:`~mutwo.events.basic.SimultaneousEvent` with one
+            :class:`~mutwo.events.basic.SequentialEvent` per voice. The
+            chunks have to be sorted by their start time.
+
+        The result equals :meth:`convert` of the complete
+        :class:`~mutwo.events.basic.SimultaneousEvent` (with rests between
+        the chunks), but the complete event never gets built: each chunk
+        is converted to midi messages immediately. The velocity extrema
+        are collected while converting the chunks and the velocities of
+        the note messages are scaled at the end.
+        """
+
+        midi_messages_per_voice = []
+        available_midi_channels_cycle_per_voice = []
+        velocities = []
+
+        self._is_converting_chunks = True
+        self._note_midi_messages = []
+        try:
+            for absolute_time, simultaneous_event in chunks:
+                for nth_voice, sequential_event in enumerate(simultaneous_event):
+                    while len(midi_messages_per_voice) <= nth_voice:
+                        midi_messages_per_voice.append([])
+                        if (
+                            self._midi_file_type == 0
+                            and available_midi_channels_cycle_per_voice
+                        ):
+                            # in a midi file of type 0 all voices share the
+                            # same track and therefore the same channels
+                            available_midi_channels_cycle = (
+                                available_midi_channels_cycle_per_voice[0]
+                            )
+                        else:
+                            available_midi_channels_cycle = itertools.cycle(
+                                self._get_available_midi_channels(
+                                    len(available_midi_channels_cycle_per_voice)
+                                )
+                            )
+                        available_midi_channels_cycle_per_voice.append(
+                            available_midi_channels_cycle
+                        )
+
+                    velocities.extend(
+                        volume.midi_velocity
+                        for volume in sequential_event.get_parameter("volume")
+                        if volume
+                    )
+
+                    # the rest before the chunk makes sure that the tempo
+                    # converter converts the chunk at its absolute position
+                    n_rests = 1 if absolute_time > 0 else 0
+                    converted_sequential_event = self._apply_tempo_coverter(
+                        basic.SequentialEvent(
+                            [basic.SimpleEvent(absolute_time)][:n_rests]
+                            + list(sequential_event)
+                        )
+                    )
+                    for simple_event_absolute_time, simple_event in zip(
+                        converted_sequential_event.absolute_times[n_rests:],
+                        converted_sequential_event[n_rests:],
+                    ):
+                        midi_messages_per_voice[nth_voice].extend(
+                            self._simple_event_to_midi_messages(
+                                simple_event,
+                                simple_event_absolute_time,
+                                available_midi_channels_cycle_per_voice[nth_voice],
+                            )
+                        )
+        finally:
+            self._is_converting_chunks = False
+
+        if not midi_messages_per_voice:
+            return
+
+        if velocities:
+            self._set_velocity_extrema(velocities)
+        # only the velocities of the notes are scaled (as in 'convert'), the
+        # control messages of the events are kept
+        for midi_message in self._note_midi_messages:
+            midi_message.velocity = self._scale_velocity(midi_message.velocity)
+        self._note_midi_messages = []
+
+        midi_file = mido.MidiFile(
+            ticks_per_beat=self._ticks_per_beat, type=self._midi_file_type
+        )
+        if self._midi_file_type == 0:
+            midi_file.tracks.append(
+                self._midi_messages_to_midi_track(
+                    tuple(itertools.chain(*midi_messages_per_voice)), add_tempo=True
+                )
+            )
+        else:
+            for nth_voice, midi_messages in enumerate(midi_messages_per_voice):
+                midi_file.tracks.append(
+                    self._midi_messages_to_midi_track(
+                        tuple(midi_messages), add_tempo=nth_voice == 0
+                    )
+                )
+        midi_file.save(filename=self.path)
+
+    def _note_information_to_midi_messages(
+        self,
+        absolute_tick_start: int,
+        absolute_tick_end: int,
+        velocity: int,
+        pitch: parameters.abc.Pitch,
+        available_midi_channels_cycle: typing.Iterator,
+    ) -> typing.Tuple[mido.Message, ...]:
+        if not self._is_converting_chunks:
+            velocity = self._scale_velocity(velocity)
+        midi_messages = super()._note_information_to_midi_messages(
             absolute_tick_start,
             absolute_tick_end,
             velocity,
             pitch,
             available_midi_channels_cycle,
         )
+        if self._is_converting_chunks:
+            self._note_midi_messages.extend(
+                midi_message
+                for midi_message in midi_messages
+                if midi_message.type in ("note_on", "note_off")
+            )
+        return midi_messages
 
 
 class SustainingInstrumentEventToMidiFileConverter(
     OT2InstrumentEventToMidiFileConverter
 ):
+    @staticmethod
+    def get_path(nth_sustaining_instrument: typing.Union[int, str]) -> str:
+        return "{}/sustaining_instrument_{}.mid".format(
+            ot2_constants.paths.MIDI_FILES_PATH, nth_sustaining_instrument
+        )
+
     def __init__(self, nth_sustaining_instrument: int):
         super().__init__(
-            path="{}/sustaining_instrument_{}.mid".format(
-                ot2_constants.paths.MIDI_FILES_PATH, nth_sustaining_instrument
-            ),
+            path=self.get_path(nth_sustaining_instrument),
             midi_file_type=0,  # monophon instruments
             min_velocity=8,
             max_velocity=35,
@@ -97,9 +241,13 @@ class SustainingInstrumentEventToMidiFileConverter(
 
 
 class DroneFofEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
+    @staticmethod
+    def get_path(nth_voice: typing.Union[int, str]) -> str:
+        return f"{ot2_constants.paths.MIDI_FILES_PATH}/drone_{nth_voice}.mid"
+
     def __init__(self, nth_voice: int):
         super().__init__(
-            path=f"{ot2_constants.paths.MIDI_FILES_PATH}/drone_{nth_voice}.mid",
+            path=self.get_path(nth_voice),
             midi_file_type=1,  # polyphon instruments
             min_velocity=2,
             max_velocity=120,
@@ -137,9 +285,13 @@ class PercussiveEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
 
 
 class KeyboardEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
+    @staticmethod
+    def get_path(nth_keyboard: typing.Union[int, str]) -> str:
+        return f"{ot2_constants.paths.MIDI_FILES_PATH}/keyboard{nth_keyboard}.mid"
+
     def __init__(self, nth_keyboard: int):
         super().__init__(
-            path=f"{ot2_constants.paths.MIDI_FILES_PATH}/keyboard{nth_keyboard}.mid",
+            path=self.get_path(nth_keyboard),
             midi_file_type=1,  # polyphon ot2_constants.instruments
             min_velocity=3,
             max_velocity=85,
@@ -147,17 +299,25 @@ class KeyboardEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
 
 
 class CommonHarmonicEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
+    @staticmethod
+    def get_path(name: str) -> str:
+        return f"{ot2_constants.paths.MIDI_FILES_PATH}/common_harmonics_{name}.mid"
+
     def __init__(self, name: str):
         super().__init__(
-            path=f"{ot2_constants.paths.MIDI_FILES_PATH}/common_harmonics_{name}.mid",
+            path=self.get_path(name),
             midi_file_type=1,  # polyphon ot2_constants.instruments
         )
 
 
 class GongEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
+    @staticmethod
+    def get_path() -> str:
+        return f"{ot2_constants.paths.MIDI_FILES_PATH}/gong.mid"
+
     def __init__(self):
         super().__init__(
-            path=f"{ot2_constants.paths.MIDI_FILES_PATH}/gong.mid",
+            path=self.get_path(),
             midi_file_type=1,  # polyphon instruments
             min_velocity=2,
             max_velocity=127,
@@ -166,9 +326,13 @@ class GongEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
 
 
 class PillowEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
+    @staticmethod
+    def get_path(nth_voice: typing.Union[int, str]) -> str:
+        return f"{ot2_constants.paths.MIDI_FILES_PATH}/pillow_{nth_voice}.mid"
+
     def __init__(self, nth_voice: int):
         super().__init__(
-            path=f"{ot2_constants.paths.MIDI_FILES_PATH}/pillow_{nth_voice}.mid",
+            path=self.get_path(nth_voice),
             midi_file_type=1,  # polyphon instruments
             min_velocity=2,
             max_velocity=120,
@@ -178,9 +342,13 @@ class PillowEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
 
 
 class MonitorSineEventToMidiFileConverter(OT2InstrumentEventToMidiFileConverter):
+    @staticmethod
+    def get_path(nth_voice: typing.Union[int, str]) -> str:
+        return f"{ot2_constants.paths.MIDI_FILES_PATH}/sine_{nth_voice}.mid"
+
     def __init__(self, nth_voice: int):
         super().__init__(
-            path=f"{ot2_constants.paths.MIDI_FILES_PATH}/sine_{nth_voice}.mid",
+            path=self.get_path(nth_voice),
             midi_file_type=1,  # polyphon instruments
             min_velocity=2,
             max_velocity=120,
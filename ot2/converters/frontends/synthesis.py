@@ -0,0 +1,459 @@
+"""Render sine tones and pillow events in process (without Csound).
+
+The converters of this module reproduce the instruments of 'sine.orc'
+and 'pillow.orc': each note is a sum of sine oscillators (partials) with
+a linear attack / sustain / release envelope. Instead of running Csound
+with 'ksmps = 1' the sound file gets synthesized block by block with
+numpy: all oscillators and envelopes of one block are calculated as
+arrays. Each finished block is appended to the (16 bit) wave file, so
+only the notes which sound at the moment are kept in memory. Several
+voices (e.g. the four pillows) can be rendered in one pass, either to one
+multichannel file or to one mono file per voice.
+"""
+
+import contextlib
+import heapq
+import operator
+import typing
+import wave
+
+import numpy as np
+
+from mutwo.converters import abc as converters_abc
+from mutwo.events import abc as events_abc
+from mutwo.events import basic
+from mutwo.events import music
+
+from ot2 import constants as ot2_constants
+
+# (start, duration, frequency, amplitude, attack, release) with start,
+# duration, attack and release in seconds
+Note = typing.Tuple[float, float, float, float, float, float]
+
+# (frequency factor, amplitude factor) of each sine oscillator of a note
+Partials = typing.Sequence[typing.Tuple[float, float]]
+
+
+def _get_sample_range(note: Note, sampling_rate: int) -> typing.Tuple[int, int]:
+    first_sample = int(round(note[0] * sampling_rate))
+    return first_sample, first_sample + int(round(note[1] * sampling_rate))
+
+
+def _add_channel_to_chunks(
+    nth_channel: int,
+    chunks: typing.Iterable[typing.Tuple[float, basic.SimultaneousEvent]],
+) -> typing.Iterator[typing.Tuple[float, int, basic.SimultaneousEvent]]:
+    for absolute_time, event in chunks:
+        yield absolute_time, nth_channel, event
+
+
+def synthesize_block(
+    notes: typing.Sequence[Note],
+    start: int,
+    end: int,
+    partials: Partials,
+    sampling_rate: int,
+) -> np.ndarray:
+    """Synthesize the samples from 'start' (included) to 'end' (excluded).
+
+    :param notes: The notes which may sound within the block.
+    :param start: First sample of the block.
+    :param end: Sample after the last sample of the block.
+    :param partials: The sine oscillators of each note.
+    :param sampling_rate: Samples per second.
+
+    Equals 'linseg 0, attack, 1, sustain, 1, release, 0' multiplied with
+    'poscil' oscillators (which start with phase 0 at the start of the
+    note) in Csound with 'ksmps = 1'.
+    """
+
+    block = np.zeros(end - start)
+    for note in notes:
+        _, duration, frequency, amplitude, attack, release = note
+        first_sample, last_sample = _get_sample_range(note, sampling_rate)
+        block_start, block_end = max(first_sample, start), min(last_sample, end)
+        if block_start >= block_end:
+            continue
+
+        time = np.arange(block_start - first_sample, block_end - first_sample) / (
+            sampling_rate
+        )
+        envelope = np.ones(len(time))
+        if attack > 0:
+            np.minimum(envelope, time / attack, out=envelope)
+        if release > 0:
+            np.minimum(envelope, (duration - time) / release, out=envelope)
+        np.clip(envelope, 0, 1, out=envelope)
+
+        phase = (2 * np.pi * frequency) * time
+        signal = np.zeros(len(time))
+        for frequency_factor, amplitude_factor in partials:
+            signal += amplitude_factor * np.sin(phase * frequency_factor)
+
+        block[block_start - start : block_end - start] += (
+            amplitude * envelope * signal
+        )
+    return block
+
+
+class AdditiveSynthesisToSoundFileConverter(converters_abc.Converter):
+    """Render :class:`~mutwo.events.music.NoteLike` events with sine oscillators.
+
+    :param path: Where to write the wave file.
+    :param partials: Frequency and amplitude factors of the oscillators of
+        each note.
+    :param simple_event_to_attack: Attack of a note relative to its
+        duration (as 'p6' in the orchestras).
+    :param simple_event_to_release: Release of a note relative to its
+        duration (as 'p7' in the orchestras).
+    :param sampling_rate: Samples per second.
+    :param block_size: How many samples get synthesized at once.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        partials: Partials,
+        simple_event_to_attack: typing.Callable[[music.NoteLike], float],
+        simple_event_to_release: typing.Callable[[music.NoteLike], float],
+        sampling_rate: int = 48000,
+        block_size: int = 2 ** 16,
+    ):
+        self.path = path
+        self._partials = tuple(partials)
+        self._simple_event_to_attack = simple_event_to_attack
+        self._simple_event_to_release = simple_event_to_release
+        self._sampling_rate = sampling_rate
+        self._block_size = block_size
+
+    def _simple_event_to_note(
+        self, simple_event: basic.SimpleEvent, absolute_time: float
+    ) -> typing.Optional[Note]:
+        try:
+            pitch_or_pitches = simple_event.pitch_or_pitches
+            volume = simple_event.volume
+        except AttributeError:
+            return None
+        if not pitch_or_pitches:
+            return None
+
+        duration = float(simple_event.duration)
+        return (
+            float(absolute_time),
+            duration,
+            pitch_or_pitches[0].frequency,
+            volume.amplitude,
+            duration * float(self._simple_event_to_attack(simple_event)),
+            duration * float(self._simple_event_to_release(simple_event)),
+        )
+
+    def _chunk_to_notes(
+        self, absolute_time: float, event: events_abc.Event
+    ) -> typing.List[Note]:
+        if isinstance(event, basic.SimpleEvent):
+            note = self._simple_event_to_note(event, absolute_time)
+            return [note] if note else []
+
+        notes = []
+        if isinstance(event, basic.SequentialEvent):
+            for event_absolute_time, sub_event in zip(event.absolute_times, event):
+                notes.extend(
+                    self._chunk_to_notes(absolute_time + event_absolute_time, sub_event)
+                )
+        else:
+            for sub_event in event:
+                notes.extend(self._chunk_to_notes(absolute_time, sub_event))
+        return notes
+
+    def _write_blocks(
+        self,
+        wave_files: typing.Sequence[wave.Wave_write],
+        active_notes_per_channel: typing.Sequence[typing.List[Note]],
+        start: int,
+        end: int,
+    ) -> int:
+        for block_start in range(start, end, self._block_size):
+            block_end = min(block_start + self._block_size, end)
+            # shape (samples, channels): the rows are the interleaved frames
+            # of a multichannel wave file
+            blocks = np.stack(
+                [
+                    synthesize_block(
+                        active_notes,
+                        block_start,
+                        block_end,
+                        self._partials,
+                        self._sampling_rate,
+                    )
+                    for active_notes in active_notes_per_channel
+                ],
+                axis=1,
+            )
+            samples = (np.clip(blocks, -1, 1) * 32767).astype("<i2")
+            if len(wave_files) == 1:
+                wave_files[0].writeframes(samples.tobytes())
+            else:
+                for nth_channel, wave_file in enumerate(wave_files):
+                    wave_file.writeframes(
+                        np.ascontiguousarray(samples[:, nth_channel]).tobytes()
+                    )
+            # forget notes which already ended
+            for active_notes in active_notes_per_channel:
+                active_notes[:] = [
+                    note
+                    for note in active_notes
+                    if _get_sample_range(note, self._sampling_rate)[1] > block_end
+                ]
+        return max(start, end)
+
+    def _convert_channel_chunks(
+        self,
+        paths: typing.Sequence[str],
+        n_channels: int,
+        channel_chunks: typing.Iterable[
+            typing.Tuple[float, int, basic.SimultaneousEvent]
+        ],
+    ):
+        # one path means that all channels are written to the same file
+        active_notes_per_channel = tuple([] for _ in range(n_channels))
+        n_written_samples = 0
+        with contextlib.ExitStack() as stack:
+            wave_files = tuple(
+                stack.enter_context(wave.open(path, "wb")) for path in paths
+            )
+            for wave_file in wave_files:
+                wave_file.setnchannels(n_channels if len(wave_files) == 1 else 1)
+                wave_file.setsampwidth(2)
+                wave_file.setframerate(self._sampling_rate)
+
+            for absolute_time, nth_channel, event in channel_chunks:
+                chunk_start = int(round(float(absolute_time) * self._sampling_rate))
+                if chunk_start < n_written_samples:
+                    message = (
+                        f"Found chunk which starts at {absolute_time} seconds,"
+                        " but the sound file has already been written until"
+                        f" {n_written_samples / self._sampling_rate} seconds."
+                        " The chunks have to be sorted by their start time."
+                    )
+                    raise ValueError(message)
+                n_written_samples = self._write_blocks(
+                    wave_files,
+                    active_notes_per_channel,
+                    n_written_samples,
+                    chunk_start,
+                )
+                active_notes_per_channel[nth_channel].extend(
+                    self._chunk_to_notes(absolute_time, event)
+                )
+
+            end = max(
+                (
+                    _get_sample_range(note, self._sampling_rate)[1]
+                    for active_notes in active_notes_per_channel
+                    for note in active_notes
+                ),
+                default=n_written_samples,
+            )
+            self._write_blocks(
+                wave_files, active_notes_per_channel, n_written_samples, end
+            )
+
+    def convert_chunks(
+        self,
+        chunks: typing.Iterable[typing.Tuple[float, basic.SimultaneousEvent]],
+    ):
+        """Render sound file chunk by chunk (e.g. one chunk per time bracket).
+
+        :param chunks: Pairs of absolute start time and event. The chunks
+            have to be sorted by their start time and the events of a
+            chunk mustn't start before the chunk.
+
+        Everything before the start of a chunk gets written to the sound
+        file before the chunk gets converted.
+        """
+
+        self._convert_channel_chunks(
+            (self.path,),
+            1,
+            _add_channel_to_chunks(0, chunks),
+        )
+
+    def convert(
+        self,
+        event_to_convert: typing.Union[
+            basic.SequentialEvent, basic.SimultaneousEvent
+        ],
+    ):
+        self.convert_chunks(((0, event_to_convert),))
+
+
+class SineTonesToSoundFileConverter(AdditiveSynthesisToSoundFileConverter):
+    """Equals 'csound.SineTonesToSoundFileConverter' ('sine.orc')."""
+
+    @staticmethod
+    def get_path(instrument_id: str) -> str:
+        return f"{ot2_constants.paths.SOUND_FILES_PATH}/{instrument_id}.wav"
+
+    def __init__(self, instrument_id: str):
+        super().__init__(
+            self.get_path(instrument_id),
+            ((1, 1), (4, 0.2)),
+            lambda note_like: note_like.attack
+            if hasattr(note_like, "attack")
+            else 0.12,
+            lambda note_like: note_like.release
+            if hasattr(note_like, "release")
+            else 0.15,
+        )
+
+
+class PillowEventsToSoundFileConverter(AdditiveSynthesisToSoundFileConverter):
+    """Equals 'csound.PillowEventsToSoundFileConverter' ('pillow.orc')."""
+
+    @staticmethod
+    def get_path(instrument_id: str) -> str:
+        return f"{ot2_constants.paths.SOUND_FILES_PATH}/{instrument_id}.wav"
+
+    def __init__(self, instrument_id: str):
+        super().__init__(
+            self.get_path(instrument_id),
+            ((1, 1),),
+            lambda pillow_event: pillow_event.attack_duration
+            if hasattr(pillow_event, "attack_duration")
+            else 0.2,
+            lambda pillow_event: pillow_event.release_duration
+            if hasattr(pillow_event, "release_duration")
+            else 0.2,
+        )
+
+
+class MultichannelAdditiveSynthesisToSoundFileConverter(
+    AdditiveSynthesisToSoundFileConverter
+):
+    """Render several voices with the same oscillators in one pass.
+
+    :param path_or_paths: Either one path (all voices are written to one
+        multichannel wave file) or one path per voice (one mono wave file
+        per voice).
+    :param n_channels: How many voices get rendered.
+
+    All other arguments equal :class:`AdditiveSynthesisToSoundFileConverter`.
+    The voices share one time axis: each block of samples gets synthesized
+    for all voices before the next block starts.
+    """
+
+    def __init__(
+        self,
+        path_or_paths: typing.Union[str, typing.Sequence[str]],
+        n_channels: int,
+        partials: Partials,
+        simple_event_to_attack: typing.Callable[[music.NoteLike], float],
+        simple_event_to_release: typing.Callable[[music.NoteLike], float],
+        sampling_rate: int = 48000,
+        block_size: int = 2 ** 16,
+    ):
+        paths = (path_or_paths,) if isinstance(path_or_paths, str) else path_or_paths
+        if len(paths) not in (1, n_channels):
+            message = (
+                f"Found {len(paths)} paths for {n_channels} channels. Use either"
+                " one path or one path per channel."
+            )
+            raise ValueError(message)
+
+        super().__init__(
+            paths[0],
+            partials,
+            simple_event_to_attack,
+            simple_event_to_release,
+            sampling_rate,
+            block_size,
+        )
+        self.paths = tuple(paths)
+        self._n_channels = n_channels
+
+    def convert_chunks_per_channel(
+        self,
+        chunks_per_channel: typing.Sequence[
+            typing.Iterable[typing.Tuple[float, basic.SimultaneousEvent]]
+        ],
+    ):
+        """Render the chunks of all voices (one chunk iterable per voice).
+
+        :param chunks_per_channel: For each channel pairs of absolute start
+            time and event (see
+            :meth:`AdditiveSynthesisToSoundFileConverter.convert_chunks`).
+        """
+
+        if len(chunks_per_channel) != self._n_channels:
+            message = (
+                f"Found {len(chunks_per_channel)} chunk streams for"
+                f" {self._n_channels} channels."
+            )
+            raise ValueError(message)
+
+        self._convert_channel_chunks(
+            self.paths,
+            self._n_channels,
+            heapq.merge(
+                *(
+                    _add_channel_to_chunks(nth_channel, chunks)
+                    for nth_channel, chunks in enumerate(chunks_per_channel)
+                ),
+                key=operator.itemgetter(0),
+            ),
+        )
+
+    def convert_chunks(
+        self,
+        chunks: typing.Iterable[typing.Tuple[float, basic.SimultaneousEvent]],
+    ):
+        self.convert_chunks_per_channel((chunks,))
+
+    def convert(
+        self,
+        events_to_convert: typing.Sequence[
+            typing.Union[basic.SequentialEvent, basic.SimultaneousEvent]
+        ],
+    ):
+        self.convert_chunks_per_channel(
+            tuple(((0, event_to_convert),) for event_to_convert in events_to_convert)
+        )
+
+
+class PillowsToSoundFileConverter(MultichannelAdditiveSynthesisToSoundFileConverter):
+    """Render all pillow loudspeakers at once (as 'pillow.orc').
+
+    :param instrument_ids: The pillows which get rendered (one channel per
+        pillow).
+    :param multichannel: If True one multichannel file ('pillows.wav') gets
+        written, otherwise one mono file per pillow (the same files as
+        :class:`PillowEventsToSoundFileConverter` writes).
+    """
+
+    @staticmethod
+    def get_path_or_paths(
+        instrument_ids: typing.Sequence[str], multichannel: bool = False
+    ) -> typing.Union[str, typing.Tuple[str, ...]]:
+        if multichannel:
+            return f"{ot2_constants.paths.SOUND_FILES_PATH}/pillows.wav"
+        return tuple(
+            PillowEventsToSoundFileConverter.get_path(instrument_id)
+            for instrument_id in instrument_ids
+        )
+
+    def __init__(
+        self,
+        instrument_ids: typing.Sequence[str],
+        multichannel: bool = False,
+    ):
+        super().__init__(
+            self.get_path_or_paths(instrument_ids, multichannel),
+            len(instrument_ids),
+            ((1, 1),),
+            lambda pillow_event: pillow_event.attack_duration
+            if hasattr(pillow_event, "attack_duration")
+            else 0.2,
+            lambda pillow_event: pillow_event.release_duration
+            if hasattr(pillow_event, "release_duration")
+            else 0.2,
+        )
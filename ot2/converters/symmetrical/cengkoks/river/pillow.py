@@ -16,6 +16,7 @@ from mutwo import parameters
 from ot2 import analysis
 from ot2 import constants as ot2_constants
 from ot2 import events as ot2_events
+from ot2 import parameters as ot2_parameters
 
 
 PillowEventsPerLoudspeaker = tuple[
@@ -500,8 +501,9 @@ class PolyphonicPhraseEventsToTaggedSimultaneousEvents(converters.abc.Converter)
         pitch_to_harmonicity = {pitch.exponents: 0 for pitch in registered_pitches}
         pitch_to_n_intervals = {pitch.exponents: 0 for pitch in registered_pitches}
         for pair in itertools.combinations(registered_pitches, 2):
-            interval = pair[0] - pair[1]
-            harmonicity = interval.harmonicity_simplified_barlow
+            harmonicity = ot2_parameters.pitches.harmonicity_simplified_barlow(
+                ot2_parameters.pitches.interval(pair[0].exponents, pair[1].exponents)
+            )
             pitch_to_harmonicity[pair[0].exponents] += harmonicity
             pitch_to_harmonicity[pair[1].exponents] += harmonicity
             pitch_to_n_intervals[pair[0].exponents] += 1
@@ -562,7 +564,7 @@ class PolyphonicPhraseEventsToTaggedSimultaneousEvents(converters.abc.Converter)
             registered_pitch_and_tag_and_harmonicity_items = tuple(
                 (
                     pitch,
-                    pitch_to_tag[pitch.normalize(mutate=False).exponents],
+                    pitch_to_tag[ot2_parameters.pitches.normalize(pitch.exponents)],
                     pitch_to_harmonicity[pitch.exponents],
                 )
                 for pitch in registered_pitches
@@ -362,16 +362,19 @@ class PhraseToContapunctusSimpliccisimusConverter(converters.abc.Converter):
         repeating_pitches = []
         for pitch in available_pitches:
             for other_pitch in simultaneous_pitches:
-                interval = pitch - other_pitch
-                interval.normalize()
-                if interval == parameters.pitches.JustIntonationPitch():
+                interval = ot2_parameters.pitches.normalize(
+                    ot2_parameters.pitches.interval(pitch.exponents, other_pitch.exponents)
+                )
+                # empty exponents == 1/1
+                if not interval:
                     if pitch not in repeating_pitches:
                         repeating_pitches.append(pitch)
-                cents = interval.cents
+                cents = ot2_parameters.pitches.cents(interval)
                 if (
                     cents <= 230
                     or cents >= 1000
-                    or interval.harmonicity_simplified_barlow < self.harmonicity_border
+                    or ot2_parameters.pitches.harmonicity_simplified_barlow(interval)
+                    < self.harmonicity_border
                 ):
                     if pitch not in dissonant_pitches:
                         dissonant_pitches.append(pitch)
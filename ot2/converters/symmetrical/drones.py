@@ -1,4 +1,5 @@
 import abc
+import copy
 import functools
 import itertools
 import operator
@@ -9,6 +10,7 @@ from mutwo import events
 from mutwo import parameters
 
 from ot2 import constants as ot2_constants
+from ot2 import events as ot2_events
 
 
 class DroneEvent(events.music.NoteLike):
@@ -223,7 +225,7 @@ class FourFofBasedFamiliesOfPitchCurvesToDroneBracketsConverter(
     ) -> events.basic.SequentialEvent:
         drone_events = events.basic.SequentialEvent([])
         for curve in pitch_curves:
-            active_range = curve.active_ranges[
+            active_range = ot2_events.families.get_active_ranges(curve)[
                 0
             ]  # root curves only have one active range
             drone_events_duration = drone_events.duration
@@ -231,21 +233,21 @@ class FourFofBasedFamiliesOfPitchCurvesToDroneBracketsConverter(
             if difference:
                 drone_events.append(events.basic.SimpleEvent(difference))
             event = events.music.NoteLike(
-                curve.pitch, active_range[-1] - active_range[0]
+                copy.deepcopy(curve.pitch), active_range[-1] - active_range[0]
             )
             drone_events.append(event)
         return drone_events
 
     def _make_even_drone_events(
-        self, filtered_family_of_pitch_curves: events.families.FamilyOfPitchCurves
+        self, root_pitch_curves: tuple[events.families.PitchCurve, ...]
     ) -> events.basic.SequentialEvent:
-        even_pitch_curves = tuple(filtered_family_of_pitch_curves)[::2]
+        even_pitch_curves = root_pitch_curves[::2]
         return self._make_drone_events_from_pitch_curves(even_pitch_curves)
 
     def _make_odd_drone_events(
-        self, filtered_family_of_pitch_curves: events.families.FamilyOfPitchCurves
+        self, root_pitch_curves: tuple[events.families.PitchCurve, ...]
     ) -> events.basic.SequentialEvent:
-        even_pitch_curves = tuple(filtered_family_of_pitch_curves)[1::2]
+        even_pitch_curves = root_pitch_curves[1::2]
         return self._make_drone_events_from_pitch_curves(even_pitch_curves)
 
     def _distribute_drone_event_on_voices(
@@ -342,8 +344,13 @@ class FourFofBasedFamiliesOfPitchCurvesToDroneBracketsConverter(
         absolute_entry_delay: parameters.abc.DurationType,
         family_of_pitch_curves: events.families.FamilyOfPitchCurves,
     ) -> events.time_brackets.TimeBracket:
-        filtered_family_of_pitch_curves = family_of_pitch_curves.filter_curves_with_tag(
-            "root", mutate=False
+        compiled_family = ot2_events.families.get_compiled_family(
+            family_of_pitch_curves
+        )
+        # no need to copy the family: the root curves are only read
+        root_pitch_curves = tuple(
+            compiled_family.pitch_curves[curve_index]
+            for curve_index in compiled_family.get_curve_indices_with_tag("root")
         )
         time_bracket = events.time_brackets.TimeBracket(
             [
@@ -355,10 +362,8 @@ class FourFofBasedFamiliesOfPitchCurvesToDroneBracketsConverter(
             start_or_start_range=absolute_entry_delay,
             end_or_end_range=absolute_entry_delay + family_of_pitch_curves.duration,
         )
-        even_drone_events = self._make_even_drone_events(
-            filtered_family_of_pitch_curves
-        )
-        odd_drone_events = self._make_odd_drone_events(filtered_family_of_pitch_curves)
+        even_drone_events = self._make_even_drone_events(root_pitch_curves)
+        odd_drone_events = self._make_odd_drone_events(root_pitch_curves)
         for drone_events in (even_drone_events, odd_drone_events):
             voices = self._make_four_voices_from_drone_events(
                 absolute_entry_delay, drone_events
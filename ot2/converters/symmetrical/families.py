@@ -5,15 +5,110 @@ import operator
 import typing
 
 import expenvelope
+import numpy as np
 
 from mutwo import converters
 from mutwo import events
 from mutwo import parameters
 from mutwo import utilities
 
+from ot2 import events as ot2_events
 from ot2 import parameters as ot2_parameters
 
 
+class BatchedAssignCurveAndWeightPairsOnEventsConverter(
+    converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter
+):
+    """Assign curve and weight pairs on all events of a time bracket at once.
+
+    Instead of asking each curve for its weight at each event one after
+    another, the absolute times of all events of the time bracket are
+    collected first. Afterwards the weight curves of all curves which are
+    active during the time bracket are evaluated at those times in one
+    vectorized pass (see
+    :class:`ot2.events.families.CompiledFamilyOfPitchCurves`).
+
+    Each event which fulfills the condition gets the attribute
+    'curve_and_weight_pairs' with all curves which have a positive weight
+    at the start of the event.
+    """
+
+    def __init__(
+        self,
+        family_of_pitch_curves: events.families.FamilyOfPitchCurves,
+        condition: typing.Callable[
+            [events.basic.SimpleEvent], bool
+        ] = lambda simple_event: True,
+    ):
+        super().__init__(family_of_pitch_curves, condition=condition)
+        self._batched_family_of_pitch_curves = family_of_pitch_curves
+        self._batched_condition = condition
+
+    def _collect_simple_events_and_absolute_times(
+        self,
+        event_to_collect: events.abc.Event,
+        absolute_entry_delay: parameters.abc.DurationType,
+        simple_event_and_absolute_time_pairs: typing.List[
+            typing.Tuple[events.basic.SimpleEvent, float]
+        ],
+    ):
+        if isinstance(event_to_collect, events.basic.SimpleEvent):
+            if self._batched_condition(event_to_collect):
+                simple_event_and_absolute_time_pairs.append(
+                    (event_to_collect, float(absolute_entry_delay))
+                )
+        elif isinstance(event_to_collect, events.basic.SequentialEvent):
+            for absolute_time, event in zip(
+                event_to_collect.absolute_times, event_to_collect
+            ):
+                self._collect_simple_events_and_absolute_times(
+                    event,
+                    absolute_entry_delay + absolute_time,
+                    simple_event_and_absolute_time_pairs,
+                )
+        else:
+            for event in event_to_collect:
+                self._collect_simple_events_and_absolute_times(
+                    event, absolute_entry_delay, simple_event_and_absolute_time_pairs
+                )
+
+    def convert(
+        self, time_bracket_to_convert: events.time_brackets.TimeBracket
+    ) -> events.time_brackets.TimeBracket:
+        converted_time_bracket = time_bracket_to_convert.copy()
+        simple_event_and_absolute_time_pairs = []
+        self._collect_simple_events_and_absolute_times(
+            converted_time_bracket,
+            converted_time_bracket.minimal_start,
+            simple_event_and_absolute_time_pairs,
+        )
+        if not simple_event_and_absolute_time_pairs:
+            return converted_time_bracket
+
+        simple_events, absolute_times = zip(*simple_event_and_absolute_time_pairs)
+        absolute_times = np.array(absolute_times, dtype=float)
+        compiled_family = ot2_events.families.get_compiled_family(
+            self._batched_family_of_pitch_curves
+        )
+        # only curves which are active during the time bracket can have a
+        # positive weight
+        is_relevant_range = (compiled_family.range_starts <= absolute_times.max()) & (
+            compiled_family.range_ends >= absolute_times.min()
+        )
+        curve_indices = np.unique(
+            compiled_family.range_curve_indices[is_relevant_range]
+        )
+        weights_per_event = compiled_family.weights_at(absolute_times, curve_indices)
+        pitch_curves = compiled_family.pitch_curves
+        for simple_event, weights in zip(simple_events, weights_per_event):
+            simple_event.curve_and_weight_pairs = tuple(
+                (pitch_curves[curve_index], weight)
+                for curve_index, weight in zip(curve_indices.tolist(), weights.tolist())
+                if weight > 0
+            )
+        return converted_time_bracket
+
+
 class PickPitchesFromCurveAndWeightPairsConverter(
     converters.symmetrical.families.PickElementFromCurveAndWeightPairsConverter
 ):
@@ -82,6 +177,39 @@ class PickChordFromCurveAndWeightPairsConverter(
         n_pitches_to_pick_cycle = itertools.cycle(n_pitches_to_pick)
         self.n_pitches_to_pick_cycle = n_pitches_to_pick_cycle
 
+    @staticmethod
+    def _find_chord_indices(
+        cents: np.ndarray,
+        n_pitches_to_pick: int,
+        minimal_interval: float = 200,
+    ) -> typing.Iterator[typing.Tuple[int, ...]]:
+        # all pitch pairs which aren't seconds
+        is_valid_pitch_pair = (
+            np.abs(cents[:, np.newaxis] - cents[np.newaxis, :]) > minimal_interval
+        )
+
+        # yields the chords in the same order as 'itertools.combinations',
+        # but skips all combinations which contain an invalid pitch pair
+        def find_chord_indices(
+            chord_indices: typing.Tuple[int, ...], candidates: np.ndarray
+        ) -> typing.Iterator[typing.Tuple[int, ...]]:
+            n_missing_pitches = n_pitches_to_pick - len(chord_indices)
+            if n_missing_pitches == 0:
+                yield chord_indices
+            else:
+                for nth_candidate, candidate in enumerate(
+                    candidates[: len(candidates) - n_missing_pitches + 1]
+                ):
+                    remaining_candidates = candidates[nth_candidate + 1 :]
+                    yield from find_chord_indices(
+                        chord_indices + (int(candidate),),
+                        remaining_candidates[
+                            is_valid_pitch_pair[candidate, remaining_candidates]
+                        ],
+                    )
+
+        return find_chord_indices(tuple([]), np.arange(len(cents)))
+
     def _get_potential_chord_and_weight_pairs(
         self,
         potential_pitch_and_weight_pairs: typing.Tuple[
@@ -93,16 +221,21 @@ class PickChordFromCurveAndWeightPairsConverter(
     ]:
         potential_chord_and_weight_pairs = []
         n_pitches_to_pick = next(self.n_pitches_to_pick_cycle)
-        for combination in itertools.combinations(
-            potential_pitch_and_weight_pairs, n_pitches_to_pick
-        ):
-            chord, weights = zip(*combination)
-            resulting_intervals = tuple(
-                pitch0 - pitch1 for pitch0, pitch1 in itertools.combinations(chord, 2)
+        if potential_pitch_and_weight_pairs:
+            potential_pitches, weights = zip(*potential_pitch_and_weight_pairs)
+            cents = np.array(
+                [
+                    ot2_parameters.pitches.cents(pitch.exponents)
+                    for pitch in potential_pitches
+                ],
+                dtype=float,
             )
             # avoid seconds in chords
-            if all(abs(interval.cents) > 200 for interval in resulting_intervals):
-                weight = functools.reduce(operator.mul, weights)
+            for chord_indices in self._find_chord_indices(cents, n_pitches_to_pick):
+                chord = tuple(potential_pitches[index] for index in chord_indices)
+                weight = functools.reduce(
+                    operator.mul, (weights[index] for index in chord_indices)
+                )
                 potential_chord_and_weight_pairs.append((chord, weight))
         return tuple(potential_chord_and_weight_pairs)
 
@@ -152,7 +285,9 @@ class PickPitchLineFromCurveAndWeightPairsConverter(
         previous_pitch_cents: float,
         pitch: parameters.pitches.JustIntonationPitch,
     ) -> float:
-        distance = abs(previous_pitch_cents - pitch.cents)
+        distance = abs(
+            previous_pitch_cents - ot2_parameters.pitches.cents(pitch.exponents)
+        )
         min_distance = 50
         best_distance0 = 100
         best_distance1 = 230
@@ -191,7 +326,9 @@ class PickPitchLineFromCurveAndWeightPairsConverter(
         ) in potential_pitch_and_weight_pairs_per_event:
             if pitch_per_event:
                 previous_pitch = pitch_per_event[-1]
-                previous_pitch_cents = previous_pitch.cents
+                previous_pitch_cents = ot2_parameters.pitches.cents(
+                    previous_pitch.exponents
+                )
                 potential_pitch_and_weight_pairs = tuple(
                     (
                         pitch,
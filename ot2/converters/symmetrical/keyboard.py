@@ -924,9 +924,11 @@ class KeyboardTimeBracketToAdaptedKeyboardTimeBracketConverter(
 class KeyboardTimeBracketsToAdaptedKeyboardTimeBracketsConverter(
     converters.abc.Converter
 ):
-    def __init__(
-        self, json_settings_path: str = ot2_constants.paths.KEYBOARD_CUES_PATH
-    ):
+    def __init__(self, json_settings_path: typing.Optional[str] = None):
+        # the path of the cues depends on the time window
+        # (see 'ot2.constants.paths.set_time_window_build_path')
+        if json_settings_path is None:
+            json_settings_path = ot2_constants.paths.KEYBOARD_CUES_PATH
         self._keyboard_time_bracket_to_adapted_keyboard_time_bracket_converter = (
             KeyboardTimeBracketToAdaptedKeyboardTimeBracketConverter(json_settings_path)
         )
@@ -7,7 +7,6 @@ import typing
 
 import quicktions as fractions
 import numpy as np
-import ranges
 
 from formalgrammar.grammar import grammar
 
@@ -26,6 +25,20 @@ from ot2.converters.symmetrical import keyboard as keyboard_converter
 DEFAULT_MINIMAL_OVERLAPPING_PERCENTAGE = 0.75
 
 
+def _make_assign_curve_and_weight_pairs_on_events_converter(
+    family_of_pitch_curves: events.families.FamilyOfPitchCurves, **kwargs
+) -> converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter:
+    if ot2_constants.compute.BATCH_CURVE_AND_WEIGHT_ASSIGNMENT:
+        converter_class = (
+            ot2_converters.symmetrical.families.BatchedAssignCurveAndWeightPairsOnEventsConverter
+        )
+    else:
+        converter_class = (
+            converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter
+        )
+    return converter_class(family_of_pitch_curves, **kwargs)
+
+
 class StartTimeToTimeBracketsConverter(converters.abc.Converter):
     def __init__(
         self,
@@ -35,8 +48,10 @@ class StartTimeToTimeBracketsConverter(converters.abc.Converter):
         self._family_of_pitch_curves = family_of_pitch_curves
         self._minimal_overlapping_percentage = minimal_overlapping_percentage
         if family_of_pitch_curves:
-            self._assign_curve_and_weight_pairs_on_events = converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter(
-                self._family_of_pitch_curves
+            self._assign_curve_and_weight_pairs_on_events = (
+                _make_assign_curve_and_weight_pairs_on_events_converter(
+                    self._family_of_pitch_curves
+                )
             )
 
     @staticmethod
@@ -69,32 +84,14 @@ class StartTimeToTimeBracketsConverter(converters.abc.Converter):
     ) -> bool:
         if self._minimal_overlapping_percentage:
             as_time_bracket = events.time_brackets.TimeBracket([], *time_ranges)
-            as_range = ranges.Range(
+            active_ranges_index = ot2_events.families.get_active_ranges_index(
+                self._family_of_pitch_curves
+            )
+            return active_ranges_index.has_overlap(
                 as_time_bracket.minimal_start,
                 as_time_bracket.maximum_end,
-                include_start=True,
-                include_end=True,
+                self._minimal_overlapping_percentage,
             )
-            duration = as_range.length()
-            for pitch_curve in self._family_of_pitch_curves:
-                try:
-                    active_ranges = pitch_curve.calculated_active_ranges
-                except AttributeError:
-                    active_ranges = pitch_curve.active_ranges
-                    pitch_curve.calculated_active_ranges = active_ranges
-                for active_range in active_ranges:
-                    start_and_end_range = ranges.Range(
-                        *active_range, include_start=True, include_end=True
-                    )
-                    if not start_and_end_range.isdisjoint(as_range):
-                        intersection = start_and_end_range.intersection(as_range)
-                        if intersection:
-                            intersection_duration = intersection.length()
-                            percentage = intersection_duration / duration
-                            if percentage >= self._minimal_overlapping_percentage:
-                                return True
-
-            return False
         else:
             return True
 
@@ -751,7 +748,7 @@ class StartTimeToChordConverter(StartTimeToKeyboardTimeBracketsConverter):
         self._delay_cycle = itertools.cycle(delay_cycle)
         self._n_pitches_cycle = itertools.cycle(n_pitches_cycle)
         self._assign_curve_and_weight_pairs_on_events = (
-            converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter(
+            _make_assign_curve_and_weight_pairs_on_events_converter(
                 self._family_of_pitch_curves,
                 condition=lambda simple_event: hasattr(
                     simple_event, "pitch_or_pitches"
@@ -954,7 +951,7 @@ class StartTimeToTremoloConverter(StartTimeToKeyboardTimeBracketsConverter):
         self._duration_cycle = itertools.cycle((5, 10, 5, 10, 15))
         self._dynamic_cycle = itertools.cycle(("p", "pp", "ppp", "pp"))
         self._assign_curve_and_weight_pairs_on_events = (
-            converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter(
+            _make_assign_curve_and_weight_pairs_on_events_converter(
                 self._family_of_pitch_curves,
                 condition=lambda simple_event: hasattr(
                     simple_event, "pitch_or_pitches"
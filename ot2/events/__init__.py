@@ -1,6 +1,7 @@
 from . import noises_constants
 
 from . import basic
+from . import families
 from . import music
 from . import noises
 from . import time_brackets
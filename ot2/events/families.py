@@ -0,0 +1,445 @@
+"""Fast lookup structures for :class:`mutwo.events.families.FamilyOfPitchCurves`"""
+
+import bisect
+import typing
+
+import numpy as np
+
+from mutwo import events
+
+
+def get_active_ranges(
+    pitch_curve: events.families.PitchCurve,
+) -> typing.Tuple[typing.Tuple[float, float], ...]:
+    # calculating the active ranges is expensive, therefore they get saved
+    # on the pitch curve
+    try:
+        active_ranges = pitch_curve.calculated_active_ranges
+    except AttributeError:
+        active_ranges = pitch_curve.active_ranges
+        pitch_curve.calculated_active_ranges = active_ranges
+    return active_ranges
+
+
+class ActiveRangesIndex(object):
+    """Answer how much the active ranges of a family overlap with a window.
+
+    The active ranges of all curves are sorted by their start. Ranges which
+    start before the window are checked via the running maximum of their
+    ends, ranges which start inside the window via a sparse table which
+    returns the longest range within a slice of the sorted ranges. Both
+    lookups need logarithmic time.
+    """
+
+    def __init__(
+        self,
+        active_ranges: typing.Iterable[typing.Tuple[float, float]],
+    ):
+        active_ranges = np.array(tuple(active_ranges), dtype=float).reshape(-1, 2)
+        sorted_indices = np.argsort(active_ranges[:, 0], kind="stable")
+        self._starts = active_ranges[sorted_indices, 0]
+        self._ends = active_ranges[sorted_indices, 1]
+        self._start_list = self._starts.tolist()
+        if len(self._ends):
+            self._maxima_end_until_index = np.maximum.accumulate(self._ends)
+        else:
+            self._maxima_end_until_index = self._ends
+        self._lengths = self._ends - self._starts
+        self._longest_range_index_table = self._make_longest_range_index_table(
+            self._lengths
+        )
+
+    @classmethod
+    def from_family_of_pitch_curves(
+        cls, family_of_pitch_curves: events.families.FamilyOfPitchCurves
+    ) -> "ActiveRangesIndex":
+        return cls(
+            active_range
+            for pitch_curve in family_of_pitch_curves
+            for active_range in get_active_ranges(pitch_curve)
+        )
+
+    @staticmethod
+    def _make_longest_range_index_table(
+        lengths: np.ndarray,
+    ) -> typing.Tuple[np.ndarray, ...]:
+        # sparse table: the n-th row contains for each index the index of the
+        # longest range within the next 2 ** n ranges
+        longest_range_index_table = [np.arange(len(lengths))]
+        window_size = 1
+        while window_size * 2 <= len(lengths):
+            previous_row = longest_range_index_table[-1]
+            left = previous_row[:-window_size]
+            right = previous_row[window_size:]
+            longest_range_index_table.append(
+                np.where(lengths[right] > lengths[left], right, left)
+            )
+            window_size *= 2
+        return tuple(longest_range_index_table)
+
+    def _find_longest_range_index(self, start_index: int, end_index: int) -> int:
+        row_index = (end_index - start_index).bit_length() - 1
+        row = self._longest_range_index_table[row_index]
+        left = row[start_index]
+        right = row[end_index - (1 << row_index)]
+        if self._lengths[right] > self._lengths[left]:
+            return int(right)
+        return int(left)
+
+    def _get_overlapping_percentage(
+        self, index: int, start: float, end: float, duration: float
+    ) -> float:
+        intersection_duration = min(self._ends[index], end) - max(
+            self._starts[index], start
+        )
+        return intersection_duration / duration
+
+    def has_overlap(
+        self, start: float, end: float, minimal_overlapping_percentage: float
+    ) -> bool:
+        """Check if any active range overlaps with the window at least by X%.
+
+        :param start: Start of the window.
+        :param end: End of the window.
+        :param minimal_overlapping_percentage: The minimal percentage (0 - 1)
+            of the windows duration which one active range has to cover.
+        """
+
+        duration = end - start
+        n_ranges_starting_before_window = bisect.bisect_right(self._start_list, start)
+        # (1) ranges which start before (or with) the window
+        if n_ranges_starting_before_window:
+            maxima_end = self._maxima_end_until_index[
+                n_ranges_starting_before_window - 1
+            ]
+            intersection_duration = min(maxima_end, end) - start
+            if intersection_duration / duration >= minimal_overlapping_percentage:
+                return True
+
+        # (2) ranges which start inside the window: only ranges which start
+        # early enough can reach the minimal overlapping duration and from
+        # those ranges the longest range has the biggest overlap
+        latest_start = end - (duration * minimal_overlapping_percentage)
+        n_ranges_starting_early_enough = bisect.bisect_right(
+            self._start_list, latest_start
+        )
+        if n_ranges_starting_early_enough > n_ranges_starting_before_window:
+            longest_range_index = self._find_longest_range_index(
+                n_ranges_starting_before_window, n_ranges_starting_early_enough
+            )
+            if (
+                self._get_overlapping_percentage(
+                    longest_range_index, start, end, duration
+                )
+                >= minimal_overlapping_percentage
+            ):
+                return True
+
+        return False
+
+
+class CompiledFamilyOfPitchCurves(object):
+    """Frozen array based view of a family for query heavy consumers.
+
+    Most consumers of a family only need the pitch exponents, the tag, the
+    active ranges and the weight curve of each pitch curve at many points
+    in time. The compiled family saves those attributes in read only arrays,
+    so that they can be queried for all curves at once:
+
+        - ``exponents``: matrix with one row per curve (padded with zeros)
+        - ``tag_codes``: index of the tag of each curve in ``tags``
+        - ``range_starts``, ``range_ends``, ``range_curve_indices``: all
+          active ranges, sorted by their start
+        - weight tables: the breakpoints and the curve shapes of all weight
+          curves, one block per curve. The weight between two breakpoints
+          is interpolated with the same formula as in expenvelope.
+
+    The n-th row of each array belongs to the n-th curve of
+    ``pitch_curves``, so that results can be mapped back to the original
+    (not copied) pitch curves.
+    """
+
+    # curve shapes which are closer to zero are linear (as in expenvelope)
+    linear_curve_shape_tolerance = 0.000001
+
+    def __init__(self, family_of_pitch_curves: events.families.FamilyOfPitchCurves):
+        self._pitch_curves = tuple(family_of_pitch_curves)
+        self._duration = float(family_of_pitch_curves.duration)
+        self._initialise_pitch_arrays()
+        self._initialise_tag_arrays()
+        self._initialise_range_arrays()
+        self._initialise_weight_tables()
+        self._active_ranges_index = None
+
+    @staticmethod
+    def _freeze(array: np.ndarray) -> np.ndarray:
+        array.setflags(write=False)
+        return array
+
+    def _initialise_pitch_arrays(self):
+        exponents_per_curve = tuple(
+            tuple(pitch_curve.pitch.exponents) for pitch_curve in self._pitch_curves
+        )
+        n_exponents = np.array(tuple(map(len, exponents_per_curve)), dtype=int)
+        exponents = np.zeros(
+            (len(exponents_per_curve), max(n_exponents, default=0)), dtype=int
+        )
+        primes = ()
+        for nth_curve, curve_exponents in enumerate(exponents_per_curve):
+            exponents[nth_curve, : len(curve_exponents)] = curve_exponents
+            if len(curve_exponents) > len(primes):
+                primes = tuple(self._pitch_curves[nth_curve].pitch.primes)
+        self._exponents = self._freeze(exponents)
+        self._n_exponents = self._freeze(n_exponents)
+        self._primes = primes
+
+    def _initialise_tag_arrays(self):
+        tags, tag_codes = [], []
+        for pitch_curve in self._pitch_curves:
+            if pitch_curve.tag not in tags:
+                tags.append(pitch_curve.tag)
+            tag_codes.append(tags.index(pitch_curve.tag))
+        self._tags = tuple(tags)
+        self._tag_codes = self._freeze(np.array(tag_codes, dtype=int))
+
+    def _initialise_range_arrays(self):
+        starts, ends, curve_indices = [], [], []
+        for nth_curve, pitch_curve in enumerate(self._pitch_curves):
+            for start, end in get_active_ranges(pitch_curve):
+                starts.append(start)
+                ends.append(end)
+                curve_indices.append(nth_curve)
+        starts = np.array(starts, dtype=float)
+        sorted_indices = np.argsort(starts, kind="stable")
+        self._range_starts = self._freeze(starts[sorted_indices])
+        self._range_ends = self._freeze(np.array(ends, dtype=float)[sorted_indices])
+        self._range_curve_indices = self._freeze(
+            np.array(curve_indices, dtype=int)[sorted_indices]
+        )
+
+    @staticmethod
+    def _get_weight_curve_breakpoints(
+        weight_curve,
+    ) -> typing.Tuple[typing.List[float], typing.List[float], typing.List[float]]:
+        times = list(map(float, weight_curve.times))
+        levels = list(map(float, weight_curve.levels))
+        # the curve shape of each breakpoint belongs to the segment which
+        # starts at the breakpoint (the last breakpoint doesn't start a segment)
+        curve_shapes = [
+            float(curve_shape)
+            for curve_shape in tuple(weight_curve.curve_shapes)[: len(times) - 1]
+        ]
+        curve_shapes.append(0)
+        # each curve needs at least one segment for the interpolation
+        if len(times) == 1:
+            times.append(times[0] + 1)
+            levels.append(levels[0])
+            curve_shapes.append(0)
+        return times, levels, curve_shapes
+
+    def _initialise_weight_tables(self):
+        times, levels, curve_shapes, offsets = [], [], [], [0]
+        for pitch_curve in self._pitch_curves:
+            (
+                curve_times,
+                curve_levels,
+                curve_curve_shapes,
+            ) = self._get_weight_curve_breakpoints(pitch_curve.weight_curve)
+            times.extend(curve_times)
+            levels.extend(curve_levels)
+            curve_shapes.extend(curve_curve_shapes)
+            offsets.append(len(times))
+        times = np.array(times, dtype=float)
+        # the breakpoints of all curves are saved in one sorted array of keys
+        # (curve index * stride + time), so that the breakpoints of all curves
+        # can be found with one 'np.searchsorted' call
+        if len(times):
+            self._minimal_weight_time = float(times.min())
+            self._weight_key_stride = float(times.max()) - self._minimal_weight_time + 1
+        else:
+            self._minimal_weight_time, self._weight_key_stride = 0.0, 1.0
+        curve_indices = np.repeat(
+            np.arange(len(self._pitch_curves)), np.diff(np.array(offsets))
+        )
+        self._weight_times = self._freeze(times)
+        self._weight_levels = self._freeze(np.array(levels, dtype=float))
+        self._weight_curve_shapes = self._freeze(np.array(curve_shapes, dtype=float))
+        self._weight_offsets = self._freeze(np.array(offsets, dtype=int))
+        self._weight_keys = self._freeze(
+            (curve_indices * self._weight_key_stride)
+            + (times - self._minimal_weight_time)
+        )
+
+    # ###################################################################### #
+    #                           public properties                            #
+    # ###################################################################### #
+
+    def __len__(self) -> int:
+        return len(self._pitch_curves)
+
+    @property
+    def pitch_curves(self) -> typing.Tuple[events.families.PitchCurve, ...]:
+        return self._pitch_curves
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+    @property
+    def exponents(self) -> np.ndarray:
+        return self._exponents
+
+    @property
+    def n_exponents(self) -> np.ndarray:
+        """Length of the (unpadded) exponents of each curve."""
+        return self._n_exponents
+
+    @property
+    def primes(self) -> typing.Tuple[int, ...]:
+        """The prime of each column of :attr:`exponents`."""
+        return self._primes
+
+    @property
+    def tags(self) -> tuple:
+        return self._tags
+
+    @property
+    def tag_codes(self) -> np.ndarray:
+        return self._tag_codes
+
+    @property
+    def range_starts(self) -> np.ndarray:
+        return self._range_starts
+
+    @property
+    def range_ends(self) -> np.ndarray:
+        return self._range_ends
+
+    @property
+    def range_curve_indices(self) -> np.ndarray:
+        return self._range_curve_indices
+
+    @property
+    def active_ranges_index(self) -> ActiveRangesIndex:
+        if self._active_ranges_index is None:
+            self._active_ranges_index = ActiveRangesIndex(
+                zip(self._range_starts, self._range_ends)
+            )
+        return self._active_ranges_index
+
+    # ###################################################################### #
+    #                            public methods                              #
+    # ###################################################################### #
+
+    def get_curve_indices_with_tag(self, tag: typing.Any) -> np.ndarray:
+        try:
+            tag_code = self._tags.index(tag)
+        except ValueError:
+            return np.array([], dtype=int)
+        return np.flatnonzero(self._tag_codes == tag_code)
+
+    def get_active_ranges(
+        self, curve_index: int
+    ) -> typing.Tuple[typing.Tuple[float, float], ...]:
+        mask = self._range_curve_indices == curve_index
+        return tuple(
+            zip(self._range_starts[mask].tolist(), self._range_ends[mask].tolist())
+        )
+
+    def curves_active_at(self, time: float) -> np.ndarray:
+        """Return the (sorted) indices of all curves which are active at 'time'."""
+
+        mask = (self._range_starts <= time) & (time < self._range_ends)
+        return np.unique(self._range_curve_indices[mask])
+
+    def weights_at(
+        self,
+        time: typing.Union[float, typing.Sequence[float], np.ndarray],
+        curve_indices: typing.Optional[typing.Sequence[int]] = None,
+    ) -> np.ndarray:
+        """Evaluate the weight curves at one or many points in time.
+
+        :param time: One point in time or an array of points in time.
+        :param curve_indices: The curves which shall be evaluated. Defaults to
+            all curves.
+        :return: Array with the shape ``np.shape(time) + (n_curves,)``.
+        """
+
+        if curve_indices is None:
+            curve_indices = np.arange(len(self._pitch_curves))
+        else:
+            curve_indices = np.asarray(curve_indices, dtype=int)
+        time = np.asarray(time, dtype=float)[..., np.newaxis]
+
+        first_indices = self._weight_offsets[curve_indices]
+        last_indices = self._weight_offsets[curve_indices + 1] - 1
+        right_indices = np.searchsorted(
+            self._weight_keys,
+            (curve_indices * self._weight_key_stride)
+            + (time - self._minimal_weight_time),
+            side="right",
+        )
+        # times before the first or after the last breakpoint get the level
+        # of the first or the last breakpoint (as in expenvelope)
+        right_indices = np.clip(right_indices, first_indices + 1, last_indices)
+        left_indices = right_indices - 1
+
+        left_times = self._weight_times[left_indices]
+        segment_durations = self._weight_times[right_indices] - left_times
+        factors = np.divide(
+            time - left_times,
+            segment_durations,
+            out=np.ones(segment_durations.shape),
+            where=segment_durations > 0,
+        )
+        factors = np.clip(factors, 0, 1)
+        # y = y1 + (y2 - y1) * (e^(S * t) - 1) / (e^S - 1) for curved segments
+        # (see 'expenvelope.EnvelopeSegment.value_at')
+        curve_shapes = self._weight_curve_shapes[left_indices]
+        is_curved = np.abs(curve_shapes) >= self.linear_curve_shape_tolerance
+        if np.any(is_curved):
+            curved_shapes = curve_shapes[is_curved]
+            factors[is_curved] = np.expm1(
+                curved_shapes * factors[is_curved]
+            ) / np.expm1(curved_shapes)
+        left_levels = self._weight_levels[left_indices]
+        return left_levels + (
+            factors * (self._weight_levels[right_indices] - left_levels)
+        )
+
+    def curve_and_weight_pairs_at(
+        self, time: float
+    ) -> typing.Tuple[typing.Tuple[events.families.PitchCurve, float], ...]:
+        """Return all active curves at 'time' together with their weight."""
+
+        curve_indices = self.curves_active_at(time)
+        weights = self.weights_at(time, curve_indices)
+        return tuple(
+            (self._pitch_curves[curve_index], weight)
+            for curve_index, weight in zip(curve_indices.tolist(), weights.tolist())
+        )
+
+
+def get_compiled_family(
+    family_of_pitch_curves: events.families.FamilyOfPitchCurves,
+) -> CompiledFamilyOfPitchCurves:
+    # the compiled family is built only once per family and then saved on
+    # the family (it has to be built again if curves have been added to or
+    # removed from the family or if the family has been cut)
+    try:
+        compiled_family = family_of_pitch_curves.calculated_compiled_family
+        is_outdated = len(compiled_family) != len(family_of_pitch_curves) or (
+            compiled_family.duration != float(family_of_pitch_curves.duration)
+        )
+    except AttributeError:
+        is_outdated = True
+    if is_outdated:
+        compiled_family = CompiledFamilyOfPitchCurves(family_of_pitch_curves)
+        family_of_pitch_curves.calculated_compiled_family = compiled_family
+    return compiled_family
+
+
+def get_active_ranges_index(
+    family_of_pitch_curves: events.families.FamilyOfPitchCurves,
+) -> ActiveRangesIndex:
+    return get_compiled_family(family_of_pitch_curves).active_ranges_index
@@ -1,7 +1,10 @@
+import bisect
 import typing
 
 from mutwo import events
 
+from ot2 import utilities as ot2_utilities
+
 
 class KeyboardTimeBracket(events.time_brackets.TimeBracket):
     _class_specific_side_attributes = (
@@ -19,3 +22,280 @@ class KeyboardTimeBracket(events.time_brackets.TimeBracket):
         self.distribution_strategy = distribution_strategy
         self.engine_distribution_strategy = engine_distribution_strategy
         super().__init__(*args, **kwargs)
+
+
+class IndexedTimeBracketContainer(events.time_brackets.TimeBracketContainer):
+    """TimeBracketContainer with an index for tags and start times.
+
+    The index gets built lazily and is invalidated by each method of the
+    container which changes its content. Code which changes the registered
+    time brackets directly (for instance by changing the start time of a
+    bracket or by altering the private '_brackets' list) has to call
+    :meth:`invalidate_index` afterwards.
+
+    A container can be saved with :meth:`save` and loaded with
+    :meth:`load`. The file contains one record per time bracket and an
+    index with the tags and the time range of each time bracket. A loaded
+    container only holds lightweight handles to its time brackets: the
+    events of a time bracket are only loaded when the time bracket is
+    returned by :meth:`filter` or :meth:`find`. All other methods (e.g.
+    iterating over the container or registering new time brackets) load
+    all time brackets.
+    """
+
+    # saved time brackets which haven't been loaded yet
+    # (see :mod:`ot2.utilities.serialization`)
+    _lazy_time_brackets = None
+
+    # tags of the time brackets which have been removed because they start
+    # after the end of the time window (see
+    # :meth:`remove_time_brackets_outside_of_time_window`)
+    tags_after_time_window = frozenset([])
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.invalidate_index()
+
+    def __getstate__(self) -> dict:
+        # the index can always be rebuilt, there is no need to pickle it
+        state = dict(self.__dict__)
+        state.update(
+            {
+                "_loaded_brackets": self._brackets,
+                "_lazy_time_brackets": None,
+                "_tag_to_positions": None,
+                "_sorted_minimal_starts": None,
+                "_positions_sorted_by_minimal_start": None,
+            }
+        )
+        return state
+
+    def __setstate__(self, state: dict):
+        # containers which have been pickled before the time brackets
+        # could be loaded lazily
+        if "_brackets" in state:
+            state["_loaded_brackets"] = state.pop("_brackets")
+        self.__dict__.update(state)
+        self.invalidate_index()
+
+    @property
+    def _brackets(self) -> typing.List[events.time_brackets.TimeBracket]:
+        if self._lazy_time_brackets is not None:
+            self._loaded_brackets = list(self._lazy_time_brackets)
+            self._lazy_time_brackets = None
+        return self._loaded_brackets
+
+    @_brackets.setter
+    def _brackets(self, time_brackets: typing.List[events.time_brackets.TimeBracket]):
+        self._loaded_brackets = time_brackets
+        self._lazy_time_brackets = None
+
+    @staticmethod
+    def _get_index_entry(
+        time_bracket: events.time_brackets.TimeBracket,
+    ) -> typing.Tuple[typing.Tuple[str, ...], float, float]:
+        return (
+            tuple(dict.fromkeys(tagged_event.tag for tagged_event in time_bracket)),
+            time_bracket.minimal_start,
+            time_bracket.maximum_end,
+        )
+
+    def _get_index_entries(
+        self,
+    ) -> typing.Tuple[typing.Tuple[typing.Tuple[str, ...], float, float], ...]:
+        if self._lazy_time_brackets is not None:
+            return tuple(
+                self._lazy_time_brackets.get_metadata(position)
+                for position in range(len(self._lazy_time_brackets))
+            )
+        return tuple(map(self._get_index_entry, self._brackets))
+
+    def _get_time_bracket(self, position: int) -> events.time_brackets.TimeBracket:
+        if self._lazy_time_brackets is not None:
+            return self._lazy_time_brackets[position]
+        return self._brackets[position]
+
+    def _build_tag_index(self):
+        tag_to_positions = {}
+        for position, (tags, _, _) in enumerate(self._get_index_entries()):
+            for tag in tags:
+                tag_to_positions.setdefault(tag, []).append(position)
+
+        self._tag_to_positions = {
+            tag: tuple(positions) for tag, positions in tag_to_positions.items()
+        }
+
+    def _build_start_time_index(self):
+        minimal_starts = tuple(
+            minimal_start for _, minimal_start, _ in self._get_index_entries()
+        )
+        self._positions_sorted_by_minimal_start = tuple(
+            sorted(
+                range(len(minimal_starts)), key=lambda position: minimal_starts[position]
+            )
+        )
+        self._sorted_minimal_starts = tuple(
+            minimal_starts[position]
+            for position in self._positions_sorted_by_minimal_start
+        )
+
+    def invalidate_index(self):
+        self._tag_to_positions = None
+        self._sorted_minimal_starts = None
+        self._positions_sorted_by_minimal_start = None
+
+    @property
+    def tag_to_positions(self) -> typing.Dict[str, typing.Tuple[int, ...]]:
+        if self._tag_to_positions is None:
+            self._build_tag_index()
+        return self._tag_to_positions
+
+    @property
+    def tag_to_time_brackets(
+        self,
+    ) -> typing.Dict[str, typing.Tuple[events.time_brackets.TimeBracket, ...]]:
+        return {tag: self.filter(tag) for tag in self.tag_to_positions}
+
+    @property
+    def is_loaded(self) -> bool:
+        """False if some time brackets of a saved container haven't been loaded."""
+
+        return self._lazy_time_brackets is None or (
+            self._lazy_time_brackets.n_loaded_items == len(self._lazy_time_brackets)
+        )
+
+    def save(self, path: str, compression_level: typing.Optional[int] = None):
+        """Save time brackets, so that they can be loaded lazily.
+
+        :param path: Where to save the container.
+        :param compression_level: See :func:`ot2.utilities.serialization.dump`.
+        """
+
+        state = self.__getstate__()
+        del state["_loaded_brackets"]
+        with open(path, "wb") as f:
+            ot2_utilities.serialization.dump(
+                list(self._brackets),
+                f,
+                compression_level=compression_level,
+                get_metadata=self._get_index_entry,
+                metadata=state,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "IndexedTimeBracketContainer":
+        """Load container which has been saved with :meth:`save`.
+
+        The events of the time brackets are only loaded when they are
+        needed.
+        """
+
+        with open(path, "rb") as f:
+            lazy_time_brackets = ot2_utilities.serialization.load(f)
+        container = cls.__new__(cls)
+        container.__setstate__(
+            dict(lazy_time_brackets.metadata, _loaded_brackets=None)
+        )
+        container._lazy_time_brackets = lazy_time_brackets
+        return container
+
+    def get_digests(
+        self, tag: typing.Optional[str] = None
+    ) -> typing.Tuple[str, ...]:
+        """Hashes of the content of the (filtered) time brackets.
+
+        :param tag: If set, only the hashes of the time brackets which are
+            returned by :meth:`filter` are returned.
+
+        The hashes of a loaded container are read from the saved file
+        (without loading the time brackets) and equal the hashes of the
+        container before it has been saved.
+        """
+
+        if tag is None:
+            positions = range(len(self._get_index_entries()))
+        else:
+            positions = self.tag_to_positions.get(tag, tuple([]))
+        if self._lazy_time_brackets is not None:
+            return tuple(map(self._lazy_time_brackets.get_digest, positions))
+        return tuple(
+            ot2_utilities.serialization.get_digest(self._brackets[position])
+            for position in positions
+        )
+
+    def register(self, *args, **kwargs):
+        try:
+            return super().register(*args, **kwargs)
+        finally:
+            self.invalidate_index()
+
+    def delay(self, *args, **kwargs):
+        try:
+            return super().delay(*args, **kwargs)
+        finally:
+            self.invalidate_index()
+
+    def remove_time_brackets_outside_of_time_window(self, start: float, end: float):
+        """Only keep time brackets which overlap with the time window.
+
+        :param start: Start of the time window in seconds.
+        :param end: End of the time window in seconds.
+
+        A time bracket overlaps with the window if its maximum end is after
+        the start and its minimal start is before the end of the window.
+        The time brackets keep their absolute positions. The tags of the
+        time brackets which start after the time window are added to
+        :attr:`tags_after_time_window`.
+        """
+
+        self.tags_after_time_window = self.tags_after_time_window.union(
+            *(
+                self._get_index_entry(time_bracket)[0]
+                for time_bracket in self._brackets
+                if time_bracket.minimal_start >= end
+            )
+        )
+        self._brackets[:] = [
+            time_bracket
+            for time_bracket in self._brackets
+            if time_bracket.maximum_end > start and time_bracket.minimal_start < end
+        ]
+        self.invalidate_index()
+
+    def filter(self, tag: str) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
+        return tuple(
+            map(self._get_time_bracket, self.tag_to_positions.get(tag, tuple([])))
+        )
+
+    def find(
+        self,
+        start: float,
+        end: float,
+        tag: typing.Optional[str] = None,
+    ) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
+        """Find all time brackets with a minimal start within start and end.
+
+        :param start: The earliest minimal start (included).
+        :param end: The latest minimal start (included).
+        :param tag: If set, only time brackets which contain an event with
+            the given tag are returned.
+
+        The time brackets are returned in the same order as they appear in
+        the container (equal to the order of the :meth:`filter` method).
+        """
+
+        if self._sorted_minimal_starts is None:
+            self._build_start_time_index()
+        start_index = bisect.bisect_left(self._sorted_minimal_starts, start)
+        end_index = bisect.bisect_right(self._sorted_minimal_starts, end)
+        found_positions = sorted(
+            self._positions_sorted_by_minimal_start[start_index:end_index]
+        )
+        if tag is not None:
+            positions_with_tag = set(self.tag_to_positions.get(tag, tuple([])))
+            found_positions = (
+                position
+                for position in found_positions
+                if position in positions_with_tag
+            )
+        return tuple(map(self._get_time_bracket, found_positions))
@@ -4,8 +4,10 @@ from mutwo import converters
 from mutwo import events
 from mutwo import parameters
 
+from ot2 import analysis
 from ot2 import constants as ot2_constants
 from ot2 import events as ot2_events
+from ot2 import utilities as ot2_utilities
 
 
 class AddCadenza(
@@ -102,9 +104,10 @@ def illustrate(
         header_block.tagline = '""'
         lilypond_file.items.append(header_block)
 
-    abjad.persist.as_pdf(
-        lilypond_file, f"{ot2_constants.paths.ILLUSTRATIONS_PATH}/{name}.pdf"
-    )
+    with ot2_utilities.profiling.span(f"lilypond {name}", "lilypond"):
+        abjad.persist.as_pdf(
+            lilypond_file, f"{ot2_constants.paths.ILLUSTRATIONS_PATH}/{name}.pdf"
+        )
 
 
 def illustrate_microtonal_pitches_for_sustaining_instrument(
@@ -296,3 +299,6 @@ def main(make_clarinet_version: bool = True):
         make_clarinet_version
     )
     illustrate_noises()
+    # the phrases always belong to the complete piece
+    if ot2_constants.compute.TIME_WINDOW is None:
+        analysis.phrases.synthesize_splitted_parts(analysis.phrases.SPLITTED_PARTS)
@@ -1,3 +1,4 @@
 from . import ambitus
 from . import notation_indicators
+from . import pitches
 from . import playing_indicators
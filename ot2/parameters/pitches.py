@@ -0,0 +1,104 @@
+"""Cached arithmetic for the exponents of just intonation pitches.
+
+Properties like the cents or the harmonicity of a
+:class:`mutwo.parameters.pitches.JustIntonationPitch` only depend on its
+exponents. ot2 asks for the same properties of the same pitches millions of
+times, therefore the functions of this module work directly with exponent
+tuples and cache their results per exponent tuple.
+
+Set :const:`USE_CACHE` to ``False`` to calculate every value again with a
+new :class:`~mutwo.parameters.pitches.JustIntonationPitch` object (for
+instance to compare the results or the speed with the uncached path).
+"""
+
+import functools
+import itertools
+import typing
+
+from mutwo import parameters
+
+Exponents = typing.Tuple[int, ...]
+
+USE_CACHE = True
+CACHE_SIZE = 2 ** 16
+
+
+def _discard_trailing_zeros(exponents: typing.Sequence[int]) -> Exponents:
+    exponents = list(exponents)
+    while exponents and exponents[-1] == 0:
+        exponents.pop()
+    return tuple(exponents)
+
+
+def _calculate_cents(exponents: Exponents) -> float:
+    return parameters.pitches.JustIntonationPitch(exponents).cents
+
+
+def _calculate_normalized_exponents(exponents: Exponents) -> Exponents:
+    return (
+        parameters.pitches.JustIntonationPitch(exponents)
+        .normalize(mutate=False)
+        .exponents
+    )
+
+
+def _calculate_harmonicity_simplified_barlow(exponents: Exponents) -> float:
+    return parameters.pitches.JustIntonationPitch(
+        exponents
+    ).harmonicity_simplified_barlow
+
+
+_cached_cents = functools.lru_cache(maxsize=CACHE_SIZE)(_calculate_cents)
+_cached_normalized_exponents = functools.lru_cache(maxsize=CACHE_SIZE)(
+    _calculate_normalized_exponents
+)
+_cached_harmonicity_simplified_barlow = functools.lru_cache(maxsize=CACHE_SIZE)(
+    _calculate_harmonicity_simplified_barlow
+)
+
+
+def cents(exponents: Exponents) -> float:
+    """Equal to 'JustIntonationPitch(exponents).cents'."""
+
+    if USE_CACHE:
+        return _cached_cents(exponents)
+    return _calculate_cents(exponents)
+
+
+def normalize(exponents: Exponents) -> Exponents:
+    """Equal to 'JustIntonationPitch(exponents).normalize(mutate=False).exponents'."""
+
+    if USE_CACHE:
+        return _cached_normalized_exponents(exponents)
+    return _calculate_normalized_exponents(exponents)
+
+
+def harmonicity_simplified_barlow(exponents: Exponents) -> float:
+    """Equal to 'JustIntonationPitch(exponents).harmonicity_simplified_barlow'."""
+
+    if USE_CACHE:
+        return _cached_harmonicity_simplified_barlow(exponents)
+    return _calculate_harmonicity_simplified_barlow(exponents)
+
+
+def interval(exponents0: Exponents, exponents1: Exponents) -> Exponents:
+    """Exponents of the interval 'pitch0 - pitch1' (without creating pitches)."""
+
+    return _discard_trailing_zeros(
+        exponent0 - exponent1
+        for exponent0, exponent1 in itertools.zip_longest(
+            exponents0, exponents1, fillvalue=0
+        )
+    )
+
+
+def cache_info() -> typing.Dict[str, typing.Any]:
+    """Return hits and misses for each cache (useful for profiling)."""
+
+    return {
+        "cents": _cached_cents.cache_info(),
+        "normalize": _cached_normalized_exponents.cache_info(),
+        "harmonicity_simplified_barlow": (
+            _cached_harmonicity_simplified_barlow.cache_info()
+        ),
+    }
@@ -1,9 +1,34 @@
 from mutwo import events
 
 from ot2 import constants as ot2_constants
+from ot2 import events as ot2_events
 from ot2 import tweaks as tw
 
 
+def _find_time_brackets_by_rounded_minimal_start(
+    time_brackets_container: ot2_events.time_brackets.IndexedTimeBracketContainer,
+    minimal_start: int,
+) -> tuple[events.time_brackets.TimeBracket, ...]:
+    return tuple(
+        filter(
+            lambda time_bracket: round(time_bracket.minimal_start) == minimal_start,
+            time_brackets_container.find(minimal_start - 0.5, minimal_start + 0.5),
+        )
+    )
+
+
+def _find_time_brackets_by_start_range(
+    time_brackets_container: ot2_events.time_brackets.IndexedTimeBracketContainer,
+    start_range: tuple[float, float],
+) -> tuple[events.time_brackets.TimeBracket, ...]:
+    return tuple(
+        filter(
+            lambda time_bracket: time_bracket.start_or_start_range == start_range,
+            time_brackets_container.find(*start_range),
+        )
+    )
+
+
 def _add_delays_to_time_brackets_container(
     time_brackets_container: events.time_brackets.TimeBracketContainer,
 ):
@@ -51,17 +76,11 @@ def _add_delays_to_time_brackets_container_2(
 def _concatenate_ending_brackets(
     time_brackets_container: events.time_brackets.TimeBracketContainer,
 ):
-    tbs0 = tuple(
-        filter(
-            lambda time_bracket: round(time_bracket.minimal_start) == ((35 * 60) + 57),
-            time_brackets_container,
-        )
+    tbs0 = _find_time_brackets_by_rounded_minimal_start(
+        time_brackets_container, (35 * 60) + 57
     )
-    tbs1 = tuple(
-        filter(
-            lambda time_bracket: round(time_bracket.minimal_start) == ((38 * 60) + 43),
-            time_brackets_container,
-        )
+    tbs1 = _find_time_brackets_by_rounded_minimal_start(
+        time_brackets_container, (38 * 60) + 43
     )
 
     for tb0, tb1 in zip(tbs0, tbs1):
@@ -79,32 +98,26 @@ def _concatenate_ending_brackets(
         time_brackets_container._brackets[
             time_brackets_container._brackets.index(tb0)
         ] = tb0
+    time_brackets_container.invalidate_index()
     return time_brackets_container
 
 
 def _postprocess_keyboard_brackets(
     time_brackets_container: events.time_brackets.TimeBracketContainer,
 ):
-    lonely_chord = tuple(
-        filter(
-            lambda time_bracket: time_bracket.start_or_start_range
-            == ((11 * 60) + 50, (11 * 60) + 55),
-            time_brackets_container,
-        )
+    lonely_chord = _find_time_brackets_by_start_range(
+        time_brackets_container, ((11 * 60) + 50, (11 * 60) + 55)
     )[0]
     tw.eat(lonely_chord[0][1], 0, 2)
     lonely_chord.end_or_end_range = tuple(
         map(lambda time: time - 10, lonely_chord.end_or_end_range)
     )
 
-    too_early_cord = tuple(
-        filter(
-            lambda time_bracket: time_bracket.start_or_start_range
-            == ((2 * 60) + 15, (2 * 60) + 25),
-            time_brackets_container,
-        )
+    too_early_cord = _find_time_brackets_by_start_range(
+        time_brackets_container, ((2 * 60) + 15, (2 * 60) + 25)
     )[0]
     too_early_cord.start_or_start_range = ((2 * 60) + 25, (2 * 60) + 30)
+    time_brackets_container.invalidate_index()
     return time_brackets_container
 
 
@@ -3,6 +3,8 @@
 Public interaction via "main" method.
 """
 
+import pathlib
+
 import progressbar
 
 from mutwo import parameters
@@ -10,11 +12,13 @@ from mutwo import utilities
 
 from ot2 import constants
 from ot2 import converters
+from ot2 import events as ot2_events
 from ot2 import noise_constants
 from ot2 import manual
 from ot2 import stochastic
 from ot2 import postprocess
 from ot2 import third_way
+from ot2 import utilities as ot2_utilities
 
 
 def _sort_cengkok_time_bracket(cengkok_time_bracket_to_sort):
@@ -40,9 +44,18 @@ def _sort_cengkok_time_bracket(cengkok_time_bracket_to_sort):
     return sorted_cengkok_time_bracket
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.cengkokBrackets{constants.instruments.ID_KEYBOARD}.pickle",
+    dependencies=lambda: (
+        _sort_cengkok_time_bracket,
+        constants.structure,
+        constants.phrase_parts,
+        constants.instruments,
+        converters.symmetrical.cengkoks,
+        converters.symmetrical.keyboard,
+    ),
     force_to_compute=constants.compute.COMPUTE_CENGKOK,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_cengkok_brackets():
     cengkok_time_brackets = []
@@ -50,157 +63,166 @@ def _calculate_cengkok_brackets():
     print("CALCULATE CENGKOK BRACKETS...")
     with progressbar.ProgressBar(max_value=(len(constants.structure.STRUCTURE))) as bar:
         for nth_part, part in enumerate(constants.structure.STRUCTURE):
-            absolute_time += part[0].duration
-            cengkok_phrase = part[1]
-            start_time_of_cengkok = float(absolute_time)
-            if nth_part == 0:
-                converter = converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
-                    start_time_of_cengkok,
-                    start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
-                    phrase_to_connection_pitches_melody_converter=converters.symmetrical.cengkoks.PhraseToConnectionPitchesMelodyConverter(
-                        instrument_id=constants.instruments.ID_SUS1
-                    ),
-                )
-            elif nth_part == 1:
-                converter = converters.symmetrical.cengkoks.SimplePhraseWithSimpleContrapunctusToTimeBracketsConverter(
-                    start_time_of_cengkok,
-                    start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
-                    phrase_to_connection_pitches_melody_converter=converters.symmetrical.cengkoks.PhraseToConnectionPitchesMelodyConverter(
-                        instrument_id=constants.instruments.ID_SUS2
-                    ),
-                    phrase_to_contapunctus_simpliccisimus_converter=converters.symmetrical.cengkoks.PhraseToContapunctusSimpliccisimusConverter(
-                        instrument_id=constants.instruments.ID_SUS0
-                    ),
-                )
-            elif nth_part == 2:
-                # converter = converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
-                #     start_time_of_cengkok,
-                #     start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
-                #     phrase_to_connection_pitches_melody_converter=None,
-                #     phrase_to_keyboard_octaves_converter=converters.symmetrical.cengkoks.PhraseToKeyboardOctavesConverter(
-                #         modulation_interval_right_hand=parameters.pitches.JustIntonationPitch(
-                #             "4/3"
-                #         ),
-                #         modulation_interval_left_hand="1/1",
-                #     ),
-                # )
-                converter = None
-            elif nth_part == 3:
-                # converter = converters.symmetrical.cengkoks.MixedPhraseToTimeBracketsConverter0(
-                # converter = converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
-                # converter = converters.symmetrical.cengkoks.SimplePhraseWithSimpleContrapunctusToTimeBracketsConverter(
-                #     start_time_of_cengkok,
-                #     start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
-                #     # phrase_to_connection_pitches_melody_converter=converters.symmetrical.cengkoks.PhraseToConnectionPitchesMelodyConverter(
-                #     #     instrument_id=constants.instruments.ID_SUS0
-                #     # ),
-                #     phrase_to_keyboard_octaves_converter=converters.symmetrical.cengkoks.PhraseToRootMelodyConverter(
-                #         instrument_id=constants.instruments.ID_SUS1
-                #     ),
-                #     phrase_to_contapunctus_simpliccisimus_converter=converters.symmetrical.cengkoks.PhraseToContapunctusSimpliccisimusConverter(
-                #         instrument_id=constants.instruments.ID_SUS2,
-                #         remove_repeating_pitches=True,
-                #         start_max_distance=750,
-                #     ),
-                # )
-                converter = None
-            elif nth_part == 4:
-                # converter = converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
-                #     start_time_of_cengkok,
-                #     start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
-                #     phrase_to_connection_pitches_melody_converter=converters.symmetrical.cengkoks.PhraseToConnectionPitchesMelodyConverter(
-                #         instrument_id=constants.instruments.ID_SUS1, dynamic="pp"
-                #     ),
-                #     phrase_to_keyboard_octaves_converter=converters.symmetrical.cengkoks.PhraseToKeyboardOctavesConverter(
-                #         modulation_interval_right_hand=parameters.pitches.JustIntonationPitch(
-                #             "4/1"
-                #         ),
-                #         modulation_interval_left_hand=parameters.pitches.JustIntonationPitch(
-                #             "2/1"
-                #         ),
-                #         dynamic="ppp",
-                #     ),
-                # )
-                converter = None
-            # 5 is normal and not changed
-            elif nth_part == 5:
-                converter = (
-                    converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
+            with ot2_utilities.profiling.span(f"cengkok part {nth_part}", "cengkok"):
+                absolute_time += part[0].duration
+                cengkok_phrase = part[1]
+                start_time_of_cengkok = float(absolute_time)
+                if nth_part == 0:
+                    converter = converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
                         start_time_of_cengkok,
                         start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
-                        phrase_to_gong_converter=None,
+                        phrase_to_connection_pitches_melody_converter=converters.symmetrical.cengkoks.PhraseToConnectionPitchesMelodyConverter(
+                            instrument_id=constants.instruments.ID_SUS1
+                        ),
                     )
-                )
-            elif nth_part == 6:
-                converter = None
-            elif nth_part == 7:
-                converter = None
-            elif nth_part == 8:
-                converter = (
-                    converters.symmetrical.cengkoks.RiverPhraseToTimeBracketsConverter(
+                elif nth_part == 1:
+                    converter = converters.symmetrical.cengkoks.SimplePhraseWithSimpleContrapunctusToTimeBracketsConverter(
                         start_time_of_cengkok,
                         start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                        phrase_to_connection_pitches_melody_converter=converters.symmetrical.cengkoks.PhraseToConnectionPitchesMelodyConverter(
+                            instrument_id=constants.instruments.ID_SUS2
+                        ),
+                        phrase_to_contapunctus_simpliccisimus_converter=converters.symmetrical.cengkoks.PhraseToContapunctusSimpliccisimusConverter(
+                            instrument_id=constants.instruments.ID_SUS0
+                        ),
                     )
-                )
-            elif nth_part == 9:
-                converter = None
-            elif nth_part == 10:
-                converter = None
-            elif nth_part == 11:
-                converter = (
-                    converters.symmetrical.cengkoks.RiverPhraseToTimeBracketsConverter(
-                        start_time_of_cengkok,
-                        start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                elif nth_part == 2:
+                    # converter = converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
+                    #     start_time_of_cengkok,
+                    #     start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                    #     phrase_to_connection_pitches_melody_converter=None,
+                    #     phrase_to_keyboard_octaves_converter=converters.symmetrical.cengkoks.PhraseToKeyboardOctavesConverter(
+                    #         modulation_interval_right_hand=parameters.pitches.JustIntonationPitch(
+                    #             "4/3"
+                    #         ),
+                    #         modulation_interval_left_hand="1/1",
+                    #     ),
+                    # )
+                    converter = None
+                elif nth_part == 3:
+                    # converter = converters.symmetrical.cengkoks.MixedPhraseToTimeBracketsConverter0(
+                    # converter = converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
+                    # converter = converters.symmetrical.cengkoks.SimplePhraseWithSimpleContrapunctusToTimeBracketsConverter(
+                    #     start_time_of_cengkok,
+                    #     start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                    #     # phrase_to_connection_pitches_melody_converter=converters.symmetrical.cengkoks.PhraseToConnectionPitchesMelodyConverter(
+                    #     #     instrument_id=constants.instruments.ID_SUS0
+                    #     # ),
+                    #     phrase_to_keyboard_octaves_converter=converters.symmetrical.cengkoks.PhraseToRootMelodyConverter(
+                    #         instrument_id=constants.instruments.ID_SUS1
+                    #     ),
+                    #     phrase_to_contapunctus_simpliccisimus_converter=converters.symmetrical.cengkoks.PhraseToContapunctusSimpliccisimusConverter(
+                    #         instrument_id=constants.instruments.ID_SUS2,
+                    #         remove_repeating_pitches=True,
+                    #         start_max_distance=750,
+                    #     ),
+                    # )
+                    converter = None
+                elif nth_part == 4:
+                    # converter = converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
+                    #     start_time_of_cengkok,
+                    #     start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                    #     phrase_to_connection_pitches_melody_converter=converters.symmetrical.cengkoks.PhraseToConnectionPitchesMelodyConverter(
+                    #         instrument_id=constants.instruments.ID_SUS1, dynamic="pp"
+                    #     ),
+                    #     phrase_to_keyboard_octaves_converter=converters.symmetrical.cengkoks.PhraseToKeyboardOctavesConverter(
+                    #         modulation_interval_right_hand=parameters.pitches.JustIntonationPitch(
+                    #             "4/1"
+                    #         ),
+                    #         modulation_interval_left_hand=parameters.pitches.JustIntonationPitch(
+                    #             "2/1"
+                    #         ),
+                    #         dynamic="ppp",
+                    #     ),
+                    # )
+                    converter = None
+                # 5 is normal and not changed
+                elif nth_part == 5:
+                    converter = (
+                        converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
+                            start_time_of_cengkok,
+                            start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                            phrase_to_gong_converter=None,
+                        )
                     )
-                )
-            elif nth_part == 12:
-                converter = (
-                    converters.symmetrical.cengkoks.RiverPhraseToTimeBracketsConverter(
-                        start_time_of_cengkok,
-                        start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
-                        percentage_of_single_populated_bars=0.3,
+                elif nth_part == 6:
+                    converter = None
+                elif nth_part == 7:
+                    converter = None
+                elif nth_part == 8:
+                    converter = (
+                        converters.symmetrical.cengkoks.RiverPhraseToTimeBracketsConverter(
+                            start_time_of_cengkok,
+                            start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                        )
                     )
-                )
-            else:
-                converter = (
-                    converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
-                        start_time_of_cengkok,
-                        start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                elif nth_part == 9:
+                    converter = None
+                elif nth_part == 10:
+                    converter = None
+                elif nth_part == 11:
+                    converter = (
+                        converters.symmetrical.cengkoks.RiverPhraseToTimeBracketsConverter(
+                            start_time_of_cengkok,
+                            start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                        )
                     )
-                )
-            if converter:
-                time_brackets = converter.convert(cengkok_phrase)
-                if nth_part == 5:
-                    for time_bracket in time_brackets:
-                        time_bracket.engine_distribution_strategy = converters.symmetrical.keyboard.ComplexEngineDistributionStrategy(
-                            converters.symmetrical.keyboard.ByPitchDivisionStrategy(
-                                parameters.pitches.JustIntonationPitch("4/9")
-                                - parameters.pitches.JustIntonationPitch("5/4")
-                                # parameters.pitches.JustIntonationPitch("5/8")
-                            ),
-                            (
-                                converters.symmetrical.keyboard.SimpleEngineDistributionPartStrategy(
-                                    3
+                elif nth_part == 12:
+                    converter = (
+                        converters.symmetrical.cengkoks.RiverPhraseToTimeBracketsConverter(
+                            start_time_of_cengkok,
+                            start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                            percentage_of_single_populated_bars=0.3,
+                        )
+                    )
+                else:
+                    converter = (
+                        converters.symmetrical.cengkoks.SimplePhraseToTimeBracketsConverter(
+                            start_time_of_cengkok,
+                            start_time_of_cengkok + cengkok_phrase.duration_in_seconds,
+                        )
+                    )
+                if converter:
+                    time_brackets = converter.convert(cengkok_phrase)
+                    if nth_part == 5:
+                        for time_bracket in time_brackets:
+                            time_bracket.engine_distribution_strategy = converters.symmetrical.keyboard.ComplexEngineDistributionStrategy(
+                                converters.symmetrical.keyboard.ByPitchDivisionStrategy(
+                                    parameters.pitches.JustIntonationPitch("4/9")
+                                    - parameters.pitches.JustIntonationPitch("5/4")
+                                    # parameters.pitches.JustIntonationPitch("5/8")
                                 ),
-                                converters.symmetrical.keyboard.SimpleEngineDistributionPartStrategy(
-                                    1
+                                (
+                                    converters.symmetrical.keyboard.SimpleEngineDistributionPartStrategy(
+                                        3
+                                    ),
+                                    converters.symmetrical.keyboard.SimpleEngineDistributionPartStrategy(
+                                        1
+                                    ),
                                 ),
-                            ),
-                        )
-            else:
-                time_brackets = tuple([])
-            sorted_time_brackets = []
-            for time_bracket in time_brackets:
-                sorted_time_brackets.append(_sort_cengkok_time_bracket(time_bracket))
-            cengkok_time_brackets.append(tuple(sorted_time_brackets))
-            absolute_time += cengkok_phrase.duration_in_seconds
+                            )
+                else:
+                    time_brackets = tuple([])
+                sorted_time_brackets = []
+                for time_bracket in time_brackets:
+                    sorted_time_brackets.append(_sort_cengkok_time_bracket(time_bracket))
+                cengkok_time_brackets.append(tuple(sorted_time_brackets))
+                absolute_time += cengkok_phrase.duration_in_seconds
             bar.update(nth_part + 1)
     return cengkok_time_brackets
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.{constants.instruments.ID_DRONE_SYNTH}-brackets.pickle",
+    dependencies=lambda: (
+        converters.symmetrical.drones,
+        ot2_events,
+        constants.compute.BATCH_CURVE_AND_WEIGHT_ASSIGNMENT,
+        constants.tendencies_and_choices,
+        pathlib.Path(constants.families_pitch.FAMILIES_PITCH_PATH),
+    ),
     force_to_compute=constants.compute.COMPUTE_DRONE,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_csound_drone_brackets():
     time_brackets = converters.symmetrical.drones.FamilyOfPitchCurvesToDroneBracketsConverter().convert(
@@ -209,9 +231,17 @@ def _calculate_csound_drone_brackets():
     return time_brackets
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.{constants.instruments.ID_DRONE_SYNTH}-midi-brackets.pickle",
+    dependencies=lambda: (
+        converters.symmetrical.drones,
+        ot2_events,
+        constants.compute.BATCH_CURVE_AND_WEIGHT_ASSIGNMENT,
+        constants.tendencies_and_choices,
+        pathlib.Path(constants.families_pitch.FAMILIES_PITCH_PATH),
+    ),
     force_to_compute=constants.compute.COMPUTE_DRONE,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_midi_drone_brackets():
     time_brackets = converters.symmetrical.drones.FourFofBasedFamiliesOfPitchCurvesToDroneBracketsConverter().convert(
@@ -220,6 +250,7 @@ def _calculate_midi_drone_brackets():
     return time_brackets
 
 
+@ot2_utilities.profiling.spanned("register cengkok brackets")
 def _register_cengkok_brackets():
     time_brackets_per_cengkok = _calculate_cengkok_brackets()
     for nth_time_brackets, time_brackets in enumerate(time_brackets_per_cengkok):
@@ -232,6 +263,7 @@ def _register_cengkok_brackets():
             )
 
 
+@ot2_utilities.profiling.spanned("register manual brackets")
 def _register_manual_brackets():
     time_brackets = manual.main()
     for instrument_ids, time_bracket in time_brackets:
@@ -245,6 +277,7 @@ def _register_manual_brackets():
             )
 
 
+@ot2_utilities.profiling.spanned("register third way brackets")
 def _register_third_way_brackets():
     collected_time_brackets = third_way.main()
     for instrument_ids, time_bracket in collected_time_brackets:
@@ -256,6 +289,7 @@ def _register_third_way_brackets():
             pass
 
 
+@ot2_utilities.profiling.spanned("register stochastic brackets")
 def _register_stochastic_brackets():
     collected_time_brackets = stochastic.main()
     for instrument_id, time_bracket in collected_time_brackets:
@@ -283,11 +317,13 @@ def _register_synthesized_midi_drone_brackets():
         )
 
 
+@ot2_utilities.profiling.spanned("register synthesized drone brackets")
 def _register_synthesized_drone_brackets():
     # _register_synthesized_csound_drone_brackets()
     _register_synthesized_midi_drone_brackets()
 
 
+@ot2_utilities.profiling.spanned("register noise brackets")
 def _register_noise_brackets():
     for time_bracket in noise_constants.NOISE_TIME_BRACKETS:
         constants.time_brackets_container.TIME_BRACKETS.register(
@@ -302,16 +338,26 @@ def main():
     _register_stochastic_brackets()
     _register_synthesized_drone_brackets()
 
-    constants.time_brackets_container.TIME_BRACKETS = (
-        postprocess.post_process_time_brackets_container(
-            constants.time_brackets_container.TIME_BRACKETS
+    with ot2_utilities.profiling.span("post process time brackets"):
+        constants.time_brackets_container.TIME_BRACKETS = (
+            postprocess.post_process_time_brackets_container(
+                constants.time_brackets_container.TIME_BRACKETS
+            )
         )
-    )
 
     _register_noise_brackets()
 
-    constants.time_brackets_container.TIME_BRACKETS = (
-        postprocess.post_process_time_brackets_container_2(
-            constants.time_brackets_container.TIME_BRACKETS
+    with ot2_utilities.profiling.span("post process time brackets 2"):
+        constants.time_brackets_container.TIME_BRACKETS = (
+            postprocess.post_process_time_brackets_container_2(
+                constants.time_brackets_container.TIME_BRACKETS
+            )
+        )
+
+    # the post processing moves time brackets and refers to time brackets by
+    # their position, therefore brackets outside of the time window can
+    # only be removed after all brackets have been post processed
+    if constants.compute.TIME_WINDOW is not None:
+        constants.time_brackets_container.TIME_BRACKETS.remove_time_brackets_outside_of_time_window(
+            *constants.compute.TIME_WINDOW
         )
-    )
@@ -3,6 +3,9 @@
 Public interaction via "main" method.
 """
 
+import functools
+import time
+import typing
 
 import abjad
 import quicktions as fractions
@@ -11,9 +14,11 @@ from mutwo.events import basic
 from mutwo.events import time_brackets
 from mutwo import converters
 from mutwo import parameters
+from mutwo import utilities
 
 from ot2 import constants as ot2_constants
 from ot2 import converters as ot2_converters
+from ot2 import utilities as ot2_utilities
 
 
 PLAYING_INDICATORS_CONVERTER = (
@@ -36,8 +41,15 @@ def add_names_to_unnamed_scores(abjad_scores_to_post_process):
             nth_unnamed_score += 1
 
 
-def post_process_common_score_parts(abjad_scores_to_post_process):
+def post_process_common_score_parts(abjad_scores_to_post_process, instrument_id):
     add_names_to_unnamed_scores(abjad_scores_to_post_process)
+    if (
+        instrument_id
+        in ot2_constants.time_brackets_container.TIME_BRACKETS.tags_after_time_window
+    ):
+        # the following fixes refer to bars of the last cengkok of the
+        # complete piece, which starts after the time window
+        return
     abjad_score_names_to_post_process = {
         score.items[0].name: score for score in abjad_scores_to_post_process
     }
@@ -86,12 +98,89 @@ def post_process_common_score_parts(abjad_scores_to_post_process):
                 """
 
 
+def _get_assigned_start_and_end_time(time_bracket) -> typing.Tuple[float, float]:
+    # as 'TimeBracketsToEventConverter': the concrete times are only
+    # assigned once, so that the converter later finds the same times
+    try:
+        return time_bracket.assigned_start_time, time_bracket.assigned_end_time
+    except utilities.exceptions.ValueNotAssignedError:
+        time_bracket.assign_concrete_times()
+        return time_bracket.assigned_start_time, time_bracket.assigned_end_time
+
+
+def _convert_time_brackets_to_chunks(
+    instrument_id,
+    filtered_time_brackets,
+    return_pitch: bool = False,
+) -> typing.Iterator[typing.Tuple[float, basic.SimultaneousEvent]]:
+    """Convert one time bracket after the other.
+
+    The events of the complete instrument never exist at the same time.
+    The chunks are sorted by their assigned start time (brackets are sorted
+    by their mean start, but brackets with start ranges can have a
+    different order after their concrete times have been assigned). As in
+    'TimeBracketsToEventConverter' an OverlappingTimeBracketsError is raised
+    if a time bracket starts before the previous time bracket ended.
+    """
+
+    time_brackets_and_times = sorted(
+        (
+            (time_bracket, _get_assigned_start_and_end_time(time_bracket))
+            for time_bracket in filtered_time_brackets
+        ),
+        key=lambda time_bracket_and_times: time_bracket_and_times[1],
+    )
+    previous_end_time = 0
+    for _, (start_time, end_time) in time_brackets_and_times:
+        if previous_end_time > start_time:
+            raise utilities.exceptions.OverlappingTimeBracketsError()
+        previous_end_time = end_time
+
+    time_brackets_converter = (
+        converters.symmetrical.time_brackets.TimeBracketsToEventConverter(instrument_id)
+    )
+    for time_bracket, _ in time_brackets_and_times:
+        # the converter returns a tuple (a rest until the start of the time
+        # bracket and the event of the time bracket)
+        converted_time_bracket = time_brackets_converter.convert((time_bracket,))
+        for absolute_time, event in zip(
+            utilities.tools.accumulate_from_zero(
+                event.duration for event in converted_time_bracket
+            ),
+            converted_time_bracket,
+        ):
+            if isinstance(event, basic.SimultaneousEvent):
+                simultaneous_event = basic.SimultaneousEvent(
+                    [PLAYING_INDICATORS_CONVERTER.convert(ev) for ev in event]
+                )
+                if return_pitch:
+                    simultaneous_event.set_parameter("return_pitch", True)
+                yield absolute_time, simultaneous_event
+
+
 def _render_soundfile_or_midi_file_for_instrument(
     instrument_id,
     filtered_time_brackets,
     midi_file_converter,
     return_pitch: bool = False,
 ):
+    if isinstance(
+        midi_file_converter,
+        ot2_converters.frontends.synthesis.AdditiveSynthesisToSoundFileConverter,
+    ) or (
+        ot2_constants.compute.STREAM_MIDI_FILES
+        and isinstance(
+            midi_file_converter,
+            ot2_converters.frontends.midi.OT2InstrumentEventToMidiFileConverter,
+        )
+    ):
+        midi_file_converter.convert_chunks(
+            _convert_time_brackets_to_chunks(
+                instrument_id, filtered_time_brackets, return_pitch
+            )
+        )
+        return
+
     time_brackets_converter = (
         converters.symmetrical.time_brackets.TimeBracketsToEventConverter(instrument_id)
     )
@@ -188,6 +277,38 @@ def _make_score_blocks_for_instrument(
     return abjad_scores
 
 
+def _compile_notation_in_blocks(score_blocks, instrument):
+    # one LilyPond file per score block: if only one time bracket changed
+    # only its block has to be compiled again
+    lilypond_sources = []
+    for nth_score_block, score_block in enumerate(score_blocks):
+        lilypond_file_converter = (
+            ot2_converters.frontends.abjad.AbjadScoresToLilypondFileConverter(
+                instrument_tag=instrument,
+                print_title=nth_score_block == 0,
+                print_tagline=nth_score_block + 1 == len(score_blocks),
+                print_page_numbers=False,
+            )
+        )
+        lilypond_sources.append(
+            abjad.lilypond(lilypond_file_converter.convert([score_block]))
+        )
+
+    n_compiled_blocks = ot2_utilities.lilypond.compile_blocks(
+        lilypond_sources,
+        f"{ot2_constants.paths.NOTATION_BLOCKS_PATH}/{instrument}",
+        f"{ot2_constants.paths.NOTATION_PATH}/oT2_{instrument}.pdf",
+        ot2_constants.compute.N_PROCESSES_FOR_LILYPOND,
+        # keep the blocks outside of the time window for the next build of
+        # the complete piece
+        remove_unused_blocks=ot2_constants.compute.TIME_WINDOW is None,
+    )
+    print(
+        f"COMPILED {n_compiled_blocks} OF {len(lilypond_sources)} SCORE BLOCKS"
+        f" OF {instrument}"
+    )
+
+
 def _render_notation_for_instrument(
     filtered_time_brackets,
     island_to_abjad_score_converter,
@@ -200,15 +321,21 @@ def _render_notation_for_instrument(
             island_to_abjad_score_converter,
             post_process_abjad_scores,
         )
+        if ot2_constants.compute.COMPILE_NOTATION_IN_BLOCKS:
+            _compile_notation_in_blocks(score_blocks, instrument)
+            return
+
         lilypond_file_converter = (
             ot2_converters.frontends.abjad.AbjadScoresToLilypondFileConverter(
                 instrument_tag=instrument
             )
         )
         lilypond_file = lilypond_file_converter.convert(score_blocks)
-        abjad.persist.as_pdf(
-            lilypond_file, f"{ot2_constants.paths.NOTATION_PATH}/oT2_{instrument}.pdf"
-        )
+        with ot2_utilities.profiling.span(f"lilypond {instrument}", "lilypond"):
+            abjad.persist.as_pdf(
+                lilypond_file,
+                f"{ot2_constants.paths.NOTATION_PATH}/oT2_{instrument}.pdf",
+            )
 
 
 def _render_video_for_instrument(
@@ -323,7 +450,9 @@ def _render_keyboard():
         adapted_filtered_time_brackets,
         ot2_converters.frontends.abjad.IslandKeyboardToAbjadScoreBlockConverter(),
         instrument_id,
-        post_process_common_score_parts,
+        functools.partial(
+            post_process_common_score_parts, instrument_id=instrument_id
+        ),
     )
     _render_video_for_instrument(
         adapted_filtered_time_brackets,
@@ -336,7 +465,7 @@ def _render_keyboard():
 
 def _render_nth_sustaining_instrument(nth_sustaining_instrument, make_clarinet_version: bool):
     def post_process_abjad_scores(abjad_scores_to_post_process):
-        post_process_common_score_parts(abjad_scores_to_post_process)
+        post_process_common_score_parts(abjad_scores_to_post_process, instrument_id)
         # add dodecaphonic mode to keyboard score
         for abjad_score in abjad_scores_to_post_process:
             for staff_group in abjad_score.items[0]:
@@ -416,12 +545,6 @@ def _render_nth_sustaining_instrument(nth_sustaining_instrument, make_clarinet_v
     )
 
 
-def _render_sustaining_instruments(make_clarinet_version: bool):
-    # _render_nth_sustaining_instrument(2)
-    for nth_sustaining_instrument in range(3):
-        _render_nth_sustaining_instrument(nth_sustaining_instrument, make_clarinet_version)
-
-
 def _render_csound_drone():
     if ot2_constants.compute.RENDER_SOUNDFILES and ot2_constants.compute.RENDER_DRONE:
         """
@@ -495,20 +618,25 @@ def _render_sine(instrument_id):
     )
 
     if ot2_constants.compute.RENDER_SOUNDFILES and ot2_constants.compute.RENDER_SINES:
+        if ot2_constants.compute.SYNTHESIZE_WITH_CSOUND:
+            sound_file_converter = (
+                ot2_converters.frontends.csound.SineTonesToSoundFileConverter(
+                    instrument_id
+                )
+            )
+        else:
+            sound_file_converter = (
+                ot2_converters.frontends.synthesis.SineTonesToSoundFileConverter(
+                    instrument_id
+                )
+            )
         _render_soundfile_for_instrument(
             instrument_id,
             filtered_time_brackets,
-            ot2_converters.frontends.csound.SineTonesToSoundFileConverter(
-                instrument_id
-            ),
+            sound_file_converter,
         )
 
 
-def _render_sines():
-    for instrument_id in ot2_constants.instruments.ID_SUS_TO_ID_SINE.values():
-        _render_sine(instrument_id)
-
-
 def _render_pillow(instrument_id):
     filtered_time_brackets = ot2_constants.time_brackets_container.TIME_BRACKETS.filter(
         instrument_id
@@ -520,18 +648,51 @@ def _render_pillow(instrument_id):
         ot2_converters.frontends.midi.PillowEventToMidiFileConverter(instrument_id),
     )
 
-    if ot2_constants.compute.RENDER_SOUNDFILES and ot2_constants.compute.RENDER_PILLOW:
+    if (
+        ot2_constants.compute.RENDER_SOUNDFILES
+        and ot2_constants.compute.RENDER_PILLOW
+        and ot2_constants.compute.SYNTHESIZE_WITH_CSOUND
+    ):
         _render_soundfile_for_instrument(
             instrument_id,
             filtered_time_brackets,
-            ot2_converters.frontends.csound.PillowEventsToSoundFileConverter(instrument_id),
+            ot2_converters.frontends.csound.PillowEventsToSoundFileConverter(
+                instrument_id
+            ),
         )
 
 
+def _render_pillow_sound_files():
+    # all pillows are synthesized in one pass over their time brackets
+    instrument_ids = ot2_constants.instruments.PILLOW_IDS
+    sound_file_converter = ot2_converters.frontends.synthesis.PillowsToSoundFileConverter(
+        instrument_ids,
+        multichannel=ot2_constants.compute.RENDER_PILLOWS_TO_ONE_MULTICHANNEL_FILE,
+    )
+    sound_file_converter.convert_chunks_per_channel(
+        tuple(
+            _convert_time_brackets_to_chunks(
+                instrument_id,
+                ot2_constants.time_brackets_container.TIME_BRACKETS.filter(
+                    instrument_id
+                ),
+            )
+            for instrument_id in instrument_ids
+        )
+    )
+
+
 def _render_pillows():
     for instrument_id in ot2_constants.instruments.PILLOW_IDS:
         _render_pillow(instrument_id)
 
+    if (
+        ot2_constants.compute.RENDER_SOUNDFILES
+        and ot2_constants.compute.RENDER_PILLOW
+        and not ot2_constants.compute.SYNTHESIZE_WITH_CSOUND
+    ):
+        _render_pillow_sound_files()
+
 
 def _render_common_harmonics():
     from ot2 import common_harmonics
@@ -577,12 +738,176 @@ def _render_noise():
     )
 
 
-def main(make_clarinet_version: bool = True):
-    _render_keyboard()
+def _make_render_jobs(
+    make_clarinet_version: bool,
+) -> typing.Tuple[
+    typing.Tuple[str, typing.Optional[typing.Tuple[str, ...]], typing.Callable[[], None]],
+    ...,
+]:
+    # each job only reads the time brackets of its own instruments and
+    # writes its own files, therefore the jobs can run in parallel
+    # (None instead of instrument ids means that the job reads all time
+    # brackets)
+    render_jobs = [
+        ("keyboard", (ot2_constants.instruments.ID_KEYBOARD,), _render_keyboard),
+        ("drone", (ot2_constants.instruments.ID_DRONE_SYNTH,), _render_drone),
+    ]
+    for nth_sustaining_instrument, instrument_id in enumerate(
+        (
+            ot2_constants.instruments.ID_SUS0,
+            ot2_constants.instruments.ID_SUS1,
+            ot2_constants.instruments.ID_SUS2,
+        )
+    ):
+        render_jobs.append(
+            (
+                f"sustaining instrument {nth_sustaining_instrument}",
+                (instrument_id,),
+                functools.partial(
+                    _render_nth_sustaining_instrument,
+                    nth_sustaining_instrument,
+                    make_clarinet_version,
+                ),
+            )
+        )
+    if ot2_constants.compute.SYNTHESIZE_WITH_CSOUND:
+        # one Csound job per pillow
+        for instrument_id in ot2_constants.instruments.PILLOW_IDS:
+            render_jobs.append(
+                (
+                    instrument_id,
+                    (instrument_id,),
+                    functools.partial(_render_pillow, instrument_id),
+                )
+            )
+    else:
+        render_jobs.append(
+            ("pillows", ot2_constants.instruments.PILLOW_IDS, _render_pillows)
+        )
+    render_jobs.append(("gong", (ot2_constants.instruments.ID_GONG,), _render_gong))
+    render_jobs.append(("common harmonics", None, _render_common_harmonics))
+    for instrument_id in ot2_constants.instruments.ID_SUS_TO_ID_SINE.values():
+        render_jobs.append(
+            (
+                instrument_id,
+                (instrument_id,),
+                functools.partial(_render_sine, instrument_id),
+            )
+        )
+    return tuple(render_jobs)
+
+
+def _get_midi_and_sound_file_patterns(
+    instrument_ids: typing.Optional[typing.Tuple[str, ...]]
+) -> typing.Tuple[str, ...]:
+    """Glob patterns of the midi files and sound files of a render job.
+
+    Some jobs write a varying number of files (e.g. one midi file per
+    keyboard voice) and files are only written if the instrument has time
+    brackets, therefore patterns are returned instead of paths. The
+    patterns are made with the paths of the converters which write the
+    files.
+    """
+
+    midi = ot2_converters.frontends.midi
+    synthesis = ot2_converters.frontends.synthesis
+    if instrument_ids is None:
+        return (midi.CommonHarmonicEventToMidiFileConverter.get_path("*"),)
+
+    instrument_id_to_patterns = {
+        ot2_constants.instruments.ID_KEYBOARD: (
+            midi.KeyboardEventToMidiFileConverter.get_path("*"),
+        ),
+        ot2_constants.instruments.ID_DRONE_SYNTH: (
+            midi.DroneFofEventToMidiFileConverter.get_path("*"),
+        ),
+        ot2_constants.instruments.ID_GONG: (
+            midi.GongEventToMidiFileConverter.get_path(),
+        ),
+    }
+    for nth_sustaining_instrument, instrument_id in enumerate(
+        (
+            ot2_constants.instruments.ID_SUS0,
+            ot2_constants.instruments.ID_SUS1,
+            ot2_constants.instruments.ID_SUS2,
+        )
+    ):
+        instrument_id_to_patterns.update(
+            {
+                instrument_id: (
+                    midi.SustainingInstrumentEventToMidiFileConverter.get_path(
+                        nth_sustaining_instrument
+                    ),
+                )
+            }
+        )
+    for instrument_id in ot2_constants.instruments.PILLOW_IDS:
+        instrument_id_to_patterns.update(
+            {
+                instrument_id: (
+                    midi.PillowEventToMidiFileConverter.get_path(instrument_id),
+                    synthesis.PillowEventsToSoundFileConverter.get_path(instrument_id),
+                    synthesis.PillowsToSoundFileConverter.get_path_or_paths(
+                        (instrument_id,), multichannel=True
+                    ),
+                )
+            }
+        )
+    for instrument_id in ot2_constants.instruments.ID_SUS_TO_ID_SINE.values():
+        instrument_id_to_patterns.update(
+            {
+                instrument_id: (
+                    midi.MonitorSineEventToMidiFileConverter.get_path(instrument_id),
+                    synthesis.SineTonesToSoundFileConverter.get_path(instrument_id),
+                )
+            }
+        )
+
+    return tuple(
+        dict.fromkeys(
+            pattern
+            for instrument_id in instrument_ids
+            for pattern in instrument_id_to_patterns.get(instrument_id, tuple([]))
+        )
+    )
+
+
+def _run_render_job(
+    name_and_render_job: typing.Tuple[str, typing.Callable[[], None]]
+) -> typing.Tuple[str, float]:
+    name, render_job = name_and_render_job
+    start_time = time.perf_counter()
+    with ot2_utilities.profiling.span(f"render {name}", "render"):
+        render_job()
+    duration = time.perf_counter() - start_time
+    print(f"RENDERED {name} IN {duration:.2f} SECONDS")
+    return name, duration
+
+
+def main(
+    make_clarinet_version: bool = True, n_processes: typing.Optional[int] = None
+):
+    """Render all notations, midi files and sound files.
+
+    :param make_clarinet_version: Render sustaining instrument 1 for clarinet.
+    :param n_processes: How many render jobs can run at the same time.
+        Defaults to :const:`ot2.constants.compute.N_PROCESSES_FOR_RENDERING`.
+    """
+
+    if n_processes is None:
+        n_processes = ot2_constants.compute.N_PROCESSES_FOR_RENDERING
+
     # _render_noise()
-    _render_drone()
-    _render_sustaining_instruments(make_clarinet_version)
-    _render_pillows()
-    _render_gong()
-    _render_common_harmonics()
-    _render_sines()
+    start_time = time.perf_counter()
+    name_and_duration_pairs = ot2_utilities.processes.map_in_processes(
+        _run_render_job,
+        (
+            (name, render_job)
+            for name, _, render_job in _make_render_jobs(make_clarinet_version)
+        ),
+        n_processes,
+    )
+    print(
+        f"RENDERED {len(name_and_duration_pairs)} JOBS IN"
+        f" {time.perf_counter() - start_time:.2f} SECONDS"
+    )
@@ -16,8 +16,10 @@ from mutwo.parameters import pitches
 from ot2.analysis import applied_cantus_firmus
 from ot2.analysis import cengkoks
 from ot2.constants import instruments
+from ot2 import parameters as ot2_parameters
 from ot2.scripts.cengkoks import vanitas_melody_parts
 from ot2.scripts.cengkoks import rhythms
+from ot2.utilities import lazy
 
 
 class BestCengkokFinder(object):
@@ -309,7 +311,9 @@ class BestCengkokFinder(object):
             for pitch0, pitch1 in itertools.product(
                 event.pitch_or_pitches, simultaneous_drone_event.pitch_or_pitches
             ):
-                harmonicity += (pitch0 - pitch1).harmonicity_simplified_barlow
+                harmonicity += ot2_parameters.pitches.harmonicity_simplified_barlow(
+                    ot2_parameters.pitches.interval(pitch0.exponents, pitch1.exponents)
+                )
         return -harmonicity
 
     def _fitness_melodic_contour(
@@ -484,7 +488,9 @@ def synthesize_applied_cengkoks(applied_cengkoks: basic.SequentialEvent):
     )
 
 
-APPLIED_CENGKOKS = load_cengkoks()
+# all solution pickles are only loaded when the applied cengkoks are accessed
+# for the first time
+__getattr__ = lazy.make_module_getattr(__name__, {"APPLIED_CENGKOKS": load_cengkoks})
 
 
 if __name__ == "__main__":
@@ -9,14 +9,18 @@ import progressbar
 
 from mutwo.parameters import pitches
 
+from ot2 import parameters as ot2_parameters
+
 
 def _make_harmonicity_map(
     available_pitches: typing.Tuple[pitches.JustIntonationPitch, ...]
 ) -> typing.Dict[typing.Tuple[typing.Tuple[int, ...], typing.Tuple[int, ...]], float]:
     harmonicity_map = {}
     for pitch0, pitch1 in itertools.combinations(available_pitches, 2):
-        harmonicity = (
-            (pitch0 - pitch1).normalize(mutate=False).harmonicity_simplified_barlow
+        harmonicity = ot2_parameters.pitches.harmonicity_simplified_barlow(
+            ot2_parameters.pitches.normalize(
+                ot2_parameters.pitches.interval(pitch0.exponents, pitch1.exponents)
+            )
         )
         harmonicity_map.update({(pitch0.exponents, pitch1.exponents): harmonicity})
         harmonicity_map.update({(pitch1.exponents, pitch0.exponents): harmonicity})
@@ -1,58 +1,263 @@
 """Here the time brackets for the stochastic parts get generated.
 
-Public interaction via "main" method.
+Public interaction via "main" method. Single time windows of one
+instrument can be regenerated via "calculate_time_brackets_in_window".
 """
 
+import bisect
+import copy
+import io
+import pathlib
+import pickle
+import random
 import typing
 
+import numpy as np
 import progressbar
 
 from mutwo import events
 from mutwo import generators
-from mutwo import utilities
 
 from ot2 import constants
+from ot2 import converters
+from ot2 import events as ot2_events
 from ot2 import stochastic_constants
+from ot2 import utilities as ot2_utilities
+
+
+# Some converters of different instruments share the same global choices
+# (e.g. 'CALLIGRAPHIC_LINE_DYNAMIC_CHOICES'). To make the result of one
+# instrument independent from the other instruments (and from the order in
+# which they are calculated) the shared choices are reset to their initial
+# state before each instrument gets calculated.
+_INITIAL_SHARED_CHOICES = {
+    name: copy.deepcopy(value)
+    for name, value in vars(constants.tendencies_and_choices).items()
+    if isinstance(
+        value, (generators.generic.DynamicChoice, generators.koenig.Tendency)
+    )
+}
+
+
+def _reset_shared_choices():
+    for name, initial_value in _INITIAL_SHARED_CHOICES.items():
+        setattr(constants.tendencies_and_choices, name, copy.deepcopy(initial_value))
+
+
+# A checkpoint saves the complete state of the time bracket generation at
+# one point in time: the start time, how many time brackets have been
+# generated before, the latest end of these time brackets and the pickled
+# state of the generators (the time bracket factory with all converters and
+# their cycles and random generators, the shared choices and the global
+# random generators).
+Checkpoint = typing.Tuple[float, int, float, bytes]
+
+
+def _get_global_generator_state() -> typing.Tuple[typing.Any, ...]:
+    shared_choices = {
+        name: getattr(constants.tendencies_and_choices, name)
+        for name in _INITIAL_SHARED_CHOICES
+    }
+    return shared_choices, random.getstate(), np.random.get_state()
+
+
+def _set_global_generator_state(state: typing.Tuple[typing.Any, ...]):
+    shared_choices, random_state, numpy_random_state = state
+    for name, shared_choice in shared_choices.items():
+        setattr(constants.tendencies_and_choices, name, shared_choice)
+    random.setstate(random_state)
+    np.random.set_state(numpy_random_state)
+
+
+def _get_shared_objects() -> typing.Dict[str, typing.Any]:
+    # big constants which are never changed by the generators don't get
+    # saved in the checkpoints, but get referenced by their name
+    return {
+        "FAMILY_PITCH": constants.families_pitch.FAMILY_PITCH,
+        "FAMILY_PITCH_ONLY_WITH_NOTATEABLE_PITCHES": constants.families_pitch.FAMILY_PITCH_ONLY_WITH_NOTATEABLE_PITCHES,
+    }
+
+
+def _dump_generator_state(state: typing.Any) -> bytes:
+    # 'dill' can also pickle the lambda functions and cycles of the converters
+    import dill
+
+    object_id_to_name = {
+        id(shared_object): name for name, shared_object in _get_shared_objects().items()
+    }
+
+    class Pickler(dill.Pickler):
+        def persistent_id(self, object_to_pickle: typing.Any) -> typing.Optional[str]:
+            return object_id_to_name.get(id(object_to_pickle))
+
+    buffer = io.BytesIO()
+    Pickler(buffer).dump(state)
+    return buffer.getvalue()
+
+
+def _load_generator_state(pickled_state: bytes) -> typing.Any:
+    import dill
+
+    shared_objects = _get_shared_objects()
+
+    class Unpickler(dill.Unpickler):
+        def persistent_load(self, name: str) -> typing.Any:
+            return shared_objects[name]
+
+    return Unpickler(io.BytesIO(pickled_state)).load()
+
+
+def _make_checkpoint(
+    time_bracket_factory: generators.generic.DynamicChoice,
+    start_time: float,
+    n_time_brackets: int,
+    latest_end: float,
+) -> Checkpoint:
+    state = (time_bracket_factory,) + _get_global_generator_state()
+    return (
+        float(start_time),
+        n_time_brackets,
+        float(latest_end),
+        _dump_generator_state(state),
+    )
+
+
+def _restore_checkpoint(
+    checkpoint: Checkpoint,
+) -> typing.Tuple[generators.generic.DynamicChoice, float]:
+    start_time, _, _, pickled_state = checkpoint
+    time_bracket_factory, *global_generator_state = _load_generator_state(
+        pickled_state
+    )
+    _set_global_generator_state(tuple(global_generator_state))
+    return time_bracket_factory, start_time
+
+
+def _generate_time_brackets(
+    time_bracket_factory: generators.generic.DynamicChoice,
+    start_time: float,
+    end_time: float,
+    step_size: float,
+    checkpoints: typing.Optional[typing.List[Checkpoint]] = None,
+    bar: typing.Optional[progressbar.ProgressBar] = None,
+) -> typing.List[events.time_brackets.TimeBracket]:
+    resulting_time_brackets = []
+    # time brackets of one converter can end later than the first time
+    # bracket, so a time window has to resume from a checkpoint before
+    # all time brackets which may overlap with the window
+    latest_end = start_time
+    next_checkpoint_time = start_time
+    while start_time < end_time:
+        if checkpoints is not None and start_time >= next_checkpoint_time:
+            checkpoints.append(
+                _make_checkpoint(
+                    time_bracket_factory,
+                    start_time,
+                    len(resulting_time_brackets),
+                    latest_end,
+                )
+            )
+            next_checkpoint_time = (
+                (start_time // constants.compute.STOCHASTIC_CHECKPOINT_INTERVAL) + 1
+            ) * constants.compute.STOCHASTIC_CHECKPOINT_INTERVAL
+
+        absolute_position = start_time / constants.duration.DURATION_IN_SECONDS
+        start_time_to_time_bracket_converter = time_bracket_factory.gamble_at(
+            absolute_position
+        )
+        if start_time_to_time_bracket_converter:
+            generated_time_brackets = start_time_to_time_bracket_converter.convert(
+                start_time
+            )
+            if generated_time_brackets:
+                resulting_time_brackets.extend(generated_time_brackets)
+                latest_end = max(
+                    [latest_end]
+                    + [
+                        time_bracket.maximum_end
+                        for time_bracket in generated_time_brackets
+                    ]
+                )
+                start_time = generated_time_brackets[0].maximum_end
+        else:
+            start_time += step_size
+
+        if bar is not None:
+            update_value = start_time
+            if update_value > end_time:
+                update_value = end_time
+            bar.update(update_value)
+
+    return resulting_time_brackets
+
+
+def _get_checkpoints_path(instrument_id: str) -> str:
+    return f"ot2/constants/.stochasticCheckpoints{instrument_id}.pickle"
 
 
 def _calculate_time_brackets_for_instrument(
     time_bracket_factory: generators.generic.DynamicChoice,
     name: str = "",
     step_size: float = 5,
+    instrument_id: typing.Optional[str] = None,
 ) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
-    resulting_time_brackets = []
-    start_time = 0
+    _reset_shared_choices()
     print(f"\nCALCULATE {name}...")
-    with progressbar.ProgressBar(
+    if _IS_WORKER_PROCESS:
+        # progress bars of parallel processes would overwrite each other
+        progress_bar = progressbar.NullBar
+    else:
+        progress_bar = progressbar.ProgressBar
+    checkpoints = None if instrument_id is None else []
+    with progress_bar(
         min_value=0, max_value=constants.duration.DURATION_IN_SECONDS
     ) as bar:
-        while start_time < constants.duration.DURATION_IN_SECONDS:
-            absolute_position = start_time / constants.duration.DURATION_IN_SECONDS
-            start_time_to_time_bracket_converter = time_bracket_factory.gamble_at(
-                absolute_position
-            )
-            if start_time_to_time_bracket_converter:
-                generated_time_brackets = start_time_to_time_bracket_converter.convert(
-                    start_time
-                )
-                if generated_time_brackets:
-                    resulting_time_brackets.extend(generated_time_brackets)
-                    start_time = generated_time_brackets[0].maximum_end
-            else:
-                start_time += step_size
+        resulting_time_brackets = _generate_time_brackets(
+            time_bracket_factory,
+            0,
+            constants.duration.DURATION_IN_SECONDS,
+            step_size,
+            checkpoints,
+            bar,
+        )
 
-            update_value = start_time
-            if update_value > constants.duration.DURATION_IN_SECONDS:
-                update_value = constants.duration.DURATION_IN_SECONDS
-            bar.update(update_value)
+    if checkpoints is not None:
+        with open(_get_checkpoints_path(instrument_id), "wb") as f:
+            pickle.dump(
+                {
+                    "hash": _get_checkpoints_hash(),
+                    "step_size": step_size,
+                    "checkpoints": checkpoints,
+                },
+                f,
+            )
 
     return tuple(resulting_time_brackets)
 
 
-@utilities.decorators.compute_lazy(
+def _get_dependencies() -> tuple:
+    return (
+        _reset_shared_choices,
+        _calculate_time_brackets_for_instrument,
+        _generate_time_brackets,
+        stochastic_constants,
+        converters.symmetrical,
+        # the weights of the curves are calculated by the compiled families
+        ot2_events,
+        constants.compute.BATCH_CURVE_AND_WEIGHT_ASSIGNMENT,
+        constants.duration,
+        constants.instruments,
+        constants.tendencies_and_choices,
+        pathlib.Path(constants.families_pitch.FAMILIES_PITCH_PATH),
+    )
+
+
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.ID_SUS0}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_SUSTAINING_INSTRUMENT_0_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_sustaining0() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -62,13 +267,16 @@ def _calculate_time_brackets_for_sustaining0() -> typing.Tuple[
             constants.instruments.ID_SUS0
         ],
         "sus 0",
+        instrument_id=constants.instruments.ID_SUS0,
     )
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.ID_SUS1}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_SUSTAINING_INSTRUMENT_1_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_sustaining1() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -78,13 +286,16 @@ def _calculate_time_brackets_for_sustaining1() -> typing.Tuple[
             constants.instruments.ID_SUS1
         ],
         "sus 1",
+        instrument_id=constants.instruments.ID_SUS1,
     )
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.ID_SUS2}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_SUSTAINING_INSTRUMENT_2_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_sustaining2() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -94,13 +305,16 @@ def _calculate_time_brackets_for_sustaining2() -> typing.Tuple[
             constants.instruments.ID_SUS2
         ],
         "sus 2",
+        instrument_id=constants.instruments.ID_SUS2,
     )
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.ID_KEYBOARD}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_KEYBOARD_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_keyboard() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -110,13 +324,16 @@ def _calculate_time_brackets_for_keyboard() -> typing.Tuple[
             constants.instruments.ID_KEYBOARD
         ],
         "keyboard",
+        instrument_id=constants.instruments.ID_KEYBOARD,
     )
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.PILLOW_IDS[0]}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_PILLOW_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_pillow0() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -127,13 +344,16 @@ def _calculate_time_brackets_for_pillow0() -> typing.Tuple[
         ],
         "pillow0",
         step_size=6.34233,
+        instrument_id=constants.instruments.PILLOW_IDS[0],
     )
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.PILLOW_IDS[1]}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_PILLOW_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_pillow1() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -144,13 +364,16 @@ def _calculate_time_brackets_for_pillow1() -> typing.Tuple[
         ],
         "pillow1",
         step_size=5.12221,
+        instrument_id=constants.instruments.PILLOW_IDS[1],
     )
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.PILLOW_IDS[2]}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_PILLOW_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_pillow2() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -161,13 +384,16 @@ def _calculate_time_brackets_for_pillow2() -> typing.Tuple[
         ],
         "pillow2",
         step_size=4.8421,
+        instrument_id=constants.instruments.PILLOW_IDS[2],
     )
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.PILLOW_IDS[3]}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_PILLOW_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_pillow3() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -178,13 +404,16 @@ def _calculate_time_brackets_for_pillow3() -> typing.Tuple[
         ],
         "pillow3",
         step_size=7.3,
+        instrument_id=constants.instruments.PILLOW_IDS[3],
     )
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     f"ot2/constants/.timeBrackets{constants.instruments.ID_GONG}.pickle",
+    dependencies=_get_dependencies,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS
     and constants.compute.COMPUTE_GONG_STOCHASTIC_PART,
+    pickle_module=ot2_utilities.serialization,
 )
 def _calculate_time_brackets_for_gong() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
@@ -194,31 +423,155 @@ def _calculate_time_brackets_for_gong() -> typing.Tuple[
             constants.instruments.ID_GONG
         ],
         "gong",
+        instrument_id=constants.instruments.ID_GONG,
     )
 
 
+# same order as the time bracket factories in 'stochastic_constants'
 INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION = {
     constants.instruments.ID_SUS0: _calculate_time_brackets_for_sustaining0,
     constants.instruments.ID_SUS1: _calculate_time_brackets_for_sustaining1,
     constants.instruments.ID_SUS2: _calculate_time_brackets_for_sustaining2,
     constants.instruments.ID_KEYBOARD: _calculate_time_brackets_for_keyboard,
+    constants.instruments.ID_GONG: _calculate_time_brackets_for_gong,
     constants.instruments.PILLOW_IDS[0]: _calculate_time_brackets_for_pillow0,
     constants.instruments.PILLOW_IDS[1]: _calculate_time_brackets_for_pillow1,
     constants.instruments.PILLOW_IDS[2]: _calculate_time_brackets_for_pillow2,
     constants.instruments.PILLOW_IDS[3]: _calculate_time_brackets_for_pillow3,
-    constants.instruments.ID_GONG: _calculate_time_brackets_for_gong,
 }
 
 
-def main() -> typing.Tuple[typing.Tuple[str, events.time_brackets.TimeBracket], ...]:
-    collected_instrument_id_and_time_bracket_pairs = []
+def _get_checkpoints_hash() -> str:
+    return ot2_utilities.decorators.hash_dependencies(
+        *_get_dependencies(), _make_checkpoint
+    )
 
-    for (
-        instrument_id
-    ) in stochastic_constants.INSTRUMENT_ID_TO_TIME_BRACKET_FACTORY.keys():
-        instrument_specific_time_brackets = (
-            INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION[instrument_id]()
+
+def _load_valid_checkpoints(
+    instrument_id: str,
+) -> typing.Optional[typing.Tuple[float, typing.List[Checkpoint]]]:
+    try:
+        with open(_get_checkpoints_path(instrument_id), "rb") as f:
+            saved_checkpoints = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    # checkpoints of an older version of the generators are useless
+    if saved_checkpoints["hash"] != _get_checkpoints_hash():
+        return None
+    return saved_checkpoints["step_size"], saved_checkpoints["checkpoints"]
+
+
+def calculate_time_brackets_in_window(
+    instrument_id: str, start_time: float, end_time: float
+) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
+    """Regenerate the time brackets of one instrument within a time window.
+
+    :param instrument_id: The instrument which time brackets shall be
+        calculated.
+    :param start_time: Start of the window in seconds.
+    :param end_time: End of the window in seconds.
+
+    The generation resumes from the latest checkpoint before all time
+    brackets which may overlap with the window (checkpoints get saved every
+    :const:`ot2.constants.compute.STOCHASTIC_CHECKPOINT_INTERVAL` seconds
+    when all time brackets of the instrument are calculated). The result
+    is the same as in the complete calculation: all time brackets which
+    overlap with the window. If there are no valid checkpoints the
+    complete calculation is used. The global random generators and the
+    shared choices are the same before and after the calculation.
+    """
+
+    def is_in_window(time_bracket: events.time_brackets.TimeBracket) -> bool:
+        return (
+            time_bracket.maximum_end > start_time
+            and time_bracket.minimal_start < end_time
         )
+
+    global_generator_state = _get_global_generator_state()
+    try:
+        step_size_and_checkpoints = _load_valid_checkpoints(instrument_id)
+        if step_size_and_checkpoints is None:
+            time_brackets = INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION[
+                instrument_id
+            ]()
+        else:
+            step_size, checkpoints = step_size_and_checkpoints
+            # time brackets which were generated before a checkpoint can
+            # only overlap with the window if they end after 'start_time'
+            latest_ends = [checkpoint[2] for checkpoint in checkpoints]
+            nth_checkpoint = max(bisect.bisect_right(latest_ends, start_time) - 1, 0)
+            time_bracket_factory, checkpoint_start_time = _restore_checkpoint(
+                checkpoints[nth_checkpoint]
+            )
+            with ot2_utilities.profiling.span(
+                f"stochastic {instrument_id} {start_time}-{end_time}", "stochastic"
+            ):
+                # the complete calculation stops at the end of the piece
+                time_brackets = _generate_time_brackets(
+                    time_bracket_factory,
+                    checkpoint_start_time,
+                    min(end_time, constants.duration.DURATION_IN_SECONDS),
+                    step_size,
+                )
+    finally:
+        _set_global_generator_state(global_generator_state)
+    return tuple(filter(is_in_window, time_brackets))
+
+
+_IS_WORKER_PROCESS = False
+
+
+def _calculate_time_brackets_by_instrument_id(
+    instrument_id: str,
+) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
+    with ot2_utilities.profiling.span(f"stochastic {instrument_id}", "stochastic"):
+        return INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION[instrument_id]()
+
+
+def _calculate_time_brackets_in_worker_process(
+    instrument_id: str,
+) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
+    global _IS_WORKER_PROCESS
+    _IS_WORKER_PROCESS = True
+    time_brackets = _calculate_time_brackets_by_instrument_id(instrument_id)
+    print(f"\nFINISHED {instrument_id}")
+    return time_brackets
+
+
+def main(
+    n_processes: typing.Optional[int] = None,
+) -> typing.Tuple[typing.Tuple[str, events.time_brackets.TimeBracket], ...]:
+    """Calculate time brackets of all stochastic instruments.
+
+    :param n_processes: How many processes shall be used. Each instrument is
+        calculated independently, so with more than one process the
+        instruments are calculated in parallel. The result is always the
+        same, regardless of the number of processes. Defaults to
+        :const:`ot2.constants.compute.N_PROCESSES_FOR_STOCHASTIC_PARTS`.
+    """
+
+    if n_processes is None:
+        n_processes = constants.compute.N_PROCESSES_FOR_STOCHASTIC_PARTS
+
+    # the time bracket factories are only built (and the pitch families only
+    # loaded) if the time brackets of an instrument need to be calculated
+    instrument_ids = tuple(INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION.keys())
+    if n_processes == 1:
+        time_brackets_per_instrument = tuple(
+            _calculate_time_brackets_by_instrument_id(instrument_id)
+            for instrument_id in instrument_ids
+        )
+    else:
+        time_brackets_per_instrument = ot2_utilities.processes.map_in_processes(
+            _calculate_time_brackets_in_worker_process,
+            instrument_ids,
+            n_processes=n_processes,
+        )
+
+    collected_instrument_id_and_time_bracket_pairs = []
+    for instrument_id, instrument_specific_time_brackets in zip(
+        instrument_ids, time_brackets_per_instrument
+    ):
         collected_instrument_id_and_time_bracket_pairs.extend(
             map(
                 lambda bracket: (instrument_id, bracket),
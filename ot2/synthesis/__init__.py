@@ -1 +1,2 @@
 from . import resonators
+from . import numpy_resonators
@@ -0,0 +1,274 @@
+"""Render resonators with numpy and scipy instead of pyo.
+
+:class:`NumpyResonator` has the same arguments and the same signal chain
+as :class:`ot2.synthesis.resonators.Resonator`: the source is fed into a
+waveguide per frequency, each waveguide is filtered by a 4 stage bandpass
+which is panned by a sine lfo, and the source, the waveguides and the
+bandpasses are multiplied with their envelopes. The source is read and the
+output is written block by block (16 bit wave files), so that also long
+tape files never have to be loaded completely. Within a block every filter
+runs on arrays, there is no python loop over single samples.
+"""
+
+import typing
+import wave
+
+import expenvelope
+import numpy as np
+from scipy import signal
+
+from . import resonators
+
+# how many frames are processed at once
+DEFAULT_BLOCK_SIZE = 2 ** 15
+
+
+def get_envelope_levels(
+    envelope: expenvelope.Envelope,
+    times: np.ndarray,
+    exp: typing.Optional[float] = None,
+) -> np.ndarray:
+    """Levels of a pyo.Expseg (or pyo.Linseg if exp is None) envelope.
+
+    :param envelope: The times and levels of the envelope points.
+    :param times: When the levels get read (in seconds).
+    :param exp: The 'exp' argument of pyo.Expseg.
+    """
+
+    envelope_times = np.asarray(envelope.times, dtype=float)
+    envelope_levels = np.asarray(envelope.levels, dtype=float)
+    times = np.clip(times, envelope_times[0], envelope_times[-1])
+    end_indices = np.clip(
+        np.searchsorted(envelope_times, times, side="right"),
+        1,
+        len(envelope_times) - 1,
+    )
+    start_times = envelope_times[end_indices - 1]
+    segment_durations = envelope_times[end_indices] - start_times
+    positions = np.divide(
+        times - start_times,
+        segment_durations,
+        out=np.ones(len(times)),
+        where=segment_durations > 0,
+    )
+    return resonators._get_segment_level(
+        envelope_levels[end_indices - 1],
+        envelope_levels[end_indices],
+        np.clip(positions, 0, 1),
+        exp,
+    )
+
+
+def _read_frames(wave_file: wave.Wave_read, n_frames: int) -> np.ndarray:
+    # returns an array with the shape (channels, frames) and values
+    # between -1 and 1
+    sample_width = wave_file.getsampwidth()
+    data = np.frombuffer(wave_file.readframes(n_frames), dtype=np.uint8)
+    if sample_width == 1:
+        samples = (data.astype(float) - 128) / 128
+    elif sample_width == 3:
+        data = data.reshape(-1, 3)
+        samples = (
+            np.pad(data, ((0, 0), (1, 0))).view("<i4").reshape(-1).astype(float)
+            / 2 ** 31
+        )
+    else:
+        samples = data.view(f"<i{sample_width}").astype(float) / (
+            2 ** ((8 * sample_width) - 1)
+        )
+    return samples.reshape(-1, wave_file.getnchannels()).T
+
+
+class WaveguideBank(object):
+    """Waveguides (delay lines with feedback and lowpass) of many frequencies.
+
+    :param frequencies: The frequency of each waveguide.
+    :param minfreq: Lowest possible frequency (as in pyo.Waveguide).
+    :param duration: After how many seconds the resonance has decayed by
+        60 dB (the 'dur' argument of pyo.Waveguide).
+    :param sampling_rate: Samples per second.
+
+    Each waveguide is 'y[n] = x[n] + g * ((1 - a) * y[n - d] + a * y[n - d - 1])'
+    where 'd + a' is the period of the frequency in samples. The interpolation
+    between the two delayed samples is also the lowpass of the loop. All
+    waveguides are calculated together in steps of the shortest delay, so
+    that each step only depends on samples of earlier steps.
+    """
+
+    def __init__(
+        self,
+        frequencies: typing.Sequence[float],
+        minfreq: float,
+        duration: float,
+        sampling_rate: int,
+    ):
+        periods = sampling_rate / np.maximum(np.asarray(frequencies, float), minfreq)
+        delays = np.maximum(np.floor(periods).astype(int), 1)
+        fractions = np.clip(periods - delays, 0, 1)
+        feedbacks = 0.001 ** (periods / (duration * sampling_rate))
+
+        self._delays = delays
+        self._delayed_factors = (feedbacks * (1 - fractions))[:, np.newaxis]
+        self._more_delayed_factors = (feedbacks * fractions)[:, np.newaxis]
+        self._step = int(delays.min())
+        self._history = np.zeros((len(delays), int(delays.max()) + 1))
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Filter the next block (with the shape (waveguides, frames))."""
+
+        n_history_frames = self._history.shape[1]
+        output = np.concatenate((self._history, block), axis=1)
+        rows = np.arange(len(self._delays))[:, np.newaxis]
+        delayed_offsets = (
+            np.arange(self._step)[np.newaxis, :]
+            + n_history_frames
+            - self._delays[:, np.newaxis]
+        )
+        for start in range(0, block.shape[1], self._step):
+            end = min(start + self._step, block.shape[1])
+            delayed_columns = delayed_offsets[:, : end - start] + start
+            output[:, n_history_frames + start : n_history_frames + end] += (
+                self._delayed_factors * output[rows, delayed_columns]
+            ) + (self._more_delayed_factors * output[rows, delayed_columns - 1])
+        self._history = output[:, output.shape[1] - n_history_frames :].copy()
+        return output[:, n_history_frames:]
+
+
+class BandpassBank(object):
+    """Cascaded second order bandpass filters (as pyo.Resonx).
+
+    :param frequencies: The center frequency of each filter.
+    :param n_stages: How many filters are cascaded.
+    :param sampling_rate: Samples per second.
+
+    The filters have a peak gain of 0 dB. The q of a block is constant, the
+    states of the filters are kept between the blocks.
+    """
+
+    def __init__(
+        self, frequencies: typing.Sequence[float], n_stages: int, sampling_rate: int
+    ):
+        self._angular_frequencies = (
+            2 * np.pi * np.minimum(frequencies, sampling_rate * 0.49) / sampling_rate
+        )
+        self._n_stages = n_stages
+        self._states = np.zeros((len(frequencies), n_stages, 2))
+
+    def _get_second_order_sections(
+        self, angular_frequency: float, q: float
+    ) -> np.ndarray:
+        alpha = np.sin(angular_frequency) / (2 * q)
+        section = np.array(
+            (alpha, 0, -alpha, 1 + alpha, -2 * np.cos(angular_frequency), 1 - alpha)
+        ) / (1 + alpha)
+        return np.tile(section, (self._n_stages, 1))
+
+    def process(self, block: np.ndarray, q: float) -> np.ndarray:
+        """Filter the next block (with the shape (filters, frames))."""
+
+        output = np.empty_like(block)
+        for nth_filter, angular_frequency in enumerate(self._angular_frequencies):
+            output[nth_filter], self._states[nth_filter] = signal.sosfilt(
+                self._get_second_order_sections(angular_frequency, max(q, 1e-3)),
+                block[nth_filter],
+                zi=self._states[nth_filter],
+            )
+        return output
+
+
+class NumpyResonator(resonators.Resonator):
+    """Resonator which is rendered with numpy and scipy instead of pyo.
+
+    Takes the same arguments as :class:`ot2.synthesis.resonators.Resonator`
+    and additionally 'block_size' (how many frames are processed at once).
+    The source has to be a PCM wave file; the output has the sampling rate
+    of the source.
+    """
+
+    def __init__(self, *args, block_size: int = DEFAULT_BLOCK_SIZE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.block_size = block_size
+
+    def _get_duration(self) -> float:
+        with wave.open(self.path, "rb") as source_file:
+            return source_file.getnframes() / source_file.getframerate()
+
+    def _process_block(
+        self,
+        source: np.ndarray,
+        times: np.ndarray,
+        waveguide_bank: WaveguideBank,
+        bandpass_bank: BandpassBank,
+    ) -> np.ndarray:
+        # as in pyo the n-th stream uses the n-th frequency and the n-th
+        # channel of the source (both are repeated if necessary) and the
+        # streams are sent alternately to the left and right channel
+        n_streams = max(len(source), len(self.frequencies))
+        stream_indices = np.arange(n_streams)
+
+        waveguides = self.waveguide_mul * waveguide_bank.process(
+            source[stream_indices % len(source)]
+        )
+        q = get_envelope_levels(
+            self.filter_q_envelope, np.array([times[len(times) // 2]])
+        )[0]
+        bandpasses = self.bandpass_mul * bandpass_bank.process(waveguides, q)
+
+        pan = 0.5 + (0.5 * np.sin(2 * np.pi * self.pan_lfo_frequency * times))
+        bandpass_sum = bandpasses.sum(axis=0) * get_envelope_levels(
+            self.filter_envelope, times, 5
+        )
+
+        output = np.zeros((2, len(times)))
+        output[0] += np.cos(0.5 * np.pi * pan) * bandpass_sum
+        output[1] += np.sin(0.5 * np.pi * pan) * bandpass_sum
+        waveguide_envelope = get_envelope_levels(self.waveguide_envelope, times, 5)
+        source_envelope = get_envelope_levels(self.source_envelope, times, 5)
+        for nth_channel in range(2):
+            output[nth_channel] += (
+                waveguides[nth_channel::2].sum(axis=0) * waveguide_envelope
+            )
+            output[nth_channel] += source[nth_channel::2].sum(axis=0) * source_envelope
+        return output
+
+    def _render(
+        self, output_path: str, start: float = 0, duration: typing.Optional[float] = None
+    ):
+        with wave.open(self.path, "rb") as source_file, wave.open(
+            output_path, "wb"
+        ) as output_file:
+            sampling_rate = source_file.getframerate()
+            first_frame = min(
+                int(round(start * sampling_rate)), source_file.getnframes()
+            )
+            last_frame = source_file.getnframes()
+            if duration is not None:
+                last_frame = min(
+                    first_frame + int(round(duration * sampling_rate)), last_frame
+                )
+            source_file.setpos(first_frame)
+
+            output_file.setnchannels(2)
+            output_file.setsampwidth(2)
+            output_file.setframerate(sampling_rate)
+
+            n_streams = max(source_file.getnchannels(), len(self.frequencies))
+            frequencies = np.resize(np.asarray(self.frequencies, float), n_streams)
+            waveguide_bank = WaveguideBank(
+                frequencies, self.minfreq, self.waveguide_dur, sampling_rate
+            )
+            bandpass_bank = BandpassBank(frequencies, 4, sampling_rate)
+
+            for block_start in range(first_frame, last_frame, self.block_size):
+                n_frames = min(self.block_size, last_frame - block_start)
+                source = _read_frames(source_file, n_frames)
+                times = (
+                    np.arange(block_start, block_start + source.shape[1])
+                    / sampling_rate
+                )
+                output = self._process_block(
+                    source, times, waveguide_bank, bandpass_bank
+                )
+                output_file.writeframes(
+                    (np.clip(output.T, -1, 1) * 32767).astype("<i2").tobytes()
+                )
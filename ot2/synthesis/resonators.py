@@ -1,7 +1,57 @@
+import os
 import typing
+import wave
 
 import expenvelope
-import pyo
+import numpy as np
+
+from ot2 import utilities as ot2_utilities
+
+
+def _get_segment_level(
+    start_level: typing.Union[float, np.ndarray],
+    end_level: typing.Union[float, np.ndarray],
+    position: typing.Union[float, np.ndarray],
+    exp: typing.Optional[float],
+) -> typing.Union[float, np.ndarray]:
+    # equals the curves of pyo.Expseg (with 'inverse=True') or pyo.Linseg
+    # (if exp is None); works with floats and with arrays
+    if exp is not None:
+        position = np.where(
+            end_level < start_level, 1 - ((1 - position) ** exp), position ** exp
+        )
+    return start_level + ((end_level - start_level) * position)
+
+
+def _get_envelope_points(
+    envelope: expenvelope.Envelope,
+    offset: float,
+    exp: typing.Optional[float] = None,
+) -> typing.List[typing.Tuple[float, float]]:
+    """Points of an envelope which starts 'offset' seconds later.
+
+    The level at the offset equals the level of the complete pyo envelope
+    at this time. The rest of the cut segment gets a new curve, which
+    starts and ends with the same levels as the original curve.
+    """
+
+    points = list(zip(envelope.times, envelope.levels))
+    if offset <= points[0][0]:
+        return points
+
+    for (start_time, start_level), (end_time, end_level) in zip(points, points[1:]):
+        if start_time <= offset < end_time:
+            level = _get_segment_level(
+                start_level,
+                end_level,
+                (offset - start_time) / (end_time - start_time),
+                exp,
+            )
+            return [(0, float(level))] + [
+                (time - offset, level) for time, level in points if time > offset
+            ]
+
+    return [(0, points[-1][1])]
 
 
 class Resonator(object):
@@ -47,27 +97,37 @@ class Resonator(object):
         self.bandpass_mul = bandpass_mul
         self.pan_lfo_frequency = pan_lfo_frequency
 
-    def render(self):
+    def _get_duration(self) -> float:
+        import pyo
+
+        return pyo.sndinfo(self.path)[1]
+
+    def _render(
+        self, output_path: str, start: float = 0, duration: typing.Optional[float] = None
+    ):
+        import pyo
+
         s = pyo.Server(audio="offline")
         s.boot()
 
-        sndinfo = pyo.sndinfo(self.path)
-        s.recordOptions(filename=self.complete_output_path, dur=sndinfo[1])
+        if duration is None:
+            duration = self._get_duration() - start
+        s.recordOptions(filename=output_path, dur=duration)
 
-        source = pyo.SfPlayer(self.path)
+        source = pyo.SfPlayer(self.path, offset=start)
         source_envelope = pyo.Expseg(
-            list(zip(self.source_envelope.times, self.source_envelope.levels)), exp=5
+            _get_envelope_points(self.source_envelope, start, 5), exp=5
         )
         waveguide_envelope = pyo.Expseg(
-            list(zip(self.waveguide_envelope.times, self.waveguide_envelope.levels)),
+            _get_envelope_points(self.waveguide_envelope, start, 5),
             exp=5,
         )
         filter_envelope = pyo.Expseg(
-            list(zip(self.filter_envelope.times, self.filter_envelope.levels)),
+            _get_envelope_points(self.filter_envelope, start, 5),
             exp=5,
         )
         filter_q_envelope = pyo.Linseg(
-            list(zip(self.filter_q_envelope.times, self.filter_q_envelope.levels))
+            _get_envelope_points(self.filter_q_envelope, start)
         )
 
         waveguide = pyo.Waveguide(
@@ -85,7 +145,12 @@ class Resonator(object):
             mul=self.bandpass_mul,
         )
 
-        lfo = pyo.Sine(freq=self.pan_lfo_frequency, mul=0.5, add=0.5)
+        lfo = pyo.Sine(
+            freq=self.pan_lfo_frequency,
+            phase=(self.pan_lfo_frequency * start) % 1,
+            mul=0.5,
+            add=0.5,
+        )
         bandpass_pan = pyo.Pan(bandpass, outs=2, pan=lfo)
 
         filter_q_envelope.play()
@@ -98,3 +163,128 @@ class Resonator(object):
         (source * source_envelope).out()
 
         s.start()
+        # only one server can exist per process
+        s.shutdown()
+
+    def _get_segments(
+        self, segment_duration: float, crossfade_duration: float
+    ) -> typing.Tuple[typing.Tuple[str, float, float, float], ...]:
+        # (path, render start, start, end) of each segment: the waveguide
+        # needs to run 'waveguide_dur' seconds before the segment starts
+        # to reach the same state as in an uninterrupted render
+        duration = self._get_duration()
+        segments = []
+        for nth_segment, start in enumerate(np.arange(0, duration, segment_duration)):
+            segments.append(
+                (
+                    f"{self.output_path}/.{self.output_name}-segment{nth_segment}.wav",
+                    max(0, start - self.waveguide_dur),
+                    start,
+                    min(start + segment_duration + crossfade_duration, duration),
+                )
+            )
+        return tuple(segments)
+
+    def _render_segment(self, segment: typing.Tuple[str, float, float, float]):
+        path, render_start, _, end = segment
+        self._render(path, render_start, end - render_start)
+
+    def _concatenate_segments(
+        self, segments: typing.Sequence[typing.Tuple[str, float, float, float]]
+    ):
+        # the end of each segment is crossfaded with the start of the next
+        # segment (both have rendered the same audio)
+        with wave.open(self.complete_output_path, "wb") as output_file:
+            tail = None
+            for nth_segment, (path, render_start, start, _) in enumerate(segments):
+                with wave.open(path, "rb") as segment_file:
+                    if nth_segment == 0:
+                        output_file.setparams(segment_file.getparams())
+                    sampling_rate = segment_file.getframerate()
+                    samples = (
+                        np.frombuffer(
+                            segment_file.readframes(segment_file.getnframes()),
+                            dtype="<i2",
+                        )
+                        .reshape(-1, segment_file.getnchannels())
+                        .astype(float)
+                    )
+                os.remove(path)
+
+                samples = samples[int(round((start - render_start) * sampling_rate)) :]
+                if tail is not None:
+                    n_crossfade_frames = min(len(tail), len(samples))
+                    fade_in = np.linspace(0, 1, n_crossfade_frames, endpoint=False)[
+                        :, np.newaxis
+                    ]
+                    samples[:n_crossfade_frames] = (
+                        tail[:n_crossfade_frames] * (1 - fade_in)
+                    ) + (samples[:n_crossfade_frames] * fade_in)
+                if nth_segment + 1 < len(segments):
+                    # the end of the segment may be clipped by the end of the
+                    # source, so the tail starts where the next segment starts
+                    next_start = segments[nth_segment + 1][2]
+                    n_frames = int(round((next_start - start) * sampling_rate))
+                    tail = samples[n_frames:]
+                    samples = samples[:n_frames]
+                output_file.writeframes(
+                    np.clip(np.round(samples), -32768, 32767).astype("<i2").tobytes()
+                )
+
+    def render(self):
+        self._render(self.complete_output_path)
+
+    def render_in_segments(
+        self,
+        segment_duration: float = 120,
+        crossfade_duration: float = 1,
+        n_processes: typing.Optional[int] = None,
+    ):
+        """Render the resonated sound file in segments on multiple processes.
+
+        :param segment_duration: Duration of each segment in seconds.
+        :param crossfade_duration: How long the overlapping end of each
+            segment gets crossfaded with the start of the next segment.
+        :param n_processes: How many segments get rendered at the same
+            time (None means one process per CPU).
+
+        Each segment gets rendered by its own offline server. The envelopes
+        and the panning lfo start at the position of the segment and the
+        rendering starts 'waveguide_dur' seconds earlier (so that the
+        resonance of the previous segment is included).
+        """
+
+        segments = self._get_segments(segment_duration, crossfade_duration)
+        ot2_utilities.processes.map_in_processes(
+            self._render_segment, segments, n_processes
+        )
+        self._concatenate_segments(segments)
+
+
+def _render_resonator(resonator: Resonator):
+    resonator.render()
+
+
+def render_resonators(
+    resonators: typing.Iterable[
+        typing.Union[Resonator, typing.Tuple[str, typing.Sequence[float]]]
+    ],
+    n_processes: typing.Optional[int] = None,
+):
+    """Render many resonators at the same time (one process per resonator).
+
+    :param resonators: Either :class:`Resonator` objects or pairs of the path
+        of the source sound file and the frequencies (which are rendered
+        with the default arguments of :class:`Resonator`).
+    :param n_processes: How many resonators get rendered at the same time
+        (None means one process per CPU).
+    """
+
+    ot2_utilities.processes.map_in_processes(
+        _render_resonator,
+        (
+            resonator if isinstance(resonator, Resonator) else Resonator(*resonator)
+            for resonator in resonators
+        ),
+        n_processes,
+    )
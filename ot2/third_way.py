@@ -1,17 +1,31 @@
 import math
+import pathlib
 
 import progressbar
 
 from mutwo import events
-from mutwo import utilities
 
 from ot2 import constants
+from ot2 import converters
+from ot2 import events as ot2_events
 from ot2 import third_way_constants
+from ot2 import utilities as ot2_utilities
 
 
-@utilities.decorators.compute_lazy(
+@ot2_utilities.decorators.compute_lazy(
     "ot2/constants/.timeBracketsThirdWay.pickle",
+    dependencies=lambda: (
+        third_way_constants,
+        converters.symmetrical,
+        ot2_events,
+        constants.compute.BATCH_CURVE_AND_WEIGHT_ASSIGNMENT,
+        constants.duration,
+        constants.instruments,
+        constants.tendencies_and_choices,
+        pathlib.Path(constants.families_pitch.FAMILIES_PITCH_PATH),
+    ),
     force_to_compute=constants.compute.COMPUTE_THE_THIRD_WAY,
+    pickle_module=ot2_utilities.serialization,
 )
 def main() -> tuple[tuple[tuple[str, ...], events.time_brackets.TimeBracket], ...]:
     time_bracket_factory = third_way_constants.TIME_BRACKET_FACTORY
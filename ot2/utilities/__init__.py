@@ -1 +1,7 @@
+from . import decorators
 from . import exceptions
+from . import lilypond
+from . import processes
+from . import profiling
+from . import serialization
+from . import tasks
@@ -0,0 +1,147 @@
+"""Decorators which are used within the ot2 package."""
+
+import functools
+import hashlib
+import inspect
+import os
+import pathlib
+import pickle
+import types
+import typing
+
+
+Dependencies = typing.Union[
+    typing.Sequence[typing.Any], typing.Callable[[], typing.Sequence[typing.Any]]
+]
+
+
+def _get_source_paths_of_module(module: types.ModuleType) -> typing.Tuple[str, ...]:
+    module_path = module.__file__
+    # for packages hash all python files of the package
+    if os.path.basename(module_path) == "__init__.py":
+        source_paths = []
+        for directory, directory_names, file_names in os.walk(
+            os.path.dirname(module_path)
+        ):
+            directory_names.sort()
+            for file_name in sorted(file_names):
+                if file_name.endswith(".py"):
+                    source_paths.append(os.path.join(directory, file_name))
+        return tuple(source_paths)
+    return (module_path,)
+
+
+def _read_file(path: typing.Union[str, pathlib.Path]) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _dependency_to_bytes(dependency: typing.Any) -> bytes:
+    if isinstance(dependency, types.ModuleType):
+        return b"".join(
+            _read_file(source_path)
+            for source_path in _get_source_paths_of_module(dependency)
+        )
+    elif isinstance(dependency, (type, types.FunctionType, types.MethodType)):
+        return inspect.getsource(dependency).encode()
+    elif isinstance(dependency, pathlib.Path):
+        if dependency.exists():
+            return _read_file(dependency)
+        return str(dependency).encode()
+    else:
+        return pickle.dumps(dependency)
+
+
+def hash_dependencies(*dependency: typing.Any) -> str:
+    """Make hash from the source code / the content of the dependencies.
+
+    :param dependency: Modules (and packages) and classes or functions
+        get hashed by their source code, :class:`pathlib.Path` objects get
+        hashed by the content of the file they point to and any other object
+        gets hashed by its pickled representation.
+    """
+
+    hash_object = hashlib.sha256()
+    for single_dependency in dependency:
+        hash_object.update(_dependency_to_bytes(single_dependency))
+    return hash_object.hexdigest()
+
+
+def compute_lazy(
+    path: str,
+    dependencies: Dependencies = tuple([]),
+    force_to_compute: bool = False,
+    pickle_module: typing.Optional[types.ModuleType] = None,
+):
+    """Cache result of decorated function and recompute it if its input changed.
+
+    :param path: The path where the pickled result shall be saved.
+    :param dependencies: Everything the result of the decorated function
+        depends on (constants modules, converter classes, seeds, data files).
+        Can also be a function without arguments which returns the
+        dependencies (for dependencies which only exist when the decorated
+        function gets called).
+    :param force_to_compute: Recompute the result even if the hash didn't
+        change.
+    :param pickle_module: Module with 'dump' and 'load' function. Default
+        to :mod:`pickle`.
+
+    In contrast to :func:`mutwo.utilities.decorators.compute_lazy` the
+    cached result doesn't only get reused if the file exists, but only if
+    the hash of the dependencies, of the source code of the decorated
+    function and of its arguments equals the hash of the previous
+    computation. The hash is saved in a separate file next to the pickle
+    file (with the suffix '.hash').
+    """
+
+    if not pickle_module:
+        pickle_module = pickle
+
+    hash_path = f"{path}.hash"
+
+    def decorator(function_to_decorate: typing.Callable):
+        @functools.wraps(function_to_decorate)
+        def wrapper(*args, **kwargs):
+            if callable(dependencies):
+                resolved_dependencies = tuple(dependencies())
+            else:
+                resolved_dependencies = tuple(dependencies)
+
+            current_hash = hash_dependencies(
+                function_to_decorate, args, kwargs, *resolved_dependencies
+            )
+
+            try:
+                with open(hash_path, "r") as f:
+                    previous_hash = f.read()
+            except FileNotFoundError:
+                previous_hash = None
+
+            if (
+                force_to_compute
+                or previous_hash != current_hash
+                or not os.path.exists(path)
+            ):
+                result = function_to_decorate(*args, **kwargs)
+                # replace the file instead of overwriting it, because
+                # previously loaded results may still be memory mapped
+                # (see :mod:`ot2.utilities.serialization`)
+                temporary_path = f"{path}.tmp"
+                with open(temporary_path, "wb") as f:
+                    pickle_module.dump(result, f)
+                os.replace(temporary_path, path)
+                with open(hash_path, "w") as f:
+                    f.write(current_hash)
+                # a fresh computation returns the same type as a cache hit
+                # (e.g. a LazySequence of ot2.utilities.serialization
+                # instead of the computed tuple)
+                if pickle_module is pickle:
+                    return result
+
+            with open(path, "rb") as f:
+                result = pickle_module.load(f)
+            return result
+
+        return wrapper
+
+    return decorator
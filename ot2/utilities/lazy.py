@@ -0,0 +1,42 @@
+"""Lazily evaluated module level constants.
+
+Some constants of ot2 are expensive to build (they unpickle big files or
+run a search). To avoid paying for them on import, a module can define
+them via :func:`make_module_getattr`:
+
+    __getattr__ = lazy.make_module_getattr(
+        __name__, {"FAMILY_PITCH": _make_family_pitch}
+    )
+
+The function which belongs to a constant only gets called on the first
+access of the constant (see PEP 562). Afterwards the result is saved as a
+normal attribute of the module, so that later accesses are as fast as
+before.
+"""
+
+import sys
+import typing
+
+
+def make_module_getattr(
+    module_name: str, name_to_factory: typing.Dict[str, typing.Callable[[], typing.Any]]
+) -> typing.Callable[[str], typing.Any]:
+    """Make module level '__getattr__' which builds the constants on demand.
+
+    :param module_name: The '__name__' of the module.
+    :param name_to_factory: Maps the name of each lazy constant to a function
+        without arguments which returns the value of the constant.
+    """
+
+    def __getattr__(name: str) -> typing.Any:
+        try:
+            factory = name_to_factory[name]
+        except KeyError:
+            raise AttributeError(
+                f"module '{module_name}' has no attribute '{name}'"
+            ) from None
+        value = factory()
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    return __getattr__
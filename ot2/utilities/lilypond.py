@@ -0,0 +1,94 @@
+"""Compile LilyPond sources block by block and reuse unchanged blocks.
+
+Each block is saved as '<hash of its source>.ly' and compiled to
+'<hash of its source>.pdf' in a cache directory. Only sources without a
+pdf get compiled (by parallel LilyPond processes); afterwards the pdfs of
+all blocks are merged to one file.
+"""
+
+import concurrent.futures
+import hashlib
+import os
+import subprocess
+import typing
+
+from PyPDF2 import PdfFileMerger
+
+from . import profiling
+
+
+def get_digest(lilypond_source: str) -> str:
+    return hashlib.sha256(lilypond_source.encode("utf-8")).hexdigest()
+
+
+def _compile(ly_path: str):
+    output_path = ly_path[: -len(".ly")]
+    try:
+        subprocess.run(
+            ["lilypond", "-o", output_path, ly_path],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+    except subprocess.CalledProcessError as error:
+        message = (
+            f"LilyPond failed to compile '{ly_path}':\n"
+            f"{error.output.decode('utf-8', errors='replace')}"
+        )
+        raise RuntimeError(message) from None
+
+
+def compile_blocks(
+    lilypond_sources: typing.Sequence[str],
+    directory: str,
+    pdf_path: str,
+    n_processes: typing.Optional[int] = None,
+    remove_unused_blocks: bool = True,
+) -> int:
+    """Compile LilyPond sources and merge the resulting pdfs.
+
+    :param lilypond_sources: The content of each LilyPond file (e.g. one
+        per score block) in the order in which they get merged.
+    :param directory: Where the compiled blocks are cached.
+    :param pdf_path: Where the merged pdf gets saved.
+    :param n_processes: How many LilyPond processes can run at the same
+        time (None means one process per CPU).
+    :param remove_unused_blocks: Remove the cached files of blocks which
+        aren't part of 'lilypond_sources'.
+
+    Returns how many blocks have been compiled.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    digests = tuple(map(get_digest, lilypond_sources))
+
+    ly_paths_to_compile = []
+    for digest, lilypond_source in dict(zip(digests, lilypond_sources)).items():
+        if os.path.exists(f"{directory}/{digest}.pdf"):
+            continue
+        ly_path = f"{directory}/{digest}.ly"
+        with open(ly_path, "w") as f:
+            f.write(lilypond_source)
+        ly_paths_to_compile.append(ly_path)
+
+    # the work happens in the LilyPond processes, therefore threads are
+    # enough for starting them
+    with profiling.span(f"lilypond {len(ly_paths_to_compile)} blocks", "lilypond"):
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=n_processes or os.cpu_count()
+        ) as executor:
+            tuple(executor.map(_compile, ly_paths_to_compile))
+
+    merger = PdfFileMerger()
+    for digest in digests:
+        merger.append(f"{directory}/{digest}.pdf")
+    merger.write(pdf_path)
+    merger.close()
+
+    if remove_unused_blocks:
+        used_digests = set(digests)
+        for file_name in os.listdir(directory):
+            if file_name.split(".")[0] not in used_digests:
+                os.remove(f"{directory}/{file_name}")
+
+    return len(ly_paths_to_compile)
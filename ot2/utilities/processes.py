@@ -0,0 +1,75 @@
+"""Helper for distributing independent computations on multiple processes."""
+
+import concurrent.futures
+import multiprocessing
+import typing
+
+from . import profiling
+
+
+def _call_and_pop_spans(
+    function: typing.Callable[[typing.Any], typing.Any], argument: typing.Any
+) -> typing.Tuple[typing.Any, typing.Tuple[profiling.Span, ...]]:
+    # forget the spans which have been inherited from the main process
+    profiling.pop_spans()
+    result = function(argument)
+    return result, profiling.pop_spans()
+
+
+def iterate_in_processes(
+    function: typing.Callable[[typing.Any], typing.Any],
+    arguments: typing.Iterable[typing.Any],
+    n_processes: typing.Optional[int] = None,
+) -> typing.Iterator[typing.Tuple[int, typing.Any]]:
+    """Call function with each argument in a process pool.
+
+    :param function: Module level function which gets called with one
+        argument.
+    :param arguments: The arguments for each call.
+    :param n_processes: How many processes shall be used. If set to 1
+        everything runs in the current process. If set to None the number
+        of CPUs is used.
+
+    Yields pairs of the index of the argument and the result as soon as a
+    call has finished (e.g. for updating a progress bar). The processes are
+    started with 'fork', so that they inherit the already computed module
+    level constants (e.g. 'FAMILY_PITCH') instead of importing them again.
+    If profiling is enabled the spans which have been recorded in the
+    worker processes get added to the spans of the main process.
+    """
+
+    arguments = tuple(arguments)
+    if n_processes == 1 or len(arguments) < 2:
+        for index, argument in enumerate(arguments):
+            yield index, function(argument)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=n_processes, mp_context=multiprocessing.get_context("fork")
+    ) as executor:
+        future_to_index = {
+            executor.submit(_call_and_pop_spans, function, argument): index
+            for index, argument in enumerate(arguments)
+        }
+        for future in concurrent.futures.as_completed(future_to_index):
+            result, spans = future.result()
+            profiling.add_spans(spans)
+            yield future_to_index[future], result
+
+
+def map_in_processes(
+    function: typing.Callable[[typing.Any], typing.Any],
+    arguments: typing.Iterable[typing.Any],
+    n_processes: typing.Optional[int] = None,
+) -> typing.Tuple[typing.Any, ...]:
+    """Call function with each argument in a process pool.
+
+    Equal to :func:`iterate_in_processes`, but the results are returned in
+    the same order as the arguments after all calls have finished.
+    """
+
+    arguments = tuple(arguments)
+    results = [None for _ in arguments]
+    for index, result in iterate_in_processes(function, arguments, n_processes):
+        results[index] = result
+    return tuple(results)
@@ -0,0 +1,325 @@
+"""Hierarchical timing of the build stages.
+
+Stages and sub stages get wrapped by :func:`span`. For each span the wall
+time, the cpu time and the maximum resident set size are recorded. The
+maximum resident set size ('ru_maxrss') is the high-water mark of the
+whole process and not of the span: 'max_rss_of_process' is only an upper
+bound of the memory which the span used. If 'max_rss_increase' is above
+0, the span raised the high-water mark and used exactly
+'max_rss_of_process' at its peak. The recorded spans can be written to a
+trace file in the Chrome trace format (for 'chrome://tracing' or
+'https://ui.perfetto.dev') or in the speedscope format (for
+'https://www.speedscope.app').
+
+Spans are only recorded after :func:`enable` has been called. Otherwise
+:func:`span` does nothing, so that the instrumentation doesn't slow down
+a normal build.
+"""
+
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import re
+import resource
+import threading
+import time
+import typing
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+Span = typing.Dict[str, typing.Any]
+
+_IS_ENABLED = False
+_PROFILER: typing.Optional[str] = None
+_PROFILE_DIRECTORY: typing.Optional[str] = None
+# only one profiler can run at the same time
+_IS_PROFILING = False
+_START_TIME_IN_NANOSECONDS = time.perf_counter_ns()
+_DEPTH = 0
+_SPANS: typing.List[Span] = []
+
+
+def enable(
+    profiler: typing.Optional[str] = None,
+    profile_directory: str = "builds/profiles",
+):
+    """Start recording spans.
+
+    :param profiler: If set to 'cprofile' or 'pyinstrument' each span which
+        has been created with 'profile=True' also gets profiled. The
+        'pyinstrument' profiler is an optional dependency.
+    :param profile_directory: Where the profiles get saved. cProfile writes
+        '.prof' files (for 'snakeviz' or 'pstats'), pyinstrument writes
+        '.html' files.
+    """
+
+    global _IS_ENABLED, _PROFILER, _PROFILE_DIRECTORY, _START_TIME_IN_NANOSECONDS
+
+    if profiler is not None and profiler not in PROFILERS:
+        raise ValueError(
+            f"Unknown profiler '{profiler}'. Choose one of {PROFILERS}."
+        )
+
+    _IS_ENABLED = True
+    _PROFILER = profiler
+    _PROFILE_DIRECTORY = profile_directory
+    _START_TIME_IN_NANOSECONDS = time.perf_counter_ns()
+
+
+def is_enabled() -> bool:
+    return _IS_ENABLED
+
+
+def _get_time_in_microseconds() -> float:
+    return (time.perf_counter_ns() - _START_TIME_IN_NANOSECONDS) / 1000
+
+
+def _get_max_rss_of_process_in_kilobytes() -> int:
+    # on linux 'ru_maxrss' is given in kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _name_to_file_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+
+
+@contextlib.contextmanager
+def _profile(name: str):
+    global _IS_PROFILING
+
+    if _PROFILER is None or _IS_PROFILING:
+        yield
+        return
+
+    os.makedirs(_PROFILE_DIRECTORY, exist_ok=True)
+    path = f"{_PROFILE_DIRECTORY}/{_name_to_file_name(name)}"
+    _IS_PROFILING = True
+    try:
+        if _PROFILER == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                profiler.dump_stats(f"{path}.prof")
+        else:
+            import pyinstrument
+
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(f"{path}.html", "w") as f:
+                    f.write(profiler.output_html())
+    finally:
+        _IS_PROFILING = False
+
+
+@contextlib.contextmanager
+def _record(name: str, category: str, profile: bool):
+    global _DEPTH
+
+    start_time = _get_time_in_microseconds()
+    start_cpu_time = time.process_time()
+    start_max_rss = _get_max_rss_of_process_in_kilobytes()
+    _DEPTH += 1
+    try:
+        if profile:
+            with _profile(name):
+                yield
+        else:
+            yield
+    finally:
+        _DEPTH -= 1
+        max_rss = _get_max_rss_of_process_in_kilobytes()
+        _SPANS.append(
+            {
+                "name": name,
+                "category": category,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "depth": _DEPTH,
+                "start": start_time,
+                "duration": _get_time_in_microseconds() - start_time,
+                "cpu_time": time.process_time() - start_cpu_time,
+                "max_rss_of_process": max_rss,
+                "max_rss_increase": max_rss - start_max_rss,
+            }
+        )
+
+
+def span(name: str, category: str = "stage", profile: bool = False):
+    """Record wall time, cpu time and maximum resident set size of a stage.
+
+    :param name: Name of the span (e.g. 'register' or 'cengkok part 3').
+    :param category: Category of the span (e.g. 'stage', 'render' or
+        'lilypond').
+    :param profile: Also profile the span if a profiler has been set in
+        :func:`enable`. Nested spans don't get profiled again.
+
+    Use as a context manager (see :func:`spanned` for a decorator).
+    """
+
+    if not _IS_ENABLED:
+        return contextlib.nullcontext()
+    return _record(name, category, profile)
+
+
+def spanned(name: str, category: str = "stage", profile: bool = False):
+    """Decorator version of :func:`span`."""
+
+    def decorator(function_to_decorate: typing.Callable):
+        @functools.wraps(function_to_decorate)
+        def wrapper(*args, **kwargs):
+            with span(name, category, profile):
+                return function_to_decorate(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def pop_spans() -> typing.Tuple[Span, ...]:
+    """Return all recorded spans and forget them.
+
+    This is used to send the spans of a worker process to the main process.
+    """
+
+    spans = tuple(_SPANS)
+    _SPANS.clear()
+    return spans
+
+
+def add_spans(spans: typing.Iterable[Span]):
+    """Add spans which have been recorded in another process."""
+
+    _SPANS.extend(spans)
+
+
+def get_spans() -> typing.Tuple[Span, ...]:
+    return tuple(sorted(_SPANS, key=lambda span: (span["start"], -span["duration"])))
+
+
+def to_chrome_trace(spans: typing.Sequence[Span]) -> typing.Dict[str, typing.Any]:
+    return {
+        "traceEvents": [
+            {
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": span["start"],
+                "dur": span["duration"],
+                "pid": span["pid"],
+                "tid": span["tid"],
+                "args": {
+                    "cpu_time_in_seconds": span["cpu_time"],
+                    "max_rss_of_process_in_kilobytes": span["max_rss_of_process"],
+                    "max_rss_increase_in_kilobytes": span["max_rss_increase"],
+                },
+            }
+            for span in spans
+        ],
+        "displayTimeUnit": "ms",
+    }
+
+
+def to_speedscope(spans: typing.Sequence[Span]) -> typing.Dict[str, typing.Any]:
+    frame_names = []
+    name_to_frame_index = {}
+    spans_per_thread = {}
+    for span in spans:
+        if span["name"] not in name_to_frame_index:
+            name_to_frame_index.update({span["name"]: len(frame_names)})
+            frame_names.append(span["name"])
+        spans_per_thread.setdefault((span["pid"], span["tid"]), []).append(span)
+
+    profiles = []
+    for (pid, tid), thread_spans in spans_per_thread.items():
+        # speedscope expects properly nested open and close events
+        events, open_spans = [], []
+
+        def close_spans_until(time_to_close: float):
+            while open_spans and (
+                open_spans[-1]["start"] + open_spans[-1]["duration"] <= time_to_close
+            ):
+                closed_span = open_spans.pop()
+                events.append(
+                    {
+                        "type": "C",
+                        "frame": name_to_frame_index[closed_span["name"]],
+                        "at": closed_span["start"] + closed_span["duration"],
+                    }
+                )
+
+        for span in thread_spans:
+            close_spans_until(span["start"])
+            events.append(
+                {
+                    "type": "O",
+                    "frame": name_to_frame_index[span["name"]],
+                    "at": span["start"],
+                }
+            )
+            open_spans.append(span)
+        close_spans_until(float("inf"))
+
+        profiles.append(
+            {
+                "type": "evented",
+                "name": f"process {pid} / thread {tid}",
+                "unit": "microseconds",
+                "startValue": thread_spans[0]["start"],
+                "endValue": max(event["at"] for event in events),
+                "events": events,
+            }
+        )
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": [{"name": name} for name in frame_names]},
+        "profiles": profiles,
+        "name": "ot2 build",
+        "exporter": "ot2.utilities.profiling",
+    }
+
+
+def write_trace(path: str, trace_format: str = "chrome"):
+    """Write all recorded spans to a trace file.
+
+    :param path: Where to write the trace.
+    :param trace_format: 'chrome' or 'speedscope'.
+    """
+
+    spans = get_spans()
+    if trace_format == "chrome":
+        trace = to_chrome_trace(spans)
+    elif trace_format == "speedscope":
+        trace = to_speedscope(spans)
+    else:
+        raise ValueError(f"Unknown trace format '{trace_format}'.")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(trace, f)
+
+
+def print_summary(maximum_depth: int = 1):
+    """Print wall time, cpu time and maximum resident set size of the stages."""
+
+    main_pid = os.getpid()
+    for span in get_spans():
+        if span["depth"] <= maximum_depth and span["pid"] == main_pid:
+            print(
+                f"{'    ' * span['depth']}{span['name']}:"
+                f" {span['duration'] / 1e6:.2f}s WALL,"
+                f" {span['cpu_time']:.2f}s CPU,"
+                f" {span['max_rss_of_process'] / 1024:.0f}MB MAX RSS OF PROCESS"
+                f" (+{span['max_rss_increase'] / 1024:.0f}MB)"
+            )
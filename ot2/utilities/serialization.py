@@ -0,0 +1,544 @@
+"""Columnar file format for the cached time brackets and events.
+
+The results of :func:`ot2.utilities.decorators.compute_lazy` are mostly
+long sequences of time brackets: deep trees of events, which contain
+thousands of fraction durations (:class:`quicktions.Fraction` and
+:class:`fractions.Fraction`) and just intonation pitches. Unpickling those objects one by one dominates the time of a warm
+start. This module writes them in a flat format instead:
+
+    - all fractions are saved in two integer columns (numerators and
+      denominators) and one column for their type,
+    - the exponents of all pitches are saved in one integer column
+      (with a second column for the offsets of each pitch),
+    - the remaining structure of each item of the sequence (e.g. of each
+      time bracket) is saved as its own small pickle, which only refers
+      to the rows of the columns.
+
+The file can optionally be compressed (with :mod:`zlib`). Uncompressed
+files get memory mapped. :func:`load` only reads the header of the file
+and returns a :class:`LazySequence`, which rebuilds each item only when
+it gets accessed the first time.
+
+Use the module as 'pickle_module' for
+:func:`ot2.utilities.decorators.compute_lazy`. Files which have been
+written by :mod:`pickle` can still be loaded.
+"""
+
+import collections.abc
+import fractions
+import hashlib
+import io
+import mmap
+import pickle
+import struct
+import typing
+import zlib
+
+import numpy as np
+import quicktions
+
+MAGIC = b"OT2COL01"
+
+# a zlib compression level between 1 and 9, or 0 for no compression
+DEFAULT_COMPRESSION_LEVEL = 0
+
+_ALIGNMENT = 64
+_HEADER_OFFSET_FORMAT = "<Q"
+_INT64_BOUNDS = (-(2 ** 63), 2 ** 63 - 1)
+
+# maps pitch classes to the name of the attribute which stores the
+# exponents (or to None if the pitches of the class can't be columnized)
+_PITCH_CLASS_TO_EXPONENTS_ATTRIBUTE_NAME: typing.Dict[
+    type, typing.Optional[str]
+] = {}
+
+
+def _has_slots(pitch_class: type) -> bool:
+    # abstract base classes define empty slots, which don't prevent an
+    # instance '__dict__'
+    return any(klass.__dict__.get("__slots__") for klass in pitch_class.__mro__)
+
+
+def _find_exponents_attribute_name(
+    pitch_class: type, pitch: typing.Any
+) -> typing.Optional[str]:
+    if (
+        not hasattr(pitch_class, "exponents")
+        or _has_slots(pitch_class)
+        or hasattr(pitch_class, "__setstate__")
+        or pitch_class.__reduce_ex__ is not object.__reduce_ex__
+        or pitch_class.__reduce__ is not object.__reduce__
+        or not hasattr(pitch, "__dict__")
+    ):
+        return None
+    exponents = tuple(pitch.exponents)
+    for attribute_name, value in vars(pitch).items():
+        if isinstance(value, (tuple, list)) and tuple(value) == exponents:
+            return attribute_name
+    return None
+
+
+def _get_exponents_attribute_name(pitch: typing.Any) -> typing.Optional[str]:
+    pitch_class = type(pitch)
+    try:
+        attribute_name = _PITCH_CLASS_TO_EXPONENTS_ATTRIBUTE_NAME[pitch_class]
+    except KeyError:
+        attribute_name = _find_exponents_attribute_name(pitch_class, pitch)
+        _PITCH_CLASS_TO_EXPONENTS_ATTRIBUTE_NAME.update({pitch_class: attribute_name})
+    if attribute_name is None:
+        return None
+    exponents = vars(pitch).get(attribute_name)
+    if isinstance(exponents, (tuple, list)) and all(
+        type(exponent) is int for exponent in exponents
+    ):
+        return attribute_name
+    return None
+
+
+# The fractions are saved with normalized numerators and denominators,
+# therefore they can be rebuilt without calling the (slow) constructor of
+# Fraction, which would normalize them again.
+def _make_fraction(numerator: int, denominator: int) -> fractions.Fraction:
+    fraction = object.__new__(fractions.Fraction)
+    fraction._numerator = numerator
+    fraction._denominator = denominator
+    return fraction
+
+
+# the index of a fraction type is saved in the 'fraction_types' column
+# (quicktions.Fraction is an extension type, which is rebuilt with its
+# own, fast constructor)
+_FRACTION_TYPES = (fractions.Fraction, quicktions.Fraction)
+_FRACTION_TYPE_TO_INDEX = {
+    fraction_type: index for index, fraction_type in enumerate(_FRACTION_TYPES)
+}
+_FRACTION_MAKERS = (_make_fraction, quicktions.Fraction)
+
+
+def _rebuild_pitch(
+    pitch_class: type,
+    attribute_name: str,
+    exponents: typing.Tuple[int, ...],
+    is_list: bool,
+    state: typing.Dict[str, typing.Any],
+) -> typing.Any:
+    pitch = pitch_class.__new__(pitch_class)
+    pitch.__dict__.update(state)
+    pitch.__dict__[attribute_name] = list(exponents) if is_list else exponents
+    return pitch
+
+
+class _ExponentsReference(object):
+    def __init__(self, index: int):
+        self.index = index
+
+
+class _Encoder(object):
+    """Split items into pickled structure and numeric columns."""
+
+    def __init__(self):
+        self.numerators = []
+        self.denominators = []
+        self.fraction_types = []
+        self.exponents = []
+        self.exponent_offsets = [0]
+
+    def encode(self, item: typing.Any) -> typing.Tuple[bytes, typing.Dict[str, int]]:
+        fraction_start = len(self.numerators)
+        pitch_start = len(self.exponent_offsets) - 1
+        # equal fractions and exponents of one item are only saved once
+        fraction_to_index = {}
+        exponents_to_index = {}
+
+        encoder = self
+
+        class Pickler(pickle.Pickler):
+            # Fractions are replaced by their (positive) index in the
+            # fraction columns of the item, the exponents of pitches by their
+            # negative index in the exponents column, so that the loader can
+            # resolve both with one list lookup.
+            def persistent_id(self, object_to_pickle: typing.Any) -> typing.Any:
+                object_type = type(object_to_pickle)
+                if object_type in _FRACTION_TYPE_TO_INDEX:
+                    # equal fractions of different types have the same hash
+                    fraction_key = (object_type, object_to_pickle)
+                    try:
+                        return fraction_to_index[fraction_key]
+                    except KeyError:
+                        pass
+                    numerator = object_to_pickle.numerator
+                    denominator = object_to_pickle.denominator
+                    if (
+                        _INT64_BOUNDS[0] <= numerator <= _INT64_BOUNDS[1]
+                        and denominator <= _INT64_BOUNDS[1]
+                    ):
+                        encoder.numerators.append(numerator)
+                        encoder.denominators.append(denominator)
+                        encoder.fraction_types.append(
+                            _FRACTION_TYPE_TO_INDEX[object_type]
+                        )
+                        index = len(encoder.numerators) - fraction_start - 1
+                        fraction_to_index.update({fraction_key: index})
+                        return index
+                elif object_type is _ExponentsReference:
+                    return -object_to_pickle.index - 1
+                return None
+
+            # pitches are pickled like normal objects (so that shared pitches
+            # stay shared after loading), only without their exponents
+            def reducer_override(self, object_to_pickle: typing.Any) -> typing.Any:
+                attribute_name = _get_exponents_attribute_name(object_to_pickle)
+                if attribute_name is None:
+                    return NotImplemented
+
+                state = dict(vars(object_to_pickle))
+                exponents = state.pop(attribute_name)
+                exponents_key = tuple(exponents)
+                try:
+                    index = exponents_to_index[exponents_key]
+                except KeyError:
+                    encoder.exponents.extend(exponents)
+                    encoder.exponent_offsets.append(len(encoder.exponents))
+                    index = len(encoder.exponent_offsets) - pitch_start - 2
+                    exponents_to_index.update({exponents_key: index})
+                return (
+                    _rebuild_pitch,
+                    (
+                        type(object_to_pickle),
+                        attribute_name,
+                        _ExponentsReference(index),
+                        type(exponents) is list,
+                        state,
+                    ),
+                )
+
+        buffer = io.BytesIO()
+        Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(item)
+        return (
+            buffer.getvalue(),
+            {
+                "fraction_start": fraction_start,
+                "fraction_stop": len(self.numerators),
+                "pitch_start": pitch_start,
+                "pitch_stop": len(self.exponent_offsets) - 1,
+            },
+        )
+
+    def get_digest(self, data: bytes, segment: typing.Dict[str, int]) -> str:
+        """Hash of the content of one item (its structure and its numbers)."""
+
+        exponent_offsets = self.exponent_offsets[
+            segment["pitch_start"] : segment["pitch_stop"] + 1
+        ]
+        hash_object = hashlib.sha256(data)
+        for column, dtype in (
+            (
+                self.numerators[segment["fraction_start"] : segment["fraction_stop"]],
+                np.int64,
+            ),
+            (
+                self.denominators[
+                    segment["fraction_start"] : segment["fraction_stop"]
+                ],
+                np.int64,
+            ),
+            (
+                self.fraction_types[
+                    segment["fraction_start"] : segment["fraction_stop"]
+                ],
+                np.int8,
+            ),
+            (self.exponents[exponent_offsets[0] : exponent_offsets[-1]], np.int32),
+            (np.diff(exponent_offsets), np.int64),
+        ):
+            hash_object.update(np.asarray(column, dtype=dtype).tobytes())
+        return hash_object.hexdigest()
+
+    def get_columns(self) -> typing.Dict[str, np.ndarray]:
+        return {
+            "numerators": np.array(self.numerators, dtype=np.int64),
+            "denominators": np.array(self.denominators, dtype=np.int64),
+            "fraction_types": np.array(self.fraction_types, dtype=np.int8),
+            "exponents": np.array(self.exponents, dtype=np.int32),
+            "exponent_offsets": np.array(self.exponent_offsets, dtype=np.int64),
+        }
+
+
+class _Decoder(object):
+    """Rebuild single items from the memory mapped (or read) file."""
+
+    def __init__(self, buffer: typing.Any, header: typing.Dict[str, typing.Any]):
+        self._buffer = buffer
+        self._segments = header["segments"]
+        self._compression_level = header["compression_level"]
+        self._columns = {
+            name: self._read_column(*column_description)
+            for name, column_description in header["columns"].items()
+        }
+
+    def _read_bytes(self, offset: int, n_bytes: int) -> bytes:
+        data = self._buffer[offset : offset + n_bytes]
+        if self._compression_level:
+            return zlib.decompress(data)
+        return data
+
+    def _read_column(
+        self, dtype: str, n_items: int, offset: int, n_bytes: int
+    ) -> np.ndarray:
+        if self._compression_level:
+            return np.frombuffer(self._read_bytes(offset, n_bytes), dtype=dtype)
+        return np.frombuffer(self._buffer, dtype=dtype, count=n_items, offset=offset)
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def get_metadata(self, index: int) -> typing.Any:
+        return self._segments[index]["metadata"]
+
+    def get_digest(self, index: int) -> str:
+        return self._segments[index]["digest"]
+
+    def _get_persistent_objects(self, segment: typing.Dict[str, int]) -> list:
+        fraction_start, fraction_stop = (
+            segment["fraction_start"],
+            segment["fraction_stop"],
+        )
+        numerators = self._columns["numerators"][fraction_start:fraction_stop].tolist()
+        denominators = self._columns["denominators"][
+            fraction_start:fraction_stop
+        ].tolist()
+        # files without type column only contain fractions.Fraction
+        fraction_types = self._columns.get("fraction_types")
+        fraction_types = (
+            set([])
+            if fraction_types is None
+            else set(fraction_types[fraction_start:fraction_stop].tolist())
+        )
+        if len(fraction_types) > 1:
+            persistent_objects = [
+                _FRACTION_MAKERS[fraction_type](numerator, denominator)
+                for fraction_type, numerator, denominator in zip(
+                    self._columns["fraction_types"][
+                        fraction_start:fraction_stop
+                    ].tolist(),
+                    numerators,
+                    denominators,
+                )
+            ]
+        else:
+            persistent_objects = list(
+                map(
+                    _FRACTION_MAKERS[fraction_types.pop() if fraction_types else 0],
+                    numerators,
+                    denominators,
+                )
+            )
+
+        exponent_offsets = self._columns["exponent_offsets"][
+            segment["pitch_start"] : segment["pitch_stop"] + 1
+        ]
+        exponents = self._columns["exponents"][
+            exponent_offsets[0] : exponent_offsets[-1]
+        ].tolist()
+        exponent_offsets = (exponent_offsets - exponent_offsets[0]).tolist()
+        # exponents get referred by negative indices
+        persistent_objects.extend(
+            tuple(exponents[start:end])
+            for start, end in zip(
+                reversed(exponent_offsets[:-1]), reversed(exponent_offsets[1:])
+            )
+        )
+        return persistent_objects
+
+    def decode(self, index: int) -> typing.Any:
+        segment = self._segments[index]
+        unpickler = pickle.Unpickler(
+            io.BytesIO(self._read_bytes(segment["offset"], segment["n_bytes"]))
+        )
+        unpickler.persistent_load = self._get_persistent_objects(segment).__getitem__
+        return unpickler.load()
+
+
+class LazySequence(collections.abc.Sequence):
+    """Sequence which only rebuilds its items when they get accessed.
+
+    Behaves like the tuple (or list) which has been saved with
+    :func:`dump`. Pickling a :class:`LazySequence` (e.g. for sending it to
+    another process) loads all items and pickles them as a normal tuple
+    (or list).
+    """
+
+    _NOT_LOADED = object()
+
+    def __init__(
+        self, decoder: _Decoder, sequence_type: type, metadata: typing.Any = None
+    ):
+        self._decoder = decoder
+        self._sequence_type = sequence_type
+        self.metadata = metadata
+        self._items = [self._NOT_LOADED] * len(decoder)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Any:
+        if isinstance(index, slice):
+            return self._sequence_type(
+                self[nth_item] for nth_item in range(*index.indices(len(self)))
+            )
+        item = self._items[index]
+        if item is self._NOT_LOADED:
+            item = self._items[index] = self._decoder.decode(
+                index if index >= 0 else len(self) + index
+            )
+        return item
+
+    def __repr__(self) -> str:
+        return f"LazySequence({self.n_loaded_items}/{len(self)} loaded items)"
+
+    def __reduce__(self) -> typing.Tuple[type, typing.Tuple[typing.Any]]:
+        return (self._sequence_type, (self._sequence_type(self),))
+
+    def is_loaded(self, index: int) -> bool:
+        return self._items[index] is not self._NOT_LOADED
+
+    def get_metadata(self, index: int) -> typing.Any:
+        """Metadata which has been saved for the item (see :func:`dump`).
+
+        Can be read without loading the item.
+        """
+
+        return self._decoder.get_metadata(index)
+
+    def get_digest(self, index: int) -> str:
+        """Hash of the content of the item. Doesn't load the item."""
+
+        return self._decoder.get_digest(index)
+
+    @property
+    def n_loaded_items(self) -> int:
+        return sum(item is not self._NOT_LOADED for item in self._items)
+
+
+def get_digest(item: typing.Any) -> str:
+    """Hash of the content of an item.
+
+    Equals :meth:`LazySequence.get_digest` of the item after it has been
+    saved with :func:`dump`.
+    """
+
+    encoder = _Encoder()
+    return encoder.get_digest(*encoder.encode(item))
+
+
+def _write_padding(f: typing.BinaryIO):
+    f.write(b"\0" * (-f.tell() % _ALIGNMENT))
+
+
+def dump(
+    object_to_save: typing.Any,
+    f: typing.BinaryIO,
+    compression_level: typing.Optional[int] = None,
+    get_metadata: typing.Optional[typing.Callable[[typing.Any], typing.Any]] = None,
+    metadata: typing.Any = None,
+):
+    """Save object in the columnar format.
+
+    :param object_to_save: Tuples and lists get saved item by item, so that
+        :func:`load` can rebuild each item separately. Other objects get
+        saved as one item.
+    :param f: Seekable binary file, which has been opened at its start.
+    :param compression_level: zlib compression level (1 - 9) or 0 for no
+        compression. Defaults to :const:`DEFAULT_COMPRESSION_LEVEL`.
+    :param get_metadata: Function which returns small picklable metadata
+        for each item (e.g. its tags and its time range). The metadata of
+        all items gets saved in the header of the file, so that it can be
+        read without loading the items (see
+        :meth:`LazySequence.get_metadata`).
+    :param metadata: Small picklable metadata for the complete sequence
+        (see :attr:`LazySequence.metadata`).
+    """
+
+    if compression_level is None:
+        compression_level = DEFAULT_COMPRESSION_LEVEL
+
+    if type(object_to_save) in (tuple, list):
+        sequence_type, items = type(object_to_save), object_to_save
+    else:
+        sequence_type, items = None, (object_to_save,)
+
+    def compress(data: bytes) -> bytes:
+        if compression_level:
+            return zlib.compress(data, compression_level)
+        return data
+
+    f.write(MAGIC)
+    f.write(struct.pack(_HEADER_OFFSET_FORMAT, 0))
+
+    encoder = _Encoder()
+    segments = []
+    for item in items:
+        data, segment = encoder.encode(item)
+        segment.update(
+            {
+                "digest": encoder.get_digest(data, segment),
+                "metadata": get_metadata(item) if get_metadata else None,
+            }
+        )
+        data = compress(data)
+        segment.update({"offset": f.tell(), "n_bytes": len(data)})
+        f.write(data)
+        segments.append(segment)
+
+    columns = {}
+    for name, column in encoder.get_columns().items():
+        _write_padding(f)
+        data = compress(column.tobytes())
+        columns.update(
+            {name: (column.dtype.str, len(column), f.tell(), len(data))}
+        )
+        f.write(data)
+
+    header_offset = f.tell()
+    pickle.dump(
+        {
+            "sequence_type": sequence_type,
+            "metadata": metadata,
+            "compression_level": compression_level,
+            "segments": segments,
+            "columns": columns,
+        },
+        f,
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    end = f.tell()
+    f.seek(len(MAGIC))
+    f.write(struct.pack(_HEADER_OFFSET_FORMAT, header_offset))
+    f.seek(end)
+
+
+def _read_buffer(f: typing.BinaryIO) -> typing.Any:
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, io.UnsupportedOperation, ValueError):
+        f.seek(0)
+        return f.read()
+
+
+def load(f: typing.BinaryIO) -> typing.Any:
+    """Load object which has been saved with :func:`dump` (or pickle).
+
+    Tuples and lists are returned as :class:`LazySequence`.
+    """
+
+    if f.read(len(MAGIC)) != MAGIC:
+        f.seek(0)
+        return pickle.load(f)
+
+    buffer = _read_buffer(f)
+    (header_offset,) = struct.unpack_from(_HEADER_OFFSET_FORMAT, buffer, len(MAGIC))
+    header = pickle.loads(buffer[header_offset:])
+    decoder = _Decoder(buffer, header)
+    if header["sequence_type"] is None:
+        return decoder.decode(0)
+    return LazySequence(decoder, header["sequence_type"], header["metadata"])
@@ -0,0 +1,264 @@
+"""Minimal declarative task graph with change driven rebuilds.
+
+Each :class:`Task` declares what it depends on (source code, data files,
+objects) and which files it writes. A :class:`TaskGraph` runs its tasks
+in the order of their upstream tasks, but skips each task which is up to
+date. For each task the build manifest (a JSON file) saves the hash of the
+dependencies and the modification times of the outputs of the last run.
+A task is outdated if
+
+    - it never ran before,
+    - the hash of its dependencies changed,
+    - one of its outputs is missing or has been changed by somebody else.
+
+Because the dependencies of a task get resolved after its upstream tasks
+ran, a task only reruns if the results of its upstream tasks which it
+actually uses have changed.
+"""
+
+import json
+import os
+import traceback
+import typing
+
+from . import decorators
+from . import processes
+from . import profiling
+
+
+class Task(object):
+    """One step of the build.
+
+    :param name: Unique name of the task.
+    :param function: Function without arguments which runs the task.
+    :param dependencies: Everything the result of the task depends on
+        (see :func:`ot2.utilities.decorators.hash_dependencies`). Can also be
+        a function without arguments which returns the dependencies.
+    :param upstream: Names of tasks which have to run before this task.
+    :param outputs: Paths of the files which the task writes. Can also be
+        a function without arguments which returns the paths (e.g. if the
+        written files depend on the data). The function gets called before
+        and after the task ran.
+    :param load: Function without arguments which gets called instead of
+        'function' if the task is up to date (e.g. for loading the cached
+        result of the task, which later tasks need).
+    :param parallel: If True, the task can run in a worker process together
+        with other parallel tasks which don't depend on each other. The
+        'function' of parallel tasks has to be picklable.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        function: typing.Callable[[], typing.Any],
+        dependencies: decorators.Dependencies = tuple([]),
+        upstream: typing.Sequence[str] = tuple([]),
+        outputs: typing.Union[
+            typing.Sequence[str], typing.Callable[[], typing.Sequence[str]]
+        ] = tuple([]),
+        load: typing.Optional[typing.Callable[[], typing.Any]] = None,
+        parallel: bool = False,
+    ):
+        self.name = name
+        self.function = function
+        self.dependencies = dependencies
+        self.upstream = tuple(upstream)
+        self._outputs = outputs if callable(outputs) else tuple(outputs)
+        self.load = load
+        self.parallel = parallel
+
+    def __repr__(self) -> str:
+        return f"Task({self.name})"
+
+    @property
+    def outputs(self) -> typing.Tuple[str, ...]:
+        if callable(self._outputs):
+            return tuple(self._outputs())
+        return self._outputs
+
+    def get_hash(self) -> str:
+        if callable(self.dependencies):
+            dependencies = tuple(self.dependencies())
+        else:
+            dependencies = tuple(self.dependencies)
+        return decorators.hash_dependencies(self.name, *dependencies)
+
+
+def _call(function: typing.Callable[[], typing.Any]) -> typing.Optional[str]:
+    # the other parallel tasks keep running if one task fails, so that the
+    # tasks which succeeded can be saved in the manifest (the traceback is
+    # returned as a string, because not every exception can be pickled)
+    try:
+        function()
+    except Exception:
+        return traceback.format_exc()
+
+
+def _get_modification_time(path: str) -> typing.Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return None
+
+
+class TaskGraph(object):
+    """Run tasks and skip the tasks which are up to date.
+
+    :param tasks: The tasks of the graph.
+    :param manifest_path: Where the build manifest gets saved.
+    """
+
+    def __init__(self, tasks: typing.Sequence[Task], manifest_path: str):
+        self._name_to_task = {}
+        for task in tasks:
+            if task.name in self._name_to_task:
+                raise ValueError(f"Found two tasks with the name '{task.name}'.")
+            self._name_to_task.update({task.name: task})
+        for task in tasks:
+            for upstream_task_name in task.upstream:
+                if upstream_task_name not in self._name_to_task:
+                    raise ValueError(
+                        f"Task '{task.name}' depends on unknown task"
+                        f" '{upstream_task_name}'."
+                    )
+        self._waves = self._make_waves(tasks)
+        self._manifest_path = manifest_path
+
+    @staticmethod
+    def _make_waves(
+        tasks: typing.Sequence[Task],
+    ) -> typing.Tuple[typing.Tuple[Task, ...], ...]:
+        # each wave contains the tasks which only depend on tasks of the
+        # previous waves (the tasks of one wave don't depend on each other)
+        waves, done_task_names, remaining_tasks = [], set([]), list(tasks)
+        while remaining_tasks:
+            wave = tuple(
+                task
+                for task in remaining_tasks
+                if all(name in done_task_names for name in task.upstream)
+            )
+            if not wave:
+                raise ValueError(
+                    f"Found cyclic dependencies between the tasks {remaining_tasks}."
+                )
+            waves.append(wave)
+            done_task_names.update(task.name for task in wave)
+            remaining_tasks = [task for task in remaining_tasks if task not in wave]
+        return tuple(waves)
+
+    @property
+    def tasks(self) -> typing.Tuple[Task, ...]:
+        return tuple(task for wave in self._waves for task in wave)
+
+    def _read_manifest(self) -> typing.Dict[str, typing.Any]:
+        try:
+            with open(self._manifest_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_manifest(self, manifest: typing.Dict[str, typing.Any]):
+        directory = os.path.dirname(self._manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self._manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def _is_up_to_date(
+        task: Task, task_hash: str, task_entry: typing.Optional[typing.Dict]
+    ) -> bool:
+        if task_entry is None or task_entry["hash"] != task_hash:
+            return False
+        # the outputs of the last run are checked as well, so that deleted
+        # files are found even if the outputs are returned by a function
+        for path in set(task.outputs).union(task_entry["outputs"]):
+            modification_time = _get_modification_time(path)
+            if (
+                modification_time is None
+                or modification_time != task_entry["outputs"].get(path)
+            ):
+                return False
+        return True
+
+    @staticmethod
+    def _make_task_entry(task: Task, task_hash: str) -> typing.Dict[str, typing.Any]:
+        return {
+            "hash": task_hash,
+            "outputs": {path: _get_modification_time(path) for path in task.outputs},
+        }
+
+    def run(
+        self, force: bool = False, n_processes: typing.Optional[int] = None
+    ) -> typing.Tuple[str, ...]:
+        """Run all outdated tasks.
+
+        :param force: Run all tasks, even if they are up to date.
+        :param n_processes: How many parallel tasks can run at the same
+            time (see :func:`ot2.utilities.processes.map_in_processes`).
+        :return: The names of the tasks which ran.
+
+        If parallel tasks fail, the tasks of the same wave which succeeded
+        are saved in the manifest before a RuntimeError with the tracebacks
+        of the failed tasks is raised.
+        """
+
+        manifest = self._read_manifest()
+        task_name_to_entry = manifest.setdefault("tasks", {})
+        names_of_tasks_which_ran = []
+        for wave in self._waves:
+            parallel_tasks_and_hashes = []
+            for task in wave:
+                task_hash = task.get_hash()
+                if not force and self._is_up_to_date(
+                    task, task_hash, task_name_to_entry.get(task.name)
+                ):
+                    print(f"SKIP {task.name} (UP TO DATE)")
+                    if task.load is not None:
+                        task.load()
+                elif task.parallel:
+                    parallel_tasks_and_hashes.append((task, task_hash))
+                else:
+                    print(f"RUN {task.name}...")
+                    with profiling.span(task.name, "task", profile=True):
+                        task.function()
+                    task_name_to_entry[task.name] = self._make_task_entry(
+                        task, task_hash
+                    )
+                    names_of_tasks_which_ran.append(task.name)
+                    self._write_manifest(manifest)
+
+            if parallel_tasks_and_hashes:
+                print(
+                    "RUN "
+                    + ", ".join(task.name for task, _ in parallel_tasks_and_hashes)
+                    + "..."
+                )
+                with profiling.span(
+                    f"{len(parallel_tasks_and_hashes)} parallel tasks", "task"
+                ):
+                    tracebacks = processes.map_in_processes(
+                        _call,
+                        (task.function for task, _ in parallel_tasks_and_hashes),
+                        n_processes,
+                    )
+                failed_tasks_and_tracebacks = []
+                for (task, task_hash), task_traceback in zip(
+                    parallel_tasks_and_hashes, tracebacks
+                ):
+                    if task_traceback is None:
+                        task_name_to_entry[task.name] = self._make_task_entry(
+                            task, task_hash
+                        )
+                        names_of_tasks_which_ran.append(task.name)
+                    else:
+                        failed_tasks_and_tracebacks.append((task, task_traceback))
+                self._write_manifest(manifest)
+                if failed_tasks_and_tracebacks:
+                    message = "\n".join(
+                        f"Task '{task.name}' failed:\n{task_traceback}"
+                        for task, task_traceback in failed_tasks_and_tracebacks
+                    )
+                    raise RuntimeError(message)
+
+        return tuple(names_of_tasks_which_ran)
@@ -17,6 +17,6 @@ setuptools.setup(
         package for package in setuptools.find_packages() if package[:5] != "tests"
     ],
     setup_requires=[],
-    install_requires=["mutwo==0.12.0"],
+    install_requires=["mutwo==0.12.0", "dill"],
     python_requires=">=3.7, <4",
 )
@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+
+import mido
+
+from mutwo.events import basic
+from mutwo.events import music
+
+from ot2.converters.frontends import midi
+
+
+class OT2InstrumentEventToMidiFileConverterTest(unittest.TestCase):
+    # absolute start time and the notes (pitch, duration, volume) per voice
+    chunks = (
+        (
+            1,
+            (
+                (("1/1", 1, "pp"), ("3/2", 1, "f")),
+                (("5/4", 0.5, "mp"), (None, 0.5, "mp"), ("7/4", 1, "ppp")),
+            ),
+        ),
+        (
+            5,
+            (
+                (("9/8", 2, "ff"),),
+                (("4/3", 1.5, "p"), ("1/1", 0.5, "mf")),
+            ),
+        ),
+    )
+
+    @staticmethod
+    def _make_note_like(pitch, duration, volume):
+        return music.NoteLike(pitch if pitch else [], duration, volume)
+
+    def _make_chunks(self):
+        return tuple(
+            (
+                absolute_time,
+                basic.SimultaneousEvent(
+                    [
+                        basic.SequentialEvent(
+                            [self._make_note_like(*note) for note in notes]
+                        )
+                        for notes in notes_per_voice
+                    ]
+                ),
+            )
+            for absolute_time, notes_per_voice in self.chunks
+        )
+
+    def _make_complete_event(self):
+        simultaneous_event = basic.SimultaneousEvent(
+            [basic.SequentialEvent([]), basic.SequentialEvent([])]
+        )
+        for absolute_time, chunk in self._make_chunks():
+            for sequential_event, chunk_sequential_event in zip(
+                simultaneous_event, chunk
+            ):
+                rest_duration = absolute_time - sequential_event.duration
+                if rest_duration > 0:
+                    sequential_event.append(basic.SimpleEvent(rest_duration))
+                sequential_event.extend(chunk_sequential_event)
+        return simultaneous_event
+
+    @staticmethod
+    def _make_converter(path):
+        return midi.OT2InstrumentEventToMidiFileConverter(
+            path=path,
+            midi_file_type=1,
+            min_velocity=10,
+            max_velocity=90,
+            apply_extrema=True,
+        )
+
+    @staticmethod
+    def _read_midi_messages(path):
+        return tuple(
+            tuple(str(midi_message) for midi_message in track)
+            for track in mido.MidiFile(path).tracks
+        )
+
+    def test_convert_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/complete.mid"
+            self._make_converter(path).convert(self._make_complete_event())
+            chunks_path = f"{directory}/chunks.mid"
+            self._make_converter(chunks_path).convert_chunks(self._make_chunks())
+            self.assertEqual(
+                self._read_midi_messages(chunks_path), self._read_midi_messages(path)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
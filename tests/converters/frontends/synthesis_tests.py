@@ -0,0 +1,181 @@
+import os
+import tempfile
+import unittest
+import wave
+
+import numpy as np
+
+from mutwo.events import basic
+from mutwo.events import music
+
+from ot2.converters.frontends import synthesis
+
+
+class SynthesizeBlockTest(unittest.TestCase):
+    sampling_rate = 48000
+
+    def test_envelope_and_oscillator(self):
+        # start, duration, frequency, amplitude, attack, release
+        note = (0.5, 2, 440, 0.5, 0.2, 0.3)
+        block = synthesis.synthesize_block(
+            (note,), 0, 3 * self.sampling_rate, ((1, 1),), self.sampling_rate
+        )
+        time = np.arange(2 * self.sampling_rate) / self.sampling_rate
+        # equals 'linseg 0, 0.2, 1, 1.5, 1, 0.3, 0' * 'poscil 0.5, 440'
+        expected_signal = (
+            0.5
+            * np.interp(time, (0, 0.2, 1.7, 2), (0, 1, 1, 0))
+            * np.sin(2 * np.pi * 440 * time)
+        )
+        first_sample = int(0.5 * self.sampling_rate)
+        np.testing.assert_allclose(
+            block[first_sample : first_sample + len(time)],
+            expected_signal,
+            atol=1e-9,
+        )
+        self.assertFalse(np.any(block[:first_sample]))
+        self.assertFalse(np.any(block[first_sample + len(time) :]))
+
+    def test_blocks(self):
+        notes = ((0, 1, 200, 0.2, 0.1, 0.1), (0.3, 0.5, 330, 0.1, 0.5, 0.5))
+        partials = ((1, 1), (4, 0.2))
+        block = synthesis.synthesize_block(
+            notes, 0, self.sampling_rate, partials, self.sampling_rate
+        )
+        blocks = tuple(
+            synthesis.synthesize_block(
+                notes,
+                start,
+                min(start + 1000, self.sampling_rate),
+                partials,
+                self.sampling_rate,
+            )
+            for start in range(0, self.sampling_rate, 1000)
+        )
+        np.testing.assert_allclose(np.concatenate(blocks), block)
+
+
+class SineTonesToSoundFileConverterTest(unittest.TestCase):
+    def test_convert_chunks(self):
+        path = tempfile.mktemp(suffix=".wav")
+        converter = synthesis.AdditiveSynthesisToSoundFileConverter(
+            path,
+            ((1, 1),),
+            lambda note_like: 0.1,
+            lambda note_like: 0.1,
+            block_size=1000,
+        )
+        converter.convert_chunks(
+            (
+                (
+                    1,
+                    basic.SimultaneousEvent(
+                        [
+                            basic.SequentialEvent(
+                                [
+                                    music.NoteLike("1/1", 0.5, "pp"),
+                                    music.NoteLike([], 0.25, "pp"),
+                                    music.NoteLike("3/2", 0.5, "pp"),
+                                ]
+                            )
+                        ]
+                    ),
+                ),
+            )
+        )
+        try:
+            with wave.open(path, "rb") as wave_file:
+                self.assertEqual(wave_file.getnchannels(), 1)
+                self.assertEqual(wave_file.getnframes(), int(2.25 * 48000))
+                samples = np.frombuffer(
+                    wave_file.readframes(wave_file.getnframes()), dtype="<i2"
+                )
+        finally:
+            os.remove(path)
+        self.assertFalse(np.any(samples[:48000]))
+        self.assertTrue(np.any(samples[48000:]))
+
+    def test_convert_unsorted_chunks(self):
+        path = tempfile.mktemp(suffix=".wav")
+        converter = synthesis.AdditiveSynthesisToSoundFileConverter(
+            path, ((1, 1),), lambda note_like: 0.1, lambda note_like: 0.1
+        )
+        chunks = tuple(
+            (
+                absolute_time,
+                basic.SimultaneousEvent(
+                    [basic.SequentialEvent([music.NoteLike("1/1", 0.5, "pp")])]
+                ),
+            )
+            for absolute_time in (2, 1)
+        )
+        try:
+            with self.assertRaises(ValueError):
+                converter.convert_chunks(chunks)
+        finally:
+            os.remove(path)
+
+
+class MultichannelAdditiveSynthesisToSoundFileConverterTest(unittest.TestCase):
+    def _read_samples(self, path):
+        with wave.open(path, "rb") as wave_file:
+            n_channels = wave_file.getnchannels()
+            samples = np.frombuffer(
+                wave_file.readframes(wave_file.getnframes()), dtype="<i2"
+            )
+        os.remove(path)
+        return samples.reshape(-1, n_channels)
+
+    def _convert(self, path_or_paths):
+        converter = synthesis.MultichannelAdditiveSynthesisToSoundFileConverter(
+            path_or_paths,
+            2,
+            ((1, 1),),
+            lambda note_like: 0.1,
+            lambda note_like: 0.1,
+            block_size=1000,
+        )
+        converter.convert_chunks_per_channel(
+            (
+                (
+                    (
+                        0,
+                        basic.SimultaneousEvent(
+                            [basic.SequentialEvent([music.NoteLike("1/1", 1, "p")])]
+                        ),
+                    ),
+                    (
+                        2,
+                        basic.SimultaneousEvent(
+                            [basic.SequentialEvent([music.NoteLike("5/4", 1, "p")])]
+                        ),
+                    ),
+                ),
+                (
+                    (
+                        0.5,
+                        basic.SimultaneousEvent(
+                            [basic.SequentialEvent([music.NoteLike("3/2", 2, "p")])]
+                        ),
+                    ),
+                ),
+            )
+        )
+
+    def test_multichannel_file_equals_mono_files(self):
+        paths = tuple(tempfile.mktemp(suffix=".wav") for _ in range(3))
+        self._convert(paths[0])
+        self._convert(paths[1:])
+        multichannel_samples = self._read_samples(paths[0])
+        self.assertEqual(multichannel_samples.shape, (3 * 48000, 2))
+        for nth_channel, path in enumerate(paths[1:]):
+            mono_samples = self._read_samples(path)[:, 0]
+            np.testing.assert_array_equal(
+                multichannel_samples[: len(mono_samples), nth_channel], mono_samples
+            )
+        self.assertFalse(np.any(multichannel_samples[:24000, 1]))
+        self.assertTrue(np.any(multichannel_samples[24000:, 1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+from mutwo import converters
+from mutwo.events import basic
+from mutwo.events import music
+from mutwo.events import time_brackets
+
+from ot2.constants import families_pitch
+from ot2.converters.symmetrical import families as ot2_families
+
+
+class BatchedAssignCurveAndWeightPairsOnEventsConverterTest(unittest.TestCase):
+    # start times (in seconds) of the time brackets which get compared
+    start_times = (0, 31.25, 120.5, 600, 1234.75, 2000)
+
+    @staticmethod
+    def _make_time_bracket(start_time):
+        return time_brackets.TimeBracket(
+            [
+                basic.TaggedSimultaneousEvent(
+                    [
+                        basic.SequentialEvent(
+                            [music.NoteLike([], 1.5) for _ in range(8)]
+                        ),
+                        basic.SequentialEvent(
+                            [music.NoteLike([], 4.25) for _ in range(3)]
+                        ),
+                    ],
+                    tag="test",
+                )
+            ],
+            start_time,
+            start_time + 20,
+        )
+
+    @staticmethod
+    def _get_curve_and_weight_pairs_per_event(time_bracket):
+        return tuple(
+            tuple(
+                sorted(
+                    (curve.tag, tuple(curve.pitch.exponents), weight)
+                    for curve, weight in simple_event.curve_and_weight_pairs
+                )
+            )
+            for simultaneous_event in time_bracket
+            for sequential_event in simultaneous_event
+            for simple_event in sequential_event
+        )
+
+    def test_convert(self):
+        family_of_pitch_curves = families_pitch.FAMILY_PITCH
+        converter = (
+            converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter(
+                family_of_pitch_curves
+            )
+        )
+        batched_converter = (
+            ot2_families.BatchedAssignCurveAndWeightPairsOnEventsConverter(
+                family_of_pitch_curves
+            )
+        )
+        for start_time in self.start_times:
+            time_bracket = self._make_time_bracket(start_time)
+            expected_pairs_per_event = self._get_curve_and_weight_pairs_per_event(
+                converter.convert(time_bracket)
+            )
+            pairs_per_event = self._get_curve_and_weight_pairs_per_event(
+                batched_converter.convert(time_bracket)
+            )
+            self.assertEqual(len(pairs_per_event), len(expected_pairs_per_event))
+            for pairs, expected_pairs in zip(
+                pairs_per_event, expected_pairs_per_event
+            ):
+                self.assertEqual(
+                    tuple(pair[:2] for pair in pairs),
+                    tuple(pair[:2] for pair in expected_pairs),
+                )
+                for (_, _, weight), (_, _, expected_weight) in zip(
+                    pairs, expected_pairs
+                ):
+                    self.assertAlmostEqual(weight, expected_weight)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import random
+import types
+import unittest
+
+import expenvelope
+
+from ot2.events import families
+
+
+class ActiveRangesIndexTest(unittest.TestCase):
+    @staticmethod
+    def _has_overlap(active_ranges, start, end, minimal_overlapping_percentage):
+        duration = end - start
+        for active_range_start, active_range_end in active_ranges:
+            intersection_duration = min(active_range_end, end) - max(
+                active_range_start, start
+            )
+            if (
+                intersection_duration > 0
+                and intersection_duration / duration >= minimal_overlapping_percentage
+            ):
+                return True
+        return False
+
+    def test_has_overlap(self):
+        random_generator = random.Random(100)
+        for _ in range(200):
+            active_ranges = []
+            for _ in range(random_generator.randint(0, 30)):
+                start = random_generator.uniform(0, 100)
+                active_ranges.append((start, start + random_generator.uniform(0, 30)))
+            active_ranges_index = families.ActiveRangesIndex(active_ranges)
+            for _ in range(20):
+                start = random_generator.uniform(-10, 110)
+                end = start + random_generator.uniform(0.5, 40)
+                minimal_overlapping_percentage = random_generator.choice(
+                    (0.02, 0.1, 0.5, 0.75, 1)
+                )
+                self.assertEqual(
+                    active_ranges_index.has_overlap(
+                        start, end, minimal_overlapping_percentage
+                    ),
+                    self._has_overlap(
+                        active_ranges, start, end, minimal_overlapping_percentage
+                    ),
+                )
+
+    def test_has_overlap_without_ranges(self):
+        self.assertFalse(families.ActiveRangesIndex([]).has_overlap(0, 10, 0.1))
+
+
+class _MockFamily(list):
+    duration = 20
+
+
+class CompiledFamilyOfPitchCurvesTest(unittest.TestCase):
+    @staticmethod
+    def _make_pitch_curve(exponents, tag, times, levels):
+        return types.SimpleNamespace(
+            pitch=types.SimpleNamespace(
+                exponents=exponents, primes=(2, 3, 5, 7)[: len(exponents)]
+            ),
+            tag=tag,
+            active_ranges=((times[0], times[-1]),),
+            weight_curve=types.SimpleNamespace(
+                times=times, levels=levels, curve_shapes=[0 for _ in times]
+            ),
+        )
+
+    def setUp(self):
+        self.pitch_curves = (
+            self._make_pitch_curve((1, 0, 1), "root", (0, 10, 20), (0, 1, 0)),
+            self._make_pitch_curve((0, -1), "connection", (5, 15), (0.5, 0)),
+            self._make_pitch_curve((), "root", (12, 13), (0, 1)),
+        )
+        self.compiled_family = families.CompiledFamilyOfPitchCurves(
+            _MockFamily(self.pitch_curves)
+        )
+
+    def test_exponents(self):
+        self.assertEqual(
+            self.compiled_family.exponents.tolist(),
+            [[1, 0, 1], [0, -1, 0], [0, 0, 0]],
+        )
+        self.assertEqual(self.compiled_family.n_exponents.tolist(), [3, 2, 0])
+        self.assertEqual(self.compiled_family.primes, (2, 3, 5))
+
+    def test_get_curve_indices_with_tag(self):
+        self.assertEqual(
+            self.compiled_family.get_curve_indices_with_tag("root").tolist(), [0, 2]
+        )
+        self.assertEqual(
+            self.compiled_family.get_curve_indices_with_tag("unknown").tolist(), []
+        )
+
+    def test_curves_active_at(self):
+        self.assertEqual(self.compiled_family.curves_active_at(2).tolist(), [0])
+        self.assertEqual(
+            self.compiled_family.curves_active_at(12.5).tolist(), [0, 1, 2]
+        )
+        self.assertEqual(self.compiled_family.curves_active_at(25).tolist(), [])
+
+    def test_weights_at(self):
+        self.assertEqual(
+            self.compiled_family.weights_at(12.5).tolist(), [0.75, 0.125, 0.5]
+        )
+        self.assertEqual(
+            self.compiled_family.weights_at((-1, 30), (1,)).tolist(), [[0.5], [0]]
+        )
+
+    def test_weights_at_curved_segments(self):
+        weight_curves = (
+            expenvelope.Envelope.from_levels_and_durations(
+                (0, 1, 0.2, 0.2, 1), (4, 6, 0, 10), (3, -2.5, 0, 0.5)
+            ),
+            expenvelope.Envelope.from_levels_and_durations((1, 0), (20,), (-8,)),
+        )
+        pitch_curves = tuple(
+            types.SimpleNamespace(
+                pitch=types.SimpleNamespace(exponents=(), primes=()),
+                tag="root",
+                active_ranges=((0, 20),),
+                weight_curve=weight_curve,
+            )
+            for weight_curve in weight_curves
+        )
+        compiled_family = families.CompiledFamilyOfPitchCurves(
+            _MockFamily(pitch_curves)
+        )
+        times = tuple(time / 8 for time in range(-8, 180))
+        for time, weights in zip(times, compiled_family.weights_at(times)):
+            for weight, weight_curve in zip(weights, weight_curves):
+                self.assertAlmostEqual(weight, weight_curve.value_at(time))
+
+
+if __name__ == "__main__":
+    unittest.main()
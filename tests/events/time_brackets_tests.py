@@ -0,0 +1,140 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from mutwo.events import basic
+from mutwo.events import music
+from mutwo.events import time_brackets as mutwo_time_brackets
+
+from ot2.events import time_brackets
+
+
+class IndexedTimeBracketContainerTest(unittest.TestCase):
+    @staticmethod
+    def _make_time_bracket(start, end, *tags):
+        return mutwo_time_brackets.TimeBracket(
+            [
+                basic.TaggedSimultaneousEvent(
+                    [basic.SequentialEvent([music.NoteLike("1/1", 1, "p")])],
+                    tag=tag,
+                )
+                for tag in tags
+            ],
+            start,
+            end,
+        )
+
+    def test_remove_time_brackets_outside_of_time_window(self):
+        container = time_brackets.IndexedTimeBracketContainer(
+            (
+                self._make_time_bracket(0, 10, "sus0"),
+                self._make_time_bracket(20, 30, "sus0", "keyboard"),
+                self._make_time_bracket(40, 50, "sus1"),
+                self._make_time_bracket(60, 70, "sus2"),
+            )
+        )
+        container.remove_time_brackets_outside_of_time_window(15, 45)
+        self.assertEqual(
+            tuple(time_bracket.start_or_start_range for time_bracket in container),
+            (20, 40),
+        )
+        self.assertEqual(container.tags_after_time_window, frozenset(["sus2"]))
+        self.assertEqual(len(container.filter("sus0")), 1)
+
+    def _make_container(self):
+        return time_brackets.IndexedTimeBracketContainer(
+            (
+                self._make_time_bracket(0, 10, "sus0"),
+                self._make_time_bracket(20, 30, "sus0", "keyboard"),
+                self._make_time_bracket(40, 50, "sus1"),
+                self._make_time_bracket(60, 70, "sus2"),
+                self._make_time_bracket(80, 90, "sus1", "sus2"),
+            )
+        )
+
+    def _save_and_load(self, container):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "timeBrackets.ot2")
+            container.save(path)
+            return time_brackets.IndexedTimeBracketContainer.load(path)
+
+    def test_filter_loads_only_filtered_time_brackets(self):
+        loaded_container = self._save_and_load(self._make_container())
+        self.assertEqual(loaded_container._lazy_time_brackets.n_loaded_items, 0)
+        self.assertEqual(
+            tuple(
+                time_bracket.start_or_start_range
+                for time_bracket in loaded_container.filter("sus1")
+            ),
+            (40, 80),
+        )
+        self.assertFalse(loaded_container.is_loaded)
+        self.assertEqual(loaded_container._lazy_time_brackets.n_loaded_items, 2)
+
+    def test_find_loads_only_found_time_brackets(self):
+        loaded_container = self._save_and_load(self._make_container())
+        self.assertEqual(
+            tuple(
+                time_bracket.start_or_start_range
+                for time_bracket in loaded_container.find(15, 65, "sus2")
+            ),
+            (60,),
+        )
+        self.assertFalse(loaded_container.is_loaded)
+        self.assertEqual(loaded_container._lazy_time_brackets.n_loaded_items, 1)
+        # all other methods load all time brackets
+        self.assertEqual(len(tuple(loaded_container)), 5)
+        self.assertTrue(loaded_container.is_loaded)
+
+    def test_get_digests(self):
+        container = self._make_container()
+        loaded_container = self._save_and_load(container)
+        self.assertEqual(loaded_container.get_digests(), container.get_digests())
+        self.assertEqual(
+            loaded_container.get_digests("sus1"), container.get_digests("sus1")
+        )
+        self.assertEqual(loaded_container._lazy_time_brackets.n_loaded_items, 0)
+        self.assertNotEqual(*container.get_digests("sus0"))
+
+    def test_load_old_pickle(self):
+        container = self._make_container()
+
+        # state of containers which have been pickled before the time
+        # brackets could be loaded lazily
+        class OldContainer(object):
+            def __reduce__(self):
+                return (
+                    object.__new__,
+                    (time_brackets.IndexedTimeBracketContainer,),
+                    {
+                        "_brackets": list(container),
+                        "_tag_to_time_brackets": None,
+                        "_time_bracket_id_to_position": None,
+                        "_sorted_minimal_starts": None,
+                        "_time_brackets_sorted_by_minimal_start": None,
+                    },
+                )
+
+        loaded_container = pickle.loads(pickle.dumps(OldContainer()))
+        self.assertIsInstance(
+            loaded_container, time_brackets.IndexedTimeBracketContainer
+        )
+        self.assertTrue(loaded_container.is_loaded)
+        self.assertEqual(len(tuple(loaded_container)), 5)
+        self.assertEqual(len(loaded_container.filter("sus2")), 2)
+        self.assertEqual(
+            tuple(
+                time_bracket.start_or_start_range
+                for time_bracket in loaded_container.find(15, 65)
+            ),
+            (20, 40, 60),
+        )
+        self.assertEqual(
+            self._save_and_load(loaded_container).get_digests(),
+            loaded_container.get_digests(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import fnmatch
+import unittest
+
+from mutwo.events import basic
+from mutwo.events import music
+from mutwo.events import time_brackets
+from mutwo.utilities import exceptions
+
+from ot2 import constants
+from ot2 import converters
+from ot2 import render
+
+
+class ConvertTimeBracketsToChunksTest(unittest.TestCase):
+    @staticmethod
+    def _make_time_bracket(start, end, pitch):
+        return time_brackets.TimeBracket(
+            [
+                basic.TaggedSimultaneousEvent(
+                    [basic.SequentialEvent([music.NoteLike(pitch, 1, "p")])],
+                    tag="sus0",
+                ),
+                basic.TaggedSimultaneousEvent(
+                    [basic.SequentialEvent([music.NoteLike("1/1", 1, "p")])],
+                    tag="sus1",
+                ),
+            ],
+            start,
+            end,
+        )
+
+    def test_convert_time_brackets_to_chunks(self):
+        chunks = tuple(
+            render._convert_time_brackets_to_chunks(
+                "sus0",
+                (
+                    self._make_time_bracket(5, 8, "3/2"),
+                    self._make_time_bracket(1, 3, "5/4"),
+                ),
+            )
+        )
+        self.assertEqual(tuple(absolute_time for absolute_time, _ in chunks), (1, 5))
+        self.assertEqual(tuple(event.duration for _, event in chunks), (2, 3))
+        for _, event in chunks:
+            self.assertIsInstance(event, basic.SimultaneousEvent)
+        self.assertEqual(
+            chunks[0][1][0][0].pitch_or_pitches,
+            music.NoteLike("5/4").pitch_or_pitches,
+        )
+
+    def test_convert_overlapping_time_brackets_to_chunks(self):
+        with self.assertRaises(exceptions.OverlappingTimeBracketsError):
+            tuple(
+                render._convert_time_brackets_to_chunks(
+                    "sus0",
+                    (
+                        self._make_time_bracket(1, 4, "5/4"),
+                        self._make_time_bracket(3, 6, "3/2"),
+                    ),
+                )
+            )
+
+
+class GetMidiAndSoundFilePatternsTest(unittest.TestCase):
+    def _assert_matches(self, instrument_ids, path):
+        self.assertTrue(
+            any(
+                fnmatch.fnmatch(path, pattern)
+                for pattern in render._get_midi_and_sound_file_patterns(
+                    instrument_ids
+                )
+            )
+        )
+
+    def test_get_midi_and_sound_file_patterns(self):
+        midi = converters.frontends.midi
+        synthesis = converters.frontends.synthesis
+        self._assert_matches(
+            None, midi.CommonHarmonicEventToMidiFileConverter("a").path
+        )
+        self._assert_matches(
+            (constants.instruments.ID_KEYBOARD,),
+            midi.KeyboardEventToMidiFileConverter(1).path,
+        )
+        self._assert_matches(
+            (constants.instruments.ID_SUS1,),
+            midi.SustainingInstrumentEventToMidiFileConverter(1).path,
+        )
+        pillow_id = constants.instruments.PILLOW_IDS[0]
+        self._assert_matches(
+            (pillow_id,), synthesis.PillowEventsToSoundFileConverter(pillow_id).path
+        )
+        self._assert_matches(
+            (pillow_id,),
+            synthesis.PillowsToSoundFileConverter((pillow_id,), True).path,
+        )
+        self.assertEqual(
+            render._get_midi_and_sound_file_patterns(
+                (constants.instruments.ID_NOISE,)
+            ),
+            tuple([]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
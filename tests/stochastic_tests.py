@@ -0,0 +1,95 @@
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from mutwo.events import time_brackets
+
+from ot2 import stochastic
+
+
+class _TimeBracketFactory(object):
+    """Simplified time bracket factory which depends on its own state and
+    on the global random generators."""
+
+    def __init__(self):
+        self.n_time_brackets = 0
+
+    def gamble_at(self, _: float):
+        if random.random() < 0.2:
+            return None
+        return self
+
+    def convert(self, start_time: float):
+        generated_time_brackets = []
+        # the later time brackets of one call can end after the first one
+        for nth_time_bracket in range(random.randint(1, 3)):
+            start = start_time + (nth_time_bracket * 4)
+            generated_time_brackets.append(
+                time_brackets.TimeBracket(
+                    [], start, start + float(np.random.uniform(5, 100))
+                )
+            )
+        self.n_time_brackets += len(generated_time_brackets)
+        return generated_time_brackets
+
+
+class CalculateTimeBracketsInWindowTest(unittest.TestCase):
+    instrument_id = "test"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(
+            stochastic,
+            "_get_checkpoints_path",
+            lambda instrument_id: f"{self.directory.name}/{instrument_id}.pickle",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+        random.seed(10)
+        np.random.seed(10)
+        self.time_brackets = stochastic._calculate_time_brackets_for_instrument(
+            _TimeBracketFactory(), instrument_id=self.instrument_id
+        )
+
+    @staticmethod
+    def _get_start_and_end_pairs(time_brackets_to_compare):
+        return tuple(
+            (time_bracket.minimal_start, time_bracket.maximum_end)
+            for time_bracket in time_brackets_to_compare
+        )
+
+    def test_calculate_time_brackets_in_window(self):
+        for start_time, end_time in ((0, 30), (300, 420), (1000, 1010), (2500, 2700)):
+            expected_time_brackets = tuple(
+                time_bracket
+                for time_bracket in self.time_brackets
+                if time_bracket.maximum_end > start_time
+                and time_bracket.minimal_start < end_time
+            )
+            self.assertTrue(expected_time_brackets)
+            self.assertEqual(
+                self._get_start_and_end_pairs(
+                    stochastic.calculate_time_brackets_in_window(
+                        self.instrument_id, start_time, end_time
+                    )
+                ),
+                self._get_start_and_end_pairs(expected_time_brackets),
+            )
+
+    def test_global_generator_state(self):
+        random_state = random.getstate()
+        numpy_random_state = np.random.get_state()
+        stochastic.calculate_time_brackets_in_window(self.instrument_id, 300, 420)
+        self.assertEqual(random.getstate(), random_state)
+        self.assertEqual(
+            np.random.get_state()[1].tolist(), numpy_random_state[1].tolist()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
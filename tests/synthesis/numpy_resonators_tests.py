@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+import wave
+
+import expenvelope
+import numpy as np
+
+from ot2.synthesis import numpy_resonators
+
+
+class WaveguideBankTest(unittest.TestCase):
+    sampling_rate = 48000
+
+    def _get_impulse_response(self, block_size):
+        waveguide_bank = numpy_resonators.WaveguideBank(
+            (440, 1000.3), 80, 5, self.sampling_rate
+        )
+        impulse = np.zeros((2, self.sampling_rate))
+        impulse[:, 0] = 1
+        return np.concatenate(
+            [
+                waveguide_bank.process(impulse[:, start : start + block_size])
+                for start in range(0, self.sampling_rate, block_size)
+            ],
+            axis=1,
+        )
+
+    def test_blocks(self):
+        np.testing.assert_allclose(
+            self._get_impulse_response(5000),
+            self._get_impulse_response(self.sampling_rate),
+        )
+
+    def test_frequencies(self):
+        spectrum = np.abs(np.fft.rfft(self._get_impulse_response(5000)))
+        self.assertEqual(np.argmax(spectrum[0][100:600]) + 100, 440)
+        self.assertEqual(np.argmax(spectrum[1][800:1200]) + 800, 1000)
+
+
+class GetEnvelopeLevelsTest(unittest.TestCase):
+    def test_get_envelope_levels(self):
+        envelope = expenvelope.Envelope.from_points((0, 1), (10, 0.5), (20, 0.7))
+        times = np.array([0, 5, 10, 15, 25])
+        np.testing.assert_allclose(
+            numpy_resonators.get_envelope_levels(envelope, times, 5),
+            (1, 0.5 + (0.5 * (0.5 ** 5)), 0.5, 0.5 + (0.2 * (0.5 ** 5)), 0.7),
+        )
+        np.testing.assert_allclose(
+            numpy_resonators.get_envelope_levels(envelope, times),
+            (1, 0.75, 0.5, 0.6, 0.7),
+        )
+
+
+class NumpyResonatorTest(unittest.TestCase):
+    sampling_rate = 48000
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_path = f"{self.directory}/source.wav"
+        self._write_source(6)
+
+    def _write_source(self, duration: float):
+        samples = np.random.default_rng(0).normal(
+            0, 0.1, (int(round(self.sampling_rate * duration)), 2)
+        )
+        with wave.open(self.source_path, "wb") as source_file:
+            source_file.setnchannels(2)
+            source_file.setsampwidth(2)
+            source_file.setframerate(self.sampling_rate)
+            source_file.writeframes(
+                (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+            )
+
+    def tearDown(self):
+        for file_name in os.listdir(self.directory):
+            os.remove(f"{self.directory}/{file_name}")
+        os.rmdir(self.directory)
+
+    def _render(self, output_name, in_segments):
+        resonator = numpy_resonators.NumpyResonator(
+            self.source_path,
+            np.geomspace(100, 3000, 12),
+            output_name=output_name,
+            output_path=self.directory,
+            waveguide_mul=0.05,
+            waveguide_dur=1,
+        )
+        if in_segments:
+            resonator.render_in_segments(2, 0.25, n_processes=1)
+        else:
+            resonator.render()
+        with wave.open(resonator.complete_output_path, "rb") as output_file:
+            self.assertEqual(output_file.getnchannels(), 2)
+            return np.frombuffer(
+                output_file.readframes(output_file.getnframes()), dtype="<i2"
+            ).astype(int)
+
+    def test_render_in_segments(self):
+        samples = self._render("complete", False)
+        self.assertEqual(len(samples), 2 * 6 * self.sampling_rate)
+        self.assertTrue(np.any(samples))
+        np.testing.assert_allclose(
+            self._render("segments", True), samples, atol=8, rtol=0
+        )
+
+    def test_render_in_segments_with_short_last_segment(self):
+        # the last segment (0.1 seconds) is shorter than the crossfade
+        self._write_source(4.1)
+        samples = self._render("complete", False)
+        self.assertEqual(len(samples), 2 * int(round(4.1 * self.sampling_rate)))
+        np.testing.assert_allclose(
+            self._render("segments", True), samples, atol=8, rtol=0
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import expenvelope
+
+from ot2.synthesis import resonators
+
+
+class GetEnvelopePointsTest(unittest.TestCase):
+    def setUp(self):
+        self.envelope = expenvelope.Envelope.from_points((0, 0), (10, 1), (20, 0.5))
+
+    def test_without_offset(self):
+        self.assertEqual(
+            resonators._get_envelope_points(self.envelope, 0),
+            [(0, 0), (10, 1), (20, 0.5)],
+        )
+
+    def test_offset_in_segment(self):
+        self.assertEqual(
+            resonators._get_envelope_points(self.envelope, 5),
+            [(0, 0.5), (5, 1), (15, 0.5)],
+        )
+        self.assertEqual(
+            resonators._get_envelope_points(self.envelope, 15, 2),
+            [(0, 1 - (0.5 * (1 - (0.5 ** 2)))), (5, 0.5)],
+        )
+
+    def test_offset_at_point(self):
+        self.assertEqual(
+            resonators._get_envelope_points(self.envelope, 10),
+            [(0, 1), (10, 0.5)],
+        )
+
+    def test_offset_after_envelope(self):
+        self.assertEqual(
+            resonators._get_envelope_points(self.envelope, 25), [(0, 0.5)]
+        )
+
+    def test_level_type(self):
+        level = resonators._get_envelope_points(self.envelope, 5, 3)[0][1]
+        self.assertIs(type(level), float)
+
+
+if __name__ == "__main__":
+    unittest.main()
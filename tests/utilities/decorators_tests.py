@@ -0,0 +1,66 @@
+import os
+import pathlib
+import tempfile
+import unittest
+
+import quicktions
+
+from ot2.utilities import decorators
+from ot2.utilities import serialization
+
+
+class ComputeLazyTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mktemp()
+        self.dependency_path = tempfile.mktemp()
+
+    def tearDown(self):
+        for path in (self.path, f"{self.path}.hash", self.dependency_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_same_type_for_computed_and_loaded_results(self):
+        @decorators.compute_lazy(self.path, pickle_module=serialization)
+        def compute():
+            return tuple(quicktions.Fraction(1, n) for n in range(1, 5))
+
+        computed = compute()
+        loaded = compute()
+        self.assertIs(type(computed), type(loaded))
+        self.assertIsInstance(computed, serialization.LazySequence)
+        self.assertEqual(tuple(computed), tuple(loaded))
+        self.assertIs(type(computed[0]), quicktions.Fraction)
+
+    def _write_dependency(self, content: str):
+        with open(self.dependency_path, "w") as f:
+            f.write(content)
+
+    def test_recompute_after_changed_dependency_or_argument(self):
+        calls = []
+
+        @decorators.compute_lazy(
+            self.path, dependencies=(pathlib.Path(self.dependency_path),)
+        )
+        def compute(n: int):
+            calls.append(n)
+            return n * 2
+
+        self._write_dependency("a")
+        self.assertEqual(compute(1), 2)
+        self.assertEqual(compute(1), 2)
+        self.assertEqual(calls, [1])
+
+        # a changed dependency file
+        self._write_dependency("b")
+        self.assertEqual(compute(1), 2)
+        self.assertEqual(calls, [1, 1])
+
+        # a changed argument
+        self.assertEqual(compute(3), 6)
+        self.assertEqual(calls, [1, 1, 3])
+        self.assertEqual(compute(3), 6)
+        self.assertEqual(calls, [1, 1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
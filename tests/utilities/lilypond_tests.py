@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from PyPDF2 import PdfFileReader
+from PyPDF2 import PdfFileWriter
+
+from ot2.utilities import lilypond
+
+
+class CompileBlocksTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.blocks_path = f"{self.directory.name}/blocks"
+        self.pdf_path = f"{self.directory.name}/score.pdf"
+        self.compiled_sources = []
+        patcher = mock.patch.object(lilypond, "_compile", self._compile)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _compile(self, ly_path: str):
+        # instead of calling LilyPond: write one page whose width is the
+        # number of the block
+        with open(ly_path, "r") as f:
+            lilypond_source = f.read()
+        self.compiled_sources.append(lilypond_source)
+        pdf_writer = PdfFileWriter()
+        pdf_writer.addBlankPage(int(lilypond_source.split()[-1]), 100)
+        with open(f"{ly_path[: -len('.ly')]}.pdf", "wb") as f:
+            pdf_writer.write(f)
+
+    def _compile_blocks(self, block_numbers, **kwargs):
+        self.compiled_sources.clear()
+        return lilypond.compile_blocks(
+            tuple(f"block {block_number}" for block_number in block_numbers),
+            self.blocks_path,
+            self.pdf_path,
+            n_processes=2,
+            **kwargs,
+        )
+
+    def _get_page_widths(self):
+        with open(self.pdf_path, "rb") as f:
+            return tuple(
+                int(page.mediaBox.getWidth()) for page in PdfFileReader(f).pages
+            )
+
+    def test_compile_changed_blocks(self):
+        self.assertEqual(self._compile_blocks((100, 200, 300)), 3)
+        self.assertEqual(self._get_page_widths(), (100, 200, 300))
+
+        self.assertEqual(self._compile_blocks((100, 250, 300, 400)), 2)
+        self.assertEqual(sorted(self.compiled_sources), ["block 250", "block 400"])
+        self.assertEqual(self._get_page_widths(), (100, 250, 300, 400))
+
+        self.assertEqual(self._compile_blocks((100, 250, 300, 400)), 0)
+        self.assertEqual(self.compiled_sources, [])
+
+    def test_order_of_merged_blocks(self):
+        self._compile_blocks((300, 100, 200))
+        # equal blocks are only compiled once, but merged at each position
+        self.assertEqual(self._compile_blocks((200, 300, 200, 100)), 0)
+        self.assertEqual(self._get_page_widths(), (200, 300, 200, 100))
+
+    def test_remove_unused_blocks(self):
+        self._compile_blocks((100, 200))
+        self._compile_blocks((100,), remove_unused_blocks=False)
+        self.assertEqual(len(os.listdir(self.blocks_path)), 4)
+
+        self._compile_blocks((100,))
+        self.assertEqual(
+            sorted(os.listdir(self.blocks_path)),
+            sorted(
+                f"{lilypond.get_digest('block 100')}.{extension}"
+                for extension in ("ly", "pdf")
+            ),
+        )
+        self.assertEqual(self._compile_blocks((200,)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
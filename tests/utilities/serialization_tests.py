@@ -0,0 +1,140 @@
+import fractions
+import os
+import pickle
+import tempfile
+import unittest
+
+import quicktions
+
+from mutwo.parameters import pitches
+
+from ot2.utilities import serialization
+
+
+class _Note(object):
+    def __init__(self, duration, pitches):
+        self.duration = duration
+        self.pitches = pitches
+
+    def __eq__(self, other):
+        return type(self) is type(other) and vars(self) == vars(other)
+
+
+class _Event(list):
+    def __init__(self, items, tag=None):
+        super().__init__(items)
+        self.tag = tag
+
+    def __eq__(self, other):
+        return list.__eq__(self, other) and vars(self) == vars(other)
+
+
+class SerializationTest(unittest.TestCase):
+    def setUp(self):
+        self.shared_pitch = pitches.JustIntonationPitch("3/2")
+        self.time_brackets = tuple(
+            _Event(
+                [
+                    _Event(
+                        [
+                            _Note(fractions.Fraction(nth_note, 3), [self.shared_pitch]),
+                            _Note(
+                                fractions.Fraction(1, 4),
+                                [
+                                    pitches.JustIntonationPitch((nth_note, 0, -1)),
+                                    self.shared_pitch,
+                                ],
+                            ),
+                            _Note(fractions.Fraction(2 ** 70, 3), []),
+                        ],
+                        tag="sus0",
+                    )
+                    for nth_note in range(5)
+                ],
+                tag=nth_bracket,
+            )
+            for nth_bracket in range(10)
+        )
+        self.path = tempfile.mktemp()
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _dump_and_load(self, object_to_save, **kwargs):
+        with open(self.path, "wb") as f:
+            serialization.dump(object_to_save, f, **kwargs)
+        with open(self.path, "rb") as f:
+            return serialization.load(f)
+
+    def test_load_lazy(self):
+        for compression_level in (0, 6):
+            loaded = self._dump_and_load(
+                self.time_brackets, compression_level=compression_level
+            )
+            self.assertIsInstance(loaded, serialization.LazySequence)
+            self.assertEqual(len(loaded), 10)
+            self.assertEqual(loaded.n_loaded_items, 0)
+            self.assertEqual(loaded[3], self.time_brackets[3])
+            self.assertEqual(loaded.n_loaded_items, 1)
+            self.assertIs(loaded[-7], loaded[3])
+            self.assertEqual(tuple(loaded), self.time_brackets)
+
+    def test_shared_pitches_stay_shared(self):
+        time_bracket = self._dump_and_load(self.time_brackets)[0]
+        self.assertIs(time_bracket[0][0].pitches[0], time_bracket[4][1].pitches[1])
+        self.assertIsNot(time_bracket[0][1].pitches[0], time_bracket[1][1].pitches[0])
+
+    def test_just_intonation_pitches(self):
+        # the exponents of the pitches are saved in the exponents column
+        self.assertEqual(
+            serialization._get_exponents_attribute_name(self.shared_pitch),
+            "_exponents",
+        )
+        pitch_list = [
+            pitches.JustIntonationPitch(ratio) for ratio in ("5/4", "7/6", "1/1")
+        ]
+        loaded_pitch_list = self._dump_and_load([pitch_list])[0]
+        for pitch, loaded_pitch in zip(pitch_list, loaded_pitch_list):
+            self.assertIs(type(loaded_pitch), pitches.JustIntonationPitch)
+            self.assertEqual(loaded_pitch.exponents, pitch.exponents)
+            self.assertEqual(loaded_pitch.ratio, pitch.ratio)
+            self.assertEqual(vars(loaded_pitch), vars(pitch))
+
+    def test_pickle_lazy_sequence(self):
+        loaded = self._dump_and_load(list(self.time_brackets))
+        self.assertEqual(pickle.loads(pickle.dumps(loaded)), list(self.time_brackets))
+
+    def test_load_other_objects(self):
+        self.assertEqual(
+            self._dump_and_load({"a": fractions.Fraction(1, 2)}),
+            {"a": fractions.Fraction(1, 2)},
+        )
+        self.assertEqual(tuple(self._dump_and_load(tuple([]))), tuple([]))
+
+    def test_quicktions_fractions(self):
+        items = (
+            _Note(quicktions.Fraction(1, 3), [self.shared_pitch]),
+            _Note(fractions.Fraction(1, 3), []),
+            [quicktions.Fraction(2 ** 70, 3), quicktions.Fraction(-5, 7)],
+        )
+        with open(self.path, "wb") as f:
+            serialization.dump(items, f)
+        with open(self.path, "rb") as f:
+            loaded = serialization.load(f)
+        self.assertEqual(tuple(loaded), items)
+        self.assertIs(type(loaded[0].duration), quicktions.Fraction)
+        self.assertIs(type(loaded[1].duration), fractions.Fraction)
+        self.assertEqual(
+            tuple(map(type, loaded[2])), (quicktions.Fraction, quicktions.Fraction)
+        )
+
+    def test_load_pickle_file(self):
+        with open(self.path, "wb") as f:
+            pickle.dump(self.time_brackets, f)
+        with open(self.path, "rb") as f:
+            self.assertEqual(serialization.load(f), self.time_brackets)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import functools
+import json
+import os
+import tempfile
+import unittest
+
+from ot2.utilities import tasks
+
+
+def _write(path: str):
+    with open(path, "w") as f:
+        f.write("output")
+
+
+def _fail():
+    raise ValueError("failed task")
+
+
+class TaskGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.manifest_path = f"{self.directory.name}/manifest.json"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read_manifest(self) -> dict:
+        with open(self.manifest_path, "r") as f:
+            return json.load(f)
+
+    def test_save_succeeded_parallel_tasks(self):
+        output_path = f"{self.directory.name}/a.txt"
+        task_graph = tasks.TaskGraph(
+            (
+                tasks.Task(
+                    "a",
+                    functools.partial(_write, output_path),
+                    outputs=(output_path,),
+                    parallel=True,
+                ),
+                tasks.Task("b", _fail, parallel=True),
+            ),
+            self.manifest_path,
+        )
+        with self.assertRaisesRegex(RuntimeError, "failed task"):
+            task_graph.run(n_processes=1)
+        self.assertEqual(tuple(self._read_manifest()["tasks"]), ("a",))
+
+    def test_outputs_function(self):
+        output_path = f"{self.directory.name}/a.txt"
+        task_graph = tasks.TaskGraph(
+            (
+                tasks.Task(
+                    "a",
+                    functools.partial(_write, output_path),
+                    # only returns the files which exist
+                    outputs=lambda: tuple(
+                        path for path in (output_path,) if os.path.exists(path)
+                    ),
+                ),
+            ),
+            self.manifest_path,
+        )
+        self.assertEqual(task_graph.run(), ("a",))
+        self.assertEqual(task_graph.run(), tuple([]))
+        os.remove(output_path)
+        self.assertEqual(task_graph.run(), ("a",))
+
+
+if __name__ == "__main__":
+    unittest.main()